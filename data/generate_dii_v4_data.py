@@ -4,9 +4,17 @@ Generate production DII v4.0 data files from migration analysis
 """
 
 import json
+import os
 import random
+import sys
 from datetime import datetime, timedelta
 
+# Add repository root to path for the shared DII scoring kernel
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts import dii_scoring
+from scripts.dii_cube import ScoreCube
+
 # Constants from our analysis
 COUNTRIES = {
     "Colombia": 28, "Dominican Republic": 20, "Brazil": 17, "Costa Rica": 17,
@@ -50,15 +58,34 @@ SECTOR_AER = {
     "Services": 3.0, "Pharma": 3.5
 }
 
+# Normalization base for generated data (raw DII / 19.2 × 10)
+GENERATED_DII_BASE = 19.2
+
 def get_dii_stage(score):
-    if score < 2.5:
-        return "Frágil"
-    elif score < 5.0:
-        return "Robusto"
-    elif score < 7.5:
-        return "Resiliente"
-    else:
-        return "Adaptativo"
+    return str(dii_scoring.dii_stage(score))
+
+def score_clients(clients, base=GENERATED_DII_BASE):
+    """
+    Recalculate dii_score and dii_stage for all clients from their dimensions
+    
+    Scores the whole client base in one vectorized pass, so what-if runs
+    (edited dimensions or a different normalization base) are interactive.
+    Clients are updated in place and returned.
+    """
+    if not clients:
+        return clients
+    
+    columns = {
+        dim: [c["dimensions"][dim] for c in clients]
+        for dim in ("TRD", "AER", "HFP", "BRI", "RRG")
+    }
+    scored = dii_scoring.score_dimensions(columns["TRD"], columns["AER"], columns["HFP"],
+                                          columns["BRI"], columns["RRG"], base=base)
+    
+    for client, score, stage in zip(clients, scored["dii_score"], scored["dii_stage"]):
+        client["dii_score"] = float(score)
+        client["dii_stage"] = stage
+    return clients
 
 def generate_company_name(sector, index):
     """Generate realistic company names"""
@@ -124,11 +151,8 @@ def generate_dimensions(model, sector, has_zt_maturity=True):
     
     rrg = round(max(1.0, min(5.0, rrg)), 2)
     
-    # Calculate actual DII
-    actual_dii = (trd * aer) / (hfp * bri * rrg)
-    # Normalize to 0-10 scale
-    actual_dii = actual_dii / 19.2 * 10
-    actual_dii = round(max(1.0, min(10.0, actual_dii)), 2)
+    # Calculate actual DII, normalized to the 1-10 scale
+    actual_dii = float(dii_scoring.dii_score(trd, aer, hfp, bri, rrg, base=GENERATED_DII_BASE))
     
     return {
         "AER": aer,
@@ -199,8 +223,11 @@ def generate_historical_data():
     
     return clients
 
-def generate_benchmarks(clients):
-    """Generate aggregated benchmarks"""
+STAGE_LABELS = ["Frágil", "Robusto", "Resiliente", "Adaptativo"]
+
+def generate_benchmarks(clients, cube=None):
+    """Generate aggregated benchmarks (sliced from the score cube)"""
+    cube = cube or ScoreCube.from_clients(clients)
     benchmarks = {
         "metadata": {
             "generated_date": datetime.now().strftime("%Y-%m-%d"),
@@ -214,55 +241,64 @@ def generate_benchmarks(clients):
     }
     
     # By business model
+    by_model = cube.rollup("model")
+    model_stages = cube.counts("model", "stage")
     for model in BUSINESS_MODELS_V4.keys():
-        model_clients = [c for c in clients if c["business_model_v4"] == model]
-        if model_clients:
-            scores = [c["dii_score"] for c in model_clients]
+        stats = by_model.get(model)
+        if stats:
             benchmarks["by_business_model"][model] = {
-                "count": len(model_clients),
-                "avg_score": round(sum(scores) / len(scores), 2),
-                "min_score": min(scores),
-                "max_score": max(scores),
+                "count": stats.count,
+                "avg_score": round(stats.mean, 2),
+                "min_score": stats.min,
+                "max_score": stats.max,
                 "percentiles": {
-                    "p25": round(sorted(scores)[len(scores)//4], 2),
-                    "p50": round(sorted(scores)[len(scores)//2], 2),
-                    "p75": round(sorted(scores)[3*len(scores)//4], 2)
+                    "p25": round(stats.percentile(25), 2),
+                    "p50": round(stats.percentile(50), 2),
+                    "p75": round(stats.percentile(75), 2)
                 },
-                "stage_distribution": {}
+                "stage_distribution": {
+                    stage: model_stages.get((model, stage), 0) for stage in STAGE_LABELS
+                }
             }
-            
-            # Stage distribution
-            for stage in ["Frágil", "Robusto", "Resiliente", "Adaptativo"]:
-                count = len([c for c in model_clients if c["dii_stage"] == stage])
-                benchmarks["by_business_model"][model]["stage_distribution"][stage] = count
     
     # By sector
+    by_sector = cube.rollup("sector")
     for sector in SECTORS.keys():
-        sector_clients = [c for c in clients if c["sector"] == sector]
-        if sector_clients:
-            scores = [c["dii_score"] for c in sector_clients]
+        stats = by_sector.get(sector)
+        if stats:
             benchmarks["by_sector"][sector] = {
-                "count": len(sector_clients),
-                "avg_score": round(sum(scores) / len(scores), 2),
-                "min_score": min(scores),
-                "max_score": max(scores)
+                "count": stats.count,
+                "avg_score": round(stats.mean, 2),
+                "min_score": stats.min,
+                "max_score": stats.max
             }
     
     # Overall statistics
-    all_scores = [c["dii_score"] for c in clients]
+    overall = cube.overall()
     benchmarks["overall_statistics"] = {
-        "avg_score": round(sum(all_scores) / len(all_scores), 2),
-        "median_score": round(sorted(all_scores)[len(all_scores)//2], 2),
-        "std_deviation": round(((sum((x - sum(all_scores)/len(all_scores))**2 for x in all_scores) / len(all_scores))**0.5), 2)
+        "avg_score": round(overall.mean, 2),
+        "median_score": round(overall.percentile(50), 2),
+        "std_deviation": round(overall.std(), 2)
     }
     
     return benchmarks
 
-def generate_distribution_data(clients):
-    """Generate visualization-ready distribution data"""
+def _performer(client):
+    return {
+        "company": client["company_name"],
+        "country": client["country"],
+        "sector": client["sector"],
+        "model": client["business_model_v4"],
+        "score": client["dii_score"],
+        "stage": client["dii_stage"]
+    }
+
+def generate_distribution_data(clients, cube=None):
+    """Generate visualization-ready distribution data (sliced from the score cube)"""
+    cube = cube or ScoreCube.from_clients(clients)
     distribution = {
         "stage_distribution": {
-            "labels": ["Frágil", "Robusto", "Resiliente", "Adaptativo"],
+            "labels": STAGE_LABELS,
             "values": [],
             "colors": ["#DC2626", "#F59E0B", "#10B981", "#3B82F6"]
         },
@@ -280,53 +316,32 @@ def generate_distribution_data(clients):
     }
     
     # Stage distribution
-    for stage in distribution["stage_distribution"]["labels"]:
-        count = len([c for c in clients if c["dii_stage"] == stage])
-        distribution["stage_distribution"]["values"].append(count)
+    stage_counts = cube.counts("stage")
+    distribution["stage_distribution"]["values"] = [stage_counts.get(stage, 0) for stage in STAGE_LABELS]
     
     # Model performance
+    by_model = cube.rollup("model")
     for model in sorted(BUSINESS_MODELS_V4.keys(), 
                        key=lambda m: MODEL_PROFILES[m]["avg_dii"], 
                        reverse=True):
-        model_clients = [c for c in clients if c["business_model_v4"] == model]
-        if model_clients:
-            scores = [c["dii_score"] for c in model_clients]
+        stats = by_model.get(model)
+        if stats:
             distribution["model_performance"]["labels"].append(model)
-            distribution["model_performance"]["avg_scores"].append(
-                round(sum(scores) / len(scores), 2)
-            )
-            distribution["model_performance"]["client_counts"].append(len(model_clients))
+            distribution["model_performance"]["avg_scores"].append(round(stats.mean, 2))
+            distribution["model_performance"]["client_counts"].append(stats.count)
     
     # Top and bottom performers
-    sorted_clients = sorted(clients, key=lambda c: c["dii_score"], reverse=True)
-    
-    for client in sorted_clients[:10]:
-        distribution["top_performers"].append({
-            "company": client["company_name"],
-            "country": client["country"],
-            "sector": client["sector"],
-            "model": client["business_model_v4"],
-            "score": client["dii_score"],
-            "stage": client["dii_stage"]
-        })
-    
-    for client in sorted_clients[-10:]:
-        distribution["bottom_performers"].append({
-            "company": client["company_name"],
-            "country": client["country"],
-            "sector": client["sector"],
-            "model": client["business_model_v4"],
-            "score": client["dii_score"],
-            "stage": client["dii_stage"]
-        })
+    ranked = cube.ranked()
+    distribution["top_performers"] = [_performer(clients[i]) for i in ranked[:10]]
+    distribution["bottom_performers"] = [_performer(clients[i]) for i in ranked[-10:]]
     
     # Sector comparison
+    by_sector = cube.rollup("sector")
     for sector in ["Financial", "Technology", "Healthcare", "Industrial", "Public"]:
-        sector_clients = [c for c in clients if c["sector"] == sector]
-        if sector_clients:
-            avg_score = sum(c["dii_score"] for c in sector_clients) / len(sector_clients)
+        stats = by_sector.get(sector)
+        if stats:
             distribution["sector_comparison"]["labels"].append(sector)
-            distribution["sector_comparison"]["values"].append(round(avg_score, 2))
+            distribution["sector_comparison"]["values"].append(round(stats.mean, 2))
     
     return distribution
 
@@ -341,14 +356,17 @@ def main():
         json.dump({"clients": clients}, f, ensure_ascii=False, indent=2)
     print(f"✓ Generated {len(clients)} client records in dii_v4_historical_data.json")
     
+    # One aggregation pass shared by benchmarks and distribution data
+    cube = ScoreCube.from_clients(clients)
+    
     # Generate and save benchmarks
-    benchmarks = generate_benchmarks(clients)
+    benchmarks = generate_benchmarks(clients, cube)
     with open('dii_v4_benchmarks.json', 'w', encoding='utf-8') as f:
         json.dump(benchmarks, f, ensure_ascii=False, indent=2)
     print("✓ Generated benchmarks in dii_v4_benchmarks.json")
     
     # Generate and save distribution data
-    distribution = generate_distribution_data(clients)
+    distribution = generate_distribution_data(clients, cube)
     with open('dii_v4_distribution.json', 'w', encoding='utf-8') as f:
         json.dump(distribution, f, ensure_ascii=False, indent=2)
     print("✓ Generated visualization data in dii_v4_distribution.json")
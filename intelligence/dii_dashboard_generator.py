@@ -12,29 +12,47 @@ Generates immunity dashboard aligned with Digital Immunity Index 4.0 framework
 
 import json
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from utils.build_graph import BuildGraph
+from utils.template_engine import CompiledTemplate, load_template
+
 class DIIDashboardGenerator:
     def __init__(self):
         self.template_path = "../templates/immunity_dashboard_template_dii4.html"
         self.output_dir = "."
         self.week_date = datetime.now().strftime('%Y-%m-%d')
         
-    def load_template(self):
-        """Load the HTML template"""
+    def load_template(self) -> CompiledTemplate:
+        """Load the compiled HTML template (cached until the file changes)"""
         template_file = Path(__file__).parent / self.template_path
         if not template_file.exists():
             raise FileNotFoundError(f"Template not found: {template_file}")
         
-        with open(template_file, 'r', encoding='utf-8') as f:
-            return f.read()
+        return load_template(str(template_file))
+    
+    def input_files(self) -> List[Path]:
+        """Files the dashboard is built from: enriched data, Perplexity input and template"""
+        return [
+            Path(self.output_dir) / "data/enriched_incidents_2025-07-11.json",
+            Path(self.output_dir) / "data/perplexity-input-2025-07-11.json",
+            Path(__file__).parent / self.template_path
+        ]
+    
+    def output_files(self) -> List[Path]:
+        return [
+            Path(self.output_dir) / f'weekly-reports/immunity-dashboard-{self.week_date}.html',
+            Path(self.output_dir) / f'outputs/dashboards/immunity-dashboard-{self.week_date}.html'
+        ]
     
     def load_enriched_data(self):
         """Load enriched incidents data with DII 4.0 calculations"""
-        enriched_file = Path(self.output_dir) / f"data/enriched_incidents_2025-07-11.json"
-        perplexity_file = Path(self.output_dir) / f"data/perplexity-input-2025-07-11.json"
+        enriched_file, perplexity_file, _ = self.input_files()
         
         # Load enriched data
         if enriched_file.exists():
@@ -558,11 +576,18 @@ class DIIDashboardGenerator:
             })
         return chart_data
     
-    def generate_dashboard(self):
-        """Generate the complete dashboard"""
+    def generate_dashboard(self, force: bool = False):
+        """Generate the complete dashboard (skipped when no input changed, unless forced)"""
         print("🚀 Generating DII 4.0 Aligned Dashboard")
         print("=" * 50)
         
+        graph = BuildGraph()
+        inputs = [str(path) for path in self.input_files()]
+        outputs = [str(path) for path in self.output_files()]
+        if not force and not graph.stale({output: inputs for output in outputs}):
+            print("✅ Dashboard up to date (inputs unchanged), nothing to do")
+            return self.output_files()[0]
+        
         # Load data
         enriched_data, perplexity_data = self.load_enriched_data()
         print(f"📊 Loaded {len(enriched_data['incidents'])} enriched incidents")
@@ -575,24 +600,17 @@ class DIIDashboardGenerator:
         dashboard_data = self.prepare_dashboard_data(enriched_data, perplexity_data)
         print("🔧 Dashboard data prepared")
         
-        # Replace placeholders
-        dashboard = template
-        for key, value in dashboard_data.items():
-            placeholder = f"{{{{{key}}}}}"
-            dashboard = dashboard.replace(placeholder, str(value))
-        
-        # Save dashboard
-        output_path = Path(self.output_dir) / f'weekly-reports/immunity-dashboard-{self.week_date}.html'
-        output_path.parent.mkdir(exist_ok=True)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(dashboard)
+        # Fill placeholders
+        dashboard = template.render(dashboard_data)
         
-        # Also save to new structure
-        new_path = Path(self.output_dir) / f'outputs/dashboards/immunity-dashboard-{self.week_date}.html'
-        new_path.parent.mkdir(exist_ok=True)
-        with open(new_path, 'w', encoding='utf-8') as f:
-            f.write(dashboard)
+        # Save dashboard (customer URL, then the new structure)
+        output_path, new_path = self.output_files()
+        for path in (output_path, new_path):
+            path.parent.mkdir(exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(dashboard)
+            graph.record(str(path), inputs)
+        graph.save()
         
         print(f"\n✅ Dashboard generated successfully!")
         print(f"📍 Locations:")
@@ -607,4 +625,4 @@ class DIIDashboardGenerator:
 
 if __name__ == "__main__":
     generator = DIIDashboardGenerator()
-    generator.generate_dashboard()
\ No newline at end of file
+    generator.generate_dashboard(force="--force" in sys.argv[1:])
\ No newline at end of file
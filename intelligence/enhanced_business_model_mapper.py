@@ -3,276 +3,357 @@ Enhanced Business Model Mapper
 Bridges technical depth for IT/Security teams with business clarity for C-suite
 """
 
-class EnhancedBusinessModelMapper:
-    """Maps cyber incidents to business models with dual-language approach"""
-    
-    def __init__(self):
-        # Business models remain the same
-        self.business_models = {
-            1: "Comercio Híbrido",
-            2: "Software Crítico", 
-            3: "Servicios de Datos",
-            4: "Ecosistema Digital",
-            5: "Servicios Financieros",
-            6: "Infraestructura Heredada",
-            7: "Cadena de Suministro",
-            8: "Información Regulada"
-        }
-        
-        # Enhanced threat taxonomy with business translation
-        self.cyber_threats = {
-            "ransomware": {
-                "technical_name": "Ransomware",
-                "business_name": "Operations Shutdown Attack",
-                "executive_impact": "Can't operate for X days, lose $Y per day",
-                "mid_level_pitch": "Encrypts systems, demands payment, stops all operations",
-                "real_examples": {
-                    "retail": "Target store closed 5 days, $2M loss",
-                    "manufacturing": "Factory stopped 10 days, $5M loss",
-                    "healthcare": "Hospital diverted patients, $3M loss + lawsuits"
-                }
-            },
-            "data_breach": {
-                "technical_name": "Data Exfiltration",
-                "business_name": "Customer Trust Crisis", 
-                "executive_impact": "Lose X% customers, $Y in fines, reputation damage",
-                "mid_level_pitch": "Stolen customer data leads to regulatory fines and lost business",
-                "real_examples": {
-                    "retail": "Lost 15% customers after breach, $1M GDPR fine",
-                    "financial": "Banking license review, $10M settlement",
-                    "healthcare": "HIPAA fines $5M, class action lawsuit"
-                }
-            },
-            "ddos": {
-                "technical_name": "Denial of Service",
-                "business_name": "Revenue Channel Block",
-                "executive_impact": "Can't sell for X hours, lose $Y in sales",
-                "mid_level_pitch": "Website/app down means no digital revenue",
-                "real_examples": {
-                    "ecommerce": "Black Friday attack, $500K/hour loss",
-                    "banking": "Mobile app down, 10K customer complaints",
-                    "gaming": "Launch day attack, 50% refund requests"
-                }
-            },
-            "supply_chain": {
-                "technical_name": "Supply Chain Compromise",
-                "business_name": "Partner Contamination",
-                "executive_impact": "Trusted vendor becomes attack path, $X cleanup",
-                "mid_level_pitch": "Attackers use your vendors to reach you",
-                "real_examples": {
-                    "software": "Update server compromised, 1000 customers hit",
-                    "manufacturing": "Supplier ransomware spread to 5 partners",
-                    "retail": "POS vendor breach, all stores affected"
-                }
-            },
-            "insider_threat": {
-                "technical_name": "Malicious Insider",
-                "business_name": "Trust Betrayal Loss",
-                "executive_impact": "Employee steals IP/data, competitor advantage",
-                "mid_level_pitch": "Authorized access used for theft or sabotage",
-                "real_examples": {
-                    "tech": "Engineer stole code, started competitor",
-                    "financial": "Trader hidden losses, $100M damage",
-                    "healthcare": "Nurse sold patient records, 50K affected"
-                }
-            }
+import os
+import pickle
+import sys
+from functools import lru_cache
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from translators.threat_classifier import ThreatClassifier
+from utils.frozen import freeze
+from utils.ioc_table import IOCTable
+
+
+# Rule tables: built once at import, read-only and shared by every mapper instance
+
+# Business models remain the same
+BUSINESS_MODELS = freeze({
+    1: "Comercio Híbrido",
+    2: "Software Crítico", 
+    3: "Servicios de Datos",
+    4: "Ecosistema Digital",
+    5: "Servicios Financieros",
+    6: "Infraestructura Heredada",
+    7: "Cadena de Suministro",
+    8: "Información Regulada"
+})
+
+# Enhanced threat taxonomy with business translation
+CYBER_THREATS = freeze({
+    "ransomware": {
+        "technical_name": "Ransomware",
+        "business_name": "Operations Shutdown Attack",
+        "executive_impact": "Can't operate for X days, lose $Y per day",
+        "mid_level_pitch": "Encrypts systems, demands payment, stops all operations",
+        "real_examples": {
+            "retail": "Target store closed 5 days, $2M loss",
+            "manufacturing": "Factory stopped 10 days, $5M loss",
+            "healthcare": "Hospital diverted patients, $3M loss + lawsuits"
         }
-        
-        # How attacks happen (simplified for executives)
-        self.attack_vectors = {
-            "phishing": {
-                "technical_term": "Phishing/Social Engineering",
-                "simple_term": "Fake Emails That Trick People",
-                "how_it_works": "Employees click bad links → attacker gets in",
-                "business_relevance": "Your people are the weakest link",
-                "prevention_cost": "$50/user training vs $2M breach"
-            },
-            "stolen_credentials": {
-                "technical_term": "Compromised Credentials",
-                "simple_term": "Stolen Passwords",
-                "how_it_works": "Reused passwords from other breaches → easy access",
-                "business_relevance": "One password = many systems compromised",
-                "prevention_cost": "$10/user MFA vs $500K incident"
-            },
-            "unpatched_systems": {
-                "technical_term": "Unpatched Vulnerabilities", 
-                "simple_term": "Unfixed Security Holes",
-                "how_it_works": "Known problems not fixed → attackers walk in",
-                "business_relevance": "Like leaving doors unlocked",
-                "prevention_cost": "$5K/month patching vs $1M breach"
-            },
-            "cloud_misconfiguration": {
-                "technical_term": "Cloud Misconfiguration",
-                "simple_term": "Cloud Settings Wrong",
-                "how_it_works": "Storage left public → data exposed",
-                "business_relevance": "Your data visible to everyone",
-                "prevention_cost": "$2K audit vs $5M data leak"
-            },
-            "third_party_compromise": {
-                "technical_term": "Third-Party Compromise",
-                "simple_term": "Vendor Got Hacked", 
-                "how_it_works": "Trusted vendor breached → access to you",
-                "business_relevance": "Your security = weakest vendor",
-                "prevention_cost": "$10K vendor audit vs $2M cleanup"
-            }
+    },
+    "data_breach": {
+        "technical_name": "Data Exfiltration",
+        "business_name": "Customer Trust Crisis", 
+        "executive_impact": "Lose X% customers, $Y in fines, reputation damage",
+        "mid_level_pitch": "Stolen customer data leads to regulatory fines and lost business",
+        "real_examples": {
+            "retail": "Lost 15% customers after breach, $1M GDPR fine",
+            "financial": "Banking license review, $10M settlement",
+            "healthcare": "HIPAA fines $5M, class action lawsuit"
         }
-        
-        # Where attacks hit (business terms)
-        self.attack_surfaces = {
-            "email": {
-                "technical_name": "Email Infrastructure",
-                "business_name": "Communication Channel",
-                "why_targeted": "Everyone uses it, easy to fake",
-                "impact": "Compromised email = trusted attacker"
-            },
-            "web_apps": {
-                "technical_name": "Web Applications",
-                "business_name": "Customer Interface",
-                "why_targeted": "Public-facing, valuable data",
-                "impact": "Down = no digital revenue"
-            },
-            "cloud": {
-                "technical_name": "Cloud Infrastructure",
-                "business_name": "Digital Operations Platform",
-                "why_targeted": "All your data in one place",
-                "impact": "Breach = everything exposed"
-            },
-            "erp": {
-                "technical_name": "ERP/Critical Systems",
-                "business_name": "Business Brain",
-                "why_targeted": "Controls everything",
-                "impact": "Down = company paralyzed"
-            },
-            "mobile": {
-                "technical_name": "Mobile Applications",
-                "business_name": "Customer Pocket Presence",
-                "why_targeted": "Direct customer access",
-                "impact": "Breach = customer exodus"
-            }
+    },
+    "ddos": {
+        "technical_name": "Denial of Service",
+        "business_name": "Revenue Channel Block",
+        "executive_impact": "Can't sell for X hours, lose $Y in sales",
+        "mid_level_pitch": "Website/app down means no digital revenue",
+        "real_examples": {
+            "ecommerce": "Black Friday attack, $500K/hour loss",
+            "banking": "Mobile app down, 10K customer complaints",
+            "gaming": "Launch day attack, 50% refund requests"
         }
-        
-        # Business impact categories (what executives care about)
-        self.business_impacts = {
-            "operational": {
-                "name": "Can't Operate",
-                "examples": ["Factory stops", "Orders halt", "Services down"],
-                "metrics": "Days down × Daily revenue = Loss"
-            },
-            "customer": {
-                "name": "Lose Customers",
-                "examples": ["Trust broken", "Competitors gain", "Churn spike"],
-                "metrics": "Customer lifetime value × Churn rate = Loss"
-            },
-            "regulatory": {
-                "name": "Legal Penalties", 
-                "examples": ["GDPR fines", "License review", "Lawsuits"],
-                "metrics": "Fine + Legal costs + Remediation = Loss"
-            },
-            "competitive": {
-                "name": "Market Position Loss",
-                "examples": ["IP stolen", "First-mover lost", "Reputation hit"],
-                "metrics": "Market share loss × Revenue = Loss"
-            },
-            "financial": {
-                "name": "Direct Money Loss",
-                "examples": ["Ransom paid", "Fraud loss", "Recovery cost"],
-                "metrics": "Direct loss + Recovery + Opportunity cost = Loss"
-            }
+    },
+    "supply_chain": {
+        "technical_name": "Supply Chain Compromise",
+        "business_name": "Partner Contamination",
+        "executive_impact": "Trusted vendor becomes attack path, $X cleanup",
+        "mid_level_pitch": "Attackers use your vendors to reach you",
+        "real_examples": {
+            "software": "Update server compromised, 1000 customers hit",
+            "manufacturing": "Supplier ransomware spread to 5 partners",
+            "retail": "POS vendor breach, all stores affected"
         }
-        
-        # Enhanced attack patterns with business context
-        self.attack_patterns = {
-            "ransomware": {
-                "affected_models": [1, 2, 3, 4, 5, 6, 7, 8],
-                "primary_models": [6],  # Legacy systems most vulnerable
-                "business_translation": "Everything stops until you pay or rebuild",
-                "typical_entry": ["phishing", "unpatched_systems"],
-                "typical_cost": "$500K-$10M depending on size",
-                "recovery_time": "5-15 days",
-                "prevention_roi": "20:1 (prevent:incident cost)"
-            },
-            "api_exploitation": {
-                "affected_models": [2, 3, 4, 5],
-                "primary_models": [4],  # Digital ecosystems
-                "business_translation": "Your digital connections become attack paths",
-                "typical_entry": ["stolen_credentials", "unpatched_systems"],
-                "typical_cost": "$1M-$5M in breach costs",
-                "recovery_time": "10-30 days",
-                "prevention_roi": "15:1"
-            },
-            "supply_chain": {
-                "affected_models": [1, 6, 7],
-                "primary_models": [7],  # Supply chain model
-                "business_translation": "Your vendor's problem becomes your crisis",
-                "typical_entry": ["third_party_compromise"],
-                "typical_cost": "$2M-$20M cascade effect",
-                "recovery_time": "30-90 days", 
-                "prevention_roi": "10:1"
-            },
-            "data_exfiltration": {
-                "affected_models": [3, 5, 8],
-                "primary_models": [3, 8],  # Data services & regulated
-                "business_translation": "Your crown jewels stolen, customers leave",
-                "typical_entry": ["phishing", "insider_threat"],
-                "typical_cost": "$3M-$50M with fines",
-                "recovery_time": "6-12 months reputation",
-                "prevention_roi": "25:1"
-            },
-            "account_takeover": {
-                "affected_models": [2, 4, 5],
-                "primary_models": [5],  # Financial services
-                "business_translation": "Criminals become your customers",
-                "typical_entry": ["stolen_credentials", "phishing"],
-                "typical_cost": "$500K-$5M fraud losses",
-                "recovery_time": "Ongoing monitoring",
-                "prevention_roi": "30:1"
-            },
-            "pos_malware": {
-                "affected_models": [1, 5],
-                "primary_models": [1],  # Hybrid commerce
-                "business_translation": "Every sale = stolen card",
-                "typical_entry": ["third_party_compromise", "insider_threat"],
-                "typical_cost": "$1M-$10M + fines",
-                "recovery_time": "3-6 months",
-                "prevention_roi": "20:1"
-            },
-            "cloud_breach": {
-                "affected_models": [2, 3, 4, 5],
-                "primary_models": [2],  # Critical software
-                "business_translation": "Your cloud = their playground",
-                "typical_entry": ["cloud_misconfiguration", "stolen_credentials"],
-                "typical_cost": "$2M-$15M",
-                "recovery_time": "1-3 months",
-                "prevention_roi": "18:1"
-            },
-            "iot_botnet": {
-                "affected_models": [1, 4, 6],
-                "primary_models": [4],  # Digital ecosystem
-                "business_translation": "Your devices attack others",
-                "typical_entry": ["unpatched_systems"],
-                "typical_cost": "$500K-$2M liability",
-                "recovery_time": "1-2 months",
-                "prevention_roi": "12:1"
-            },
-            "cryptojacking": {
-                "affected_models": [2, 4, 6],
-                "primary_models": [6],  # Legacy infrastructure
-                "business_translation": "Your servers mine their crypto",
-                "typical_entry": ["unpatched_systems", "cloud_misconfiguration"],
-                "typical_cost": "$100K-$1M energy + performance",
-                "recovery_time": "1-2 weeks",
-                "prevention_roi": "8:1"
-            },
-            "business_email_compromise": {
-                "affected_models": [1, 5, 7],
-                "primary_models": [7],  # Supply chain
-                "business_translation": "Fake invoices, real payments",
-                "typical_entry": ["phishing", "stolen_credentials"],
-                "typical_cost": "$500K-$5M direct loss",
-                "recovery_time": "Immediate loss",
-                "prevention_roi": "40:1"
-            }
+    },
+    "insider_threat": {
+        "technical_name": "Malicious Insider",
+        "business_name": "Trust Betrayal Loss",
+        "executive_impact": "Employee steals IP/data, competitor advantage",
+        "mid_level_pitch": "Authorized access used for theft or sabotage",
+        "real_examples": {
+            "tech": "Engineer stole code, started competitor",
+            "financial": "Trader hidden losses, $100M damage",
+            "healthcare": "Nurse sold patient records, 50K affected"
         }
+    }
+})
+
+# How attacks happen (simplified for executives)
+ATTACK_VECTORS = freeze({
+    "phishing": {
+        "technical_term": "Phishing/Social Engineering",
+        "simple_term": "Fake Emails That Trick People",
+        "how_it_works": "Employees click bad links → attacker gets in",
+        "business_relevance": "Your people are the weakest link",
+        "prevention_cost": "$50/user training vs $2M breach"
+    },
+    "stolen_credentials": {
+        "technical_term": "Compromised Credentials",
+        "simple_term": "Stolen Passwords",
+        "how_it_works": "Reused passwords from other breaches → easy access",
+        "business_relevance": "One password = many systems compromised",
+        "prevention_cost": "$10/user MFA vs $500K incident"
+    },
+    "unpatched_systems": {
+        "technical_term": "Unpatched Vulnerabilities", 
+        "simple_term": "Unfixed Security Holes",
+        "how_it_works": "Known problems not fixed → attackers walk in",
+        "business_relevance": "Like leaving doors unlocked",
+        "prevention_cost": "$5K/month patching vs $1M breach"
+    },
+    "cloud_misconfiguration": {
+        "technical_term": "Cloud Misconfiguration",
+        "simple_term": "Cloud Settings Wrong",
+        "how_it_works": "Storage left public → data exposed",
+        "business_relevance": "Your data visible to everyone",
+        "prevention_cost": "$2K audit vs $5M data leak"
+    },
+    "third_party_compromise": {
+        "technical_term": "Third-Party Compromise",
+        "simple_term": "Vendor Got Hacked", 
+        "how_it_works": "Trusted vendor breached → access to you",
+        "business_relevance": "Your security = weakest vendor",
+        "prevention_cost": "$10K vendor audit vs $2M cleanup"
+    }
+})
+
+# Where attacks hit (business terms)
+ATTACK_SURFACES = freeze({
+    "email": {
+        "technical_name": "Email Infrastructure",
+        "business_name": "Communication Channel",
+        "why_targeted": "Everyone uses it, easy to fake",
+        "impact": "Compromised email = trusted attacker"
+    },
+    "web_apps": {
+        "technical_name": "Web Applications",
+        "business_name": "Customer Interface",
+        "why_targeted": "Public-facing, valuable data",
+        "impact": "Down = no digital revenue"
+    },
+    "cloud": {
+        "technical_name": "Cloud Infrastructure",
+        "business_name": "Digital Operations Platform",
+        "why_targeted": "All your data in one place",
+        "impact": "Breach = everything exposed"
+    },
+    "erp": {
+        "technical_name": "ERP/Critical Systems",
+        "business_name": "Business Brain",
+        "why_targeted": "Controls everything",
+        "impact": "Down = company paralyzed"
+    },
+    "mobile": {
+        "technical_name": "Mobile Applications",
+        "business_name": "Customer Pocket Presence",
+        "why_targeted": "Direct customer access",
+        "impact": "Breach = customer exodus"
+    }
+})
+
+# Business impact categories (what executives care about)
+BUSINESS_IMPACTS = freeze({
+    "operational": {
+        "name": "Can't Operate",
+        "examples": ["Factory stops", "Orders halt", "Services down"],
+        "metrics": "Days down × Daily revenue = Loss"
+    },
+    "customer": {
+        "name": "Lose Customers",
+        "examples": ["Trust broken", "Competitors gain", "Churn spike"],
+        "metrics": "Customer lifetime value × Churn rate = Loss"
+    },
+    "regulatory": {
+        "name": "Legal Penalties", 
+        "examples": ["GDPR fines", "License review", "Lawsuits"],
+        "metrics": "Fine + Legal costs + Remediation = Loss"
+    },
+    "competitive": {
+        "name": "Market Position Loss",
+        "examples": ["IP stolen", "First-mover lost", "Reputation hit"],
+        "metrics": "Market share loss × Revenue = Loss"
+    },
+    "financial": {
+        "name": "Direct Money Loss",
+        "examples": ["Ransom paid", "Fraud loss", "Recovery cost"],
+        "metrics": "Direct loss + Recovery + Opportunity cost = Loss"
+    }
+})
+
+# Enhanced attack patterns with business context
+ATTACK_PATTERNS = freeze({
+    "ransomware": {
+        "affected_models": [1, 2, 3, 4, 5, 6, 7, 8],
+        "primary_models": [6],  # Legacy systems most vulnerable
+        "business_translation": "Everything stops until you pay or rebuild",
+        "typical_entry": ["phishing", "unpatched_systems"],
+        "typical_cost": "$500K-$10M depending on size",
+        "recovery_time": "5-15 days",
+        "prevention_roi": "20:1 (prevent:incident cost)"
+    },
+    "api_exploitation": {
+        "affected_models": [2, 3, 4, 5],
+        "primary_models": [4],  # Digital ecosystems
+        "business_translation": "Your digital connections become attack paths",
+        "typical_entry": ["stolen_credentials", "unpatched_systems"],
+        "typical_cost": "$1M-$5M in breach costs",
+        "recovery_time": "10-30 days",
+        "prevention_roi": "15:1"
+    },
+    "supply_chain": {
+        "affected_models": [1, 6, 7],
+        "primary_models": [7],  # Supply chain model
+        "business_translation": "Your vendor's problem becomes your crisis",
+        "typical_entry": ["third_party_compromise"],
+        "typical_cost": "$2M-$20M cascade effect",
+        "recovery_time": "30-90 days", 
+        "prevention_roi": "10:1"
+    },
+    "data_exfiltration": {
+        "affected_models": [3, 5, 8],
+        "primary_models": [3, 8],  # Data services & regulated
+        "business_translation": "Your crown jewels stolen, customers leave",
+        "typical_entry": ["phishing", "insider_threat"],
+        "typical_cost": "$3M-$50M with fines",
+        "recovery_time": "6-12 months reputation",
+        "prevention_roi": "25:1"
+    },
+    "account_takeover": {
+        "affected_models": [2, 4, 5],
+        "primary_models": [5],  # Financial services
+        "business_translation": "Criminals become your customers",
+        "typical_entry": ["stolen_credentials", "phishing"],
+        "typical_cost": "$500K-$5M fraud losses",
+        "recovery_time": "Ongoing monitoring",
+        "prevention_roi": "30:1"
+    },
+    "pos_malware": {
+        "affected_models": [1, 5],
+        "primary_models": [1],  # Hybrid commerce
+        "business_translation": "Every sale = stolen card",
+        "typical_entry": ["third_party_compromise", "insider_threat"],
+        "typical_cost": "$1M-$10M + fines",
+        "recovery_time": "3-6 months",
+        "prevention_roi": "20:1"
+    },
+    "cloud_breach": {
+        "affected_models": [2, 3, 4, 5],
+        "primary_models": [2],  # Critical software
+        "business_translation": "Your cloud = their playground",
+        "typical_entry": ["cloud_misconfiguration", "stolen_credentials"],
+        "typical_cost": "$2M-$15M",
+        "recovery_time": "1-3 months",
+        "prevention_roi": "18:1"
+    },
+    "iot_botnet": {
+        "affected_models": [1, 4, 6],
+        "primary_models": [4],  # Digital ecosystem
+        "business_translation": "Your devices attack others",
+        "typical_entry": ["unpatched_systems"],
+        "typical_cost": "$500K-$2M liability",
+        "recovery_time": "1-2 months",
+        "prevention_roi": "12:1"
+    },
+    "cryptojacking": {
+        "affected_models": [2, 4, 6],
+        "primary_models": [6],  # Legacy infrastructure
+        "business_translation": "Your servers mine their crypto",
+        "typical_entry": ["unpatched_systems", "cloud_misconfiguration"],
+        "typical_cost": "$100K-$1M energy + performance",
+        "recovery_time": "1-2 weeks",
+        "prevention_roi": "8:1"
+    },
+    "business_email_compromise": {
+        "affected_models": [1, 5, 7],
+        "primary_models": [7],  # Supply chain
+        "business_translation": "Fake invoices, real payments",
+        "typical_entry": ["phishing", "stolen_credentials"],
+        "typical_cost": "$500K-$5M direct loss",
+        "recovery_time": "Immediate loss",
+        "prevention_roi": "40:1"
+    }
+})
+
+# Keyword rules for detecting attack patterns (first match wins)
+PATTERN_KEYWORDS = freeze({
+    'ransomware': ['ransomware', 'ransom', 'encrypt', 'lockbit', 'conti'],
+    'api_exploitation': ['api', 'endpoint', 'rest', 'graphql', 'webhook'],
+    'supply_chain': ['supply chain', 'vendor', 'third party', 'provider'],
+    'data_exfiltration': ['exfiltrat', 'data theft', 'breach', 'leak'],
+    'account_takeover': ['account takeover', 'ato', 'credential stuff'],
+    'pos_malware': ['pos', 'point of sale', 'payment', 'card'],
+    'cloud_breach': ['cloud', 'aws', 'azure', 'gcp', 's3'],
+    'iot_botnet': ['iot', 'botnet', 'mirai', 'device'],
+    'cryptojacking': ['crypto', 'mining', 'monero', 'coinhive'],
+    'business_email_compromise': ['bec', 'ceo fraud', 'invoice', 'wire']
+})
+
+# Keyword rules for detecting attack vectors (first match wins)
+VECTOR_KEYWORDS = freeze({
+    'phishing': ['phish', 'spear', 'email', 'social'],
+    'stolen_credentials': ['credential', 'password', 'brute', 'stuff'],
+    'unpatched_systems': ['cve', 'vulnerab', 'exploit', 'patch'],
+    'cloud_misconfiguration': ['misconfig', 'exposed', 'public', 'open'],
+    'third_party_compromise': ['vendor', 'supply', 'third', 'partner'],
+    'insider_threat': ['insider', 'employee', 'privileged', 'abuse']
+})
+
+
+@lru_cache(maxsize=None)
+def _classifier():
+    """Precompiled single-pass classifier shared by pattern/vector detection (built on first use)"""
+    return ThreatClassifier({
+        "pattern": PATTERN_KEYWORDS,
+        "vector": VECTOR_KEYWORDS,
+        "malware": {"malware": ["malware"]}
+    })
+
+
+# Distinct (mapper class, attack pattern, attack vector) narratives kept in memory
+NARRATIVE_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=NARRATIVE_CACHE_SIZE)
+def _narrative_snapshot(mapper_class, pattern, vector):
+    """
+    Pattern/vector-derived sections of analyze_threat, built once per
+    combination in the process and kept pickled: unpickling hands every
+    threat its own copy far faster than rebuilding or deep-copying them
+    """
+    sections = mapper_class().build_narrative_sections(pattern, vector)
+    return pickle.dumps(sections, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class EnhancedBusinessModelMapper:
+    """Maps cyber incidents to business models with dual-language approach"""
+    
+    def __init__(self):
+        # Shared, read-only rule tables
+        self.business_models = BUSINESS_MODELS
+        self.cyber_threats = CYBER_THREATS
+        self.attack_vectors = ATTACK_VECTORS
+        self.attack_surfaces = ATTACK_SURFACES
+        self.business_impacts = BUSINESS_IMPACTS
+        self.attack_patterns = ATTACK_PATTERNS
+        self.pattern_keywords = PATTERN_KEYWORDS
+        self.vector_keywords = VECTOR_KEYWORDS
+        self.classifier = _classifier()
+    
+    def classify_threat(self, title, description, tags):
+        """Classify combined threat text against all keyword rules in one pass"""
+        combined_text = f"{title} {description} {' '.join(tags)}"
+        return self.classifier.classify(combined_text)
 
     def analyze_threat(self, threat_data):
         """
@@ -283,29 +364,18 @@ class EnhancedBusinessModelMapper:
         title = threat_data.get('title', '').lower()
         description = threat_data.get('description', '').lower()
         tags = [tag.lower() for tag in threat_data.get('tags', [])]
-        iocs = threat_data.get('iocs', {})
+        iocs = IOCTable.of(threat_data.get('iocs'))  # Indexed once for every IOC consumer
         
-        # Identify attack pattern
-        detected_pattern = self._detect_attack_pattern(title, description, tags)
-        
-        # Get affected business models
-        if detected_pattern:
-            pattern_info = self.attack_patterns[detected_pattern]
-            affected_models = pattern_info['affected_models']
-            primary_models = pattern_info['primary_models']
-        else:
-            affected_models = []
-            primary_models = []
+        # Scan threat text once for all pattern/vector rules
+        classification = self.classify_threat(title, description, tags)
         
-        # Identify attack vector
-        detected_vector = self._detect_attack_vector(title, description, tags, iocs)
+        # Identify attack pattern and vector
+        detected_pattern = self._detect_attack_pattern(title, description, tags, classification)
+        detected_vector = self._detect_attack_vector(title, description, tags, iocs, classification)
         
-        # Calculate business impact
-        impact_analysis = self._analyze_business_impact(
-            detected_pattern, 
-            detected_vector,
-            affected_models
-        )
+        # Narrative sections depend only on (pattern, vector): reuse the memoized copy
+        sections = pickle.loads(_narrative_snapshot(type(self), detected_pattern, detected_vector))
+        pitch_points = sections['pitch_points']
         
         # Build comprehensive analysis
         analysis = {
@@ -314,39 +384,79 @@ class EnhancedBusinessModelMapper:
                 "technical": {
                     "attack_pattern": detected_pattern,
                     "attack_vector": detected_vector,
-                    "ioc_count": sum(len(v) if isinstance(v, list) else 1 
-                                    for v in iocs.values()),
+                    "ioc_count": len(iocs),
                     "affected_systems": self._identify_affected_systems(iocs),
                     "ttps": self._extract_ttps(description, tags)
                 },
                 
                 # Business layer (for executives)
-                "business": {
-                    "simple_explanation": self._get_simple_explanation(detected_pattern),
-                    "cost_range": pattern_info.get('typical_cost', 'Unknown') 
-                                 if detected_pattern else "Requires analysis",
-                    "recovery_time": pattern_info.get('recovery_time', 'Unknown')
-                                    if detected_pattern else "Varies",
-                    "similar_incidents": self._get_similar_incidents(detected_pattern),
-                    "key_question": self._get_key_question(detected_pattern)
-                },
+                "business": sections['business'],
                 
                 # Bridge layer (for mid-level to pitch upward)
                 "pitch_points": {
-                    "elevator_pitch": self._create_elevator_pitch(
-                        detected_pattern, 
-                        impact_analysis
-                    ),
-                    "roi_statement": self._create_roi_statement(detected_pattern),
+                    "elevator_pitch": pitch_points['elevator_pitch'],
+                    "roi_statement": pitch_points['roi_statement'],
                     "urgency_driver": self._create_urgency_driver(
                         detected_pattern,
                         threat_data
                     ),
-                    "competitor_angle": self._create_competitor_angle(detected_pattern)
+                    "competitor_angle": pitch_points['competitor_angle']
                 }
             },
             
             # Business model impact
+            "business_model_impact": sections['business_model_impact'],
+            
+            # Actionable intelligence
+            "recommendations": sections['recommendations'],
+            
+            # Executive decision support
+            "executive_summary": sections['executive_summary']
+        }
+        
+        return analysis
+    
+    def build_narrative_sections(self, pattern, vector):
+        """
+        Analysis sections that depend only on the attack pattern and vector
+        
+        analyze_threat memoizes these per (pattern, vector); threat-specific
+        fields (IOCs, TTPs, urgency driver) are added per threat.
+        """
+        # Get affected business models
+        if pattern:
+            pattern_info = self.attack_patterns[pattern]
+            affected_models = list(pattern_info['affected_models'])
+            primary_models = list(pattern_info['primary_models'])
+        else:
+            affected_models = []
+            primary_models = []
+        
+        # Calculate business impact
+        impact_analysis = self._analyze_business_impact(
+            pattern, 
+            vector,
+            affected_models
+        )
+        
+        return {
+            "business": {
+                "simple_explanation": self._get_simple_explanation(pattern),
+                "cost_range": pattern_info.get('typical_cost', 'Unknown') 
+                             if pattern else "Requires analysis",
+                "recovery_time": pattern_info.get('recovery_time', 'Unknown')
+                                if pattern else "Varies",
+                "similar_incidents": self._get_similar_incidents(pattern),
+                "key_question": self._get_key_question(pattern)
+            },
+            "pitch_points": {
+                "elevator_pitch": self._create_elevator_pitch(
+                    pattern, 
+                    impact_analysis
+                ),
+                "roi_statement": self._create_roi_statement(pattern),
+                "competitor_angle": self._create_competitor_angle(pattern)
+            },
             "business_model_impact": {
                 "affected_models": affected_models,
                 "primary_impact_models": primary_models,
@@ -356,84 +466,57 @@ class EnhancedBusinessModelMapper:
                 },
                 "impact_narrative": self._create_impact_narrative(
                     primary_models,
-                    detected_pattern
+                    pattern
                 )
             },
-            
-            # Actionable intelligence
             "recommendations": {
-                "immediate_check": self._get_immediate_check(detected_pattern),
-                "quick_win": self._get_quick_win(detected_pattern, detected_vector),
+                "immediate_check": self._get_immediate_check(pattern),
+                "quick_win": self._get_quick_win(pattern, vector),
                 "strategic_investment": self._get_strategic_investment(
-                    detected_pattern,
+                    pattern,
                     primary_models
                 ),
                 "expected_roi": pattern_info.get('prevention_roi', 'High')
-                               if detected_pattern else "10:1 typical"
+                               if pattern else "10:1 typical"
             },
-            
-            # Executive decision support
             "executive_summary": {
                 "threat_in_one_line": self._create_one_liner(
-                    detected_pattern,
+                    pattern,
                     impact_analysis
                 ),
                 "business_risk": impact_analysis['primary_impact'],
                 "financial_exposure": impact_analysis['financial_range'],
                 "action_required": impact_analysis['action_urgency'],
                 "board_ready_statement": self._create_board_statement(
-                    detected_pattern,
+                    pattern,
                     impact_analysis
                 )
             }
         }
-        
-        return analysis
     
-    def _detect_attack_pattern(self, title, description, tags):
+    def _detect_attack_pattern(self, title, description, tags, classification=None):
         """Detects attack pattern from threat indicators"""
-        combined_text = f"{title} {description} {' '.join(tags)}"
-        
-        pattern_keywords = {
-            'ransomware': ['ransomware', 'ransom', 'encrypt', 'lockbit', 'conti'],
-            'api_exploitation': ['api', 'endpoint', 'rest', 'graphql', 'webhook'],
-            'supply_chain': ['supply chain', 'vendor', 'third party', 'provider'],
-            'data_exfiltration': ['exfiltrat', 'data theft', 'breach', 'leak'],
-            'account_takeover': ['account takeover', 'ato', 'credential stuff'],
-            'pos_malware': ['pos', 'point of sale', 'payment', 'card'],
-            'cloud_breach': ['cloud', 'aws', 'azure', 'gcp', 's3'],
-            'iot_botnet': ['iot', 'botnet', 'mirai', 'device'],
-            'cryptojacking': ['crypto', 'mining', 'monero', 'coinhive'],
-            'business_email_compromise': ['bec', 'ceo fraud', 'invoice', 'wire']
-        }
+        if classification is None:
+            classification = self.classify_threat(title, description, tags)
         
-        for pattern, keywords in pattern_keywords.items():
-            if any(keyword in combined_text for keyword in keywords):
-                return pattern
+        if classification['pattern']:
+            return classification['pattern'][0]
         
         return None
     
-    def _detect_attack_vector(self, title, description, tags, iocs):
+    def _detect_attack_vector(self, title, description, tags, iocs, classification=None):
         """Detects how the attack happens"""
-        combined_text = f"{title} {description} {' '.join(tags)}"
-        
-        vector_keywords = {
-            'phishing': ['phish', 'spear', 'email', 'social'],
-            'stolen_credentials': ['credential', 'password', 'brute', 'stuff'],
-            'unpatched_systems': ['cve', 'vulnerab', 'exploit', 'patch'],
-            'cloud_misconfiguration': ['misconfig', 'exposed', 'public', 'open'],
-            'third_party_compromise': ['vendor', 'supply', 'third', 'partner'],
-            'insider_threat': ['insider', 'employee', 'privileged', 'abuse']
-        }
+        if classification is None:
+            classification = self.classify_threat(title, description, tags)
         
-        for vector, keywords in vector_keywords.items():
-            if any(keyword in combined_text for keyword in keywords):
-                return vector
+        if classification['vector']:
+            return classification['vector'][0]
                 
         # Check IOCs for vector hints
-        if iocs.get('email', []):
+        iocs = IOCTable.of(iocs)
+        if iocs.has('email'):
             return 'phishing'
-        elif iocs.get('hash', []) and 'malware' in combined_text:
+        elif iocs.has('hash') and classification['malware']:
             return 'unpatched_systems'
             
         return 'unknown'
@@ -474,7 +557,7 @@ class EnhancedBusinessModelMapper:
         
         return {
             'primary_impact': impact_info['name'],
-            'impact_examples': impact_info['examples'],
+            'impact_examples': list(impact_info['examples']),
             'financial_range': pattern_info.get('typical_cost', 'Unknown'),
             'action_urgency': urgency
         }
@@ -653,14 +736,15 @@ class EnhancedBusinessModelMapper:
     
     def _identify_affected_systems(self, iocs):
         """Maps IOCs to business systems"""
+        iocs = IOCTable.of(iocs)
         systems = []
-        if iocs.get('email'):
+        if iocs.has('email'):
             systems.append('Email/Communications')
-        if iocs.get('ip') or iocs.get('domain'):
+        if iocs.has('ip') or iocs.has('domain'):
             systems.append('Web/Digital Properties')
-        if iocs.get('hash'):
+        if iocs.has('hash'):
             systems.append('Endpoints/Workstations')
-        if iocs.get('url'):
+        if iocs.has('url'):
             systems.append('Web Applications')
         return systems or ['Multiple Systems']
     
@@ -4,15 +4,47 @@ DII 4.0 Immunity Dashboard Generator V4
 Enhanced for executive conversations with Spain inclusion
 """
 
+import argparse
 import json
 import os
+import re
+import sys
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from collections import Counter
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from utils.build_graph import BuildGraph
+from utils.template_engine import load_template
+
+# Dashboard template, resolved from this file so any working directory works
+DEFAULT_TEMPLATE = Path(__file__).resolve().parents[1] / "templates" / "immunity_dashboard_template_v4.html"
+
+# Client data for batch rendering (one dashboard per client)
+DEFAULT_HISTORICAL_DATA = Path(__file__).resolve().parents[1] / "data" / "dii_v4_historical_data.json"
+CLIENT_CHUNK_SIZE = 25
+
+# Rendering code is a build input too: editing it rebuilds existing dashboards
+GENERATOR_SOURCE = os.path.abspath(__file__)
+
+# Business model names in client data -> model keys used by the dashboards
+MODEL_KEYS = {
+    "Servicios Financieros": "SERVICIOS_FINANCIEROS",
+    "Información Regulada": "INFORMACION_REGULADA",
+    "Ecosistema Digital": "ECOSISTEMA_DIGITAL",
+    "Cadena de Suministro": "CADENA_SUMINISTRO",
+    "Software Crítico": "SOFTWARE_CRITICO",
+    "Servicios de Datos": "SERVICIOS_DATOS",
+    "Comercio Híbrido": "COMERCIO_HIBRIDO",
+    "Infraestructura Heredada": "INFRAESTRUCTURA_HEREDADA"
+}
+
 class DIIv4ExecutiveDashboardGenerator:
     def __init__(self):
-        self.template_path = "../templates/immunity_dashboard_template_v4.html"
+        self.template_path = str(DEFAULT_TEMPLATE)
         self.output_dir = "./outputs/dashboards"
         self.week_date = datetime.now().strftime('%Y-%m-%d')
         
@@ -56,9 +88,16 @@ class DIIv4ExecutiveDashboardGenerator:
                 "low": "Recuperación casi según lo planeado (menos de 1.5x)"
             }
         }
+        
+        # Client AER is on the assessment scale (attack cost / accessible value)
+        self.client_aer_meanings = {
+            "high": "Atacar es costoso: el coste del ataque supera con creces el valor accesible",
+            "medium": "Coste de ataque moderado frente al valor accesible",
+            "low": "Objetivo rentable: el valor accesible compensa el coste del ataque"
+        }
 
-    def load_weekly_intelligence_data(self):
-        """Load the weekly intelligence data from multiple possible locations"""
+    def find_weekly_intelligence_file(self):
+        """First existing weekly intelligence data file, or None"""
         week_num = datetime.now().isocalendar()[1]
         year = datetime.now().year
         
@@ -72,10 +111,19 @@ class DIIv4ExecutiveDashboardGenerator:
         
         for file_path in possible_files:
             if os.path.exists(file_path):
-                print(f"✅ Found intelligence data: {file_path}")
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return file_path
+        return None
+
+    def load_weekly_intelligence_data(self):
+        """Load the weekly intelligence data from multiple possible locations"""
+        file_path = self.find_weekly_intelligence_file()
+        if file_path:
+            print(f"✅ Found intelligence data: {file_path}")
+            with open(file_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
         
+        week_num = datetime.now().isocalendar()[1]
+        year = datetime.now().year
         week_dir = f"research/{year}/week-{week_num}"
         os.makedirs(week_dir, exist_ok=True)
         
@@ -144,12 +192,22 @@ class DIIv4ExecutiveDashboardGenerator:
         
         return most_affected.replace('_', ' '), description
 
-    def get_dimension_meaning(self, dimension, value):
-        """Get executive-friendly meaning of dimension value"""
+    def get_dimension_meaning(self, dimension, value, scale="weekly"):
+        """
+        Get executive-friendly meaning of dimension value
+        
+        `scale` is "weekly" for the weekly intelligence values or "client"
+        for client assessments, whose AER is the attack economics ratio
+        (attack cost / accessible value, higher is better) rather than the
+        € loss per €1 of attack.
+        """
         meanings = self.dimension_meanings.get(dimension, {})
         
         # Determine level based on dimension and value
-        if dimension == "TRD":
+        if dimension == "AER" and scale == "client":
+            meanings = self.client_aer_meanings
+            level = "high" if float(value) > 4 else "medium" if float(value) > 3 else "low"
+        elif dimension == "TRD":
             level = "high" if float(value) > 24 else "medium" if float(value) > 4 else "low"
         elif dimension == "AER":
             level = "high" if float(value) > 100 else "medium" if float(value) > 20 else "low"
@@ -335,8 +393,7 @@ class DIIv4ExecutiveDashboardGenerator:
 
     def populate_template(self, data):
         """Populate template with executive-focused content"""
-        with open(self.template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
+        template = load_template(self.template_path)
         
         # Get most affected model
         most_affected_model, model_description = self.get_most_affected_model(data)
@@ -361,7 +418,8 @@ class DIIv4ExecutiveDashboardGenerator:
             trend = dim_data.get('trend', 'stable')
             
             replacements[f"{{{{{dim}_VALUE}}}}"] = value
-            replacements[f"{{{{{dim}_MEANING}}}}"] = self.get_dimension_meaning(dim, value)
+            replacements[f"{{{{{dim}_MEANING}}}}"] = self.get_dimension_meaning(
+                dim, value, data.get('dimension_scale', 'weekly'))
             
             trend_text = {
                 "improving": "↑ Mejorando",
@@ -407,13 +465,13 @@ class DIIv4ExecutiveDashboardGenerator:
             "{{Q4_MODELS}}": format_quadrant_models(immunity_chart.get('low_immunity_high_exposure', []))
         })
         
-        # Incidents - Prioritize Spain
+        # Incidents - Prioritize the client's business model (client dashboards), then Spain
         incidents = data.get('incidents', [])
-        spain_incidents = [inc for inc in incidents if inc.get('country') == 'España']
-        other_incidents = [inc for inc in incidents if inc.get('country') != 'España']
-        
-        # Show Spain incidents first, then others
-        sorted_incidents = spain_incidents + other_incidents
+        priority_model = data.get('priority_business_model')
+        sorted_incidents = sorted(incidents, key=lambda inc: (
+            priority_model is not None and inc.get('business_model') != priority_model,
+            inc.get('country') != 'España'
+        ))
         incidents_html = [self.format_incident_card(inc) for inc in sorted_incidents[:8]]
         
         if not incidents_html:
@@ -438,17 +496,21 @@ class DIIv4ExecutiveDashboardGenerator:
             "{{ADAPTATIVO_ACTIVE}}": ""
         })
         
-        # Apply all replacements
-        for key, value in replacements.items():
-            template = template.replace(key, str(value))
-        
-        return template
+        # Apply all replacements in one pass
+        return template.render(replacements)
 
-    def generate_dashboard(self):
-        """Generate executive-focused dashboard"""
+    def generate_dashboard(self, force=False):
+        """Generate executive-focused dashboard (skipped when no input changed, unless forced)"""
         print("🚀 Starting DII 4.0 Executive Dashboard generation...")
         print("📍 Including Spain + LATAM coverage")
         
+        graph = BuildGraph()
+        output_file = os.path.join(self.output_dir, f"immunity-dashboard-{self.week_date}.html")
+        inputs = [self.find_weekly_intelligence_file(), self.template_path, GENERATOR_SOURCE]
+        if not force and inputs[0] and not graph.needs_rebuild(output_file, inputs):
+            print(f"✅ Dashboard up to date (inputs unchanged): {output_file}")
+            return
+        
         # Load data
         data = self.load_weekly_intelligence_data()
         if not data:
@@ -469,9 +531,10 @@ class DIIv4ExecutiveDashboardGenerator:
         Path(self.output_dir).mkdir(parents=True, exist_ok=True)
         
         # Save dashboard
-        output_file = os.path.join(self.output_dir, f"immunity-dashboard-{self.week_date}.html")
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(dashboard_html)
+        graph.record(output_file, inputs)
+        graph.save()
         
         print(f"✅ Executive dashboard generated: {output_file}")
         
@@ -485,6 +548,149 @@ class DIIv4ExecutiveDashboardGenerator:
         
         print("\n💡 Ready for commercial team to engage C-levels!")
 
+    def client_dashboard_data(self, shared_data, client):
+        """
+        Weekly data personalized for one client
+        
+        The client's DII score and dimensions replace the weekly averages
+        (HFP/BRI probabilities shown as percentages, AER on the client
+        assessment scale) and incidents affecting the client's business
+        model are listed first, Spain first within each group.
+        """
+        data = dict(shared_data)
+        model_key = MODEL_KEYS.get(client.get('business_model_v4'), '')
+        
+        data['week_date'] = f"{self.week_date} · {client['company_name']}"
+        data['week_summary'] = dict(shared_data.get('week_summary', {}),
+                                    immunity_avg=f"{client['dii_score']:.1f}")
+        
+        dimensions = {}
+        shared_dimensions = shared_data.get('dii_dimensions', {})
+        for dim, value in client.get('dimensions', {}).items():
+            if dim in ('HFP', 'BRI'):
+                value = value * 100
+            dimensions[dim] = {
+                "value": f"{round(value, 2):g}",
+                "trend": shared_dimensions.get(dim, {}).get('trend', 'stable')
+            }
+        data['dii_dimensions'] = dimensions
+        data['dimension_scale'] = 'client'
+        data['priority_business_model'] = model_key
+        return data
+
+    def client_output_path(self, output_dir, client):
+        name = unicodedata.normalize('NFKD', client['company_name']).encode('ascii', 'ignore').decode('ascii')
+        slug = re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+        return os.path.join(output_dir, f"client-{client['id']}-{slug}.html")
+
+    def render_client_dashboards(self, clients, shared_data, output_dir):
+        """Render and write dashboards for a list of clients; returns the written paths"""
+        written = []
+        for client in clients:
+            html = self.populate_template(self.client_dashboard_data(shared_data, client))
+            output_file = self.client_output_path(output_dir, client)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(html)
+            written.append(output_file)
+        return written
+
+    def generate_client_dashboards(self, historical_data=DEFAULT_HISTORICAL_DATA,
+                                   output_dir=None, workers=None,
+                                   chunk_size=CLIENT_CHUNK_SIZE, force=False):
+        """
+        Batch mode: one dashboard per client in the historical data
+        
+        Weekly data, client data and the template are loaded once; clients
+        are rendered in chunks across a process pool and each worker writes
+        its own outputs, so the run scales with cores instead of invocations.
+        Only dashboards whose weekly data, template or client record changed
+        since they were written are rendered (all of them with `force`).
+        
+        Returns:
+            List of written dashboard paths (client order)
+        """
+        print("🚀 Starting DII 4.0 client dashboard batch...")
+        
+        data = self.load_weekly_intelligence_data()
+        if not data:
+            return []
+        
+        with open(historical_data, 'r', encoding='utf-8') as f:
+            clients = json.load(f)['clients']
+        
+        output_dir = output_dir or os.path.join(self.output_dir, 'clients', self.week_date)
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        
+        # Each dashboard depends on the weekly data, the template, this generator and its client record
+        graph = BuildGraph()
+        inputs = [self.find_weekly_intelligence_file(), self.template_path, GENERATOR_SOURCE]
+        paths = [self.client_output_path(output_dir, client) for client in clients]
+        pending = [client for client, path in zip(clients, paths)
+                   if force or graph.needs_rebuild(path, inputs, client)]
+        
+        started = datetime.now()
+        chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+        workers = workers or os.cpu_count() or 1
+        
+        # Single-core hosts and small batches are not worth the process start-up cost
+        if workers <= 1 or len(chunks) <= 1:
+            written = self.render_client_dashboards(pending, data, output_dir)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self, data, output_dir)) as executor:
+                written = [path for paths in executor.map(_render_chunk, chunks) for path in paths]
+        
+        for client, path in zip(pending, written):
+            graph.record(path, inputs, client)
+        
+        # Index of the batch for the commercial team
+        index_file = os.path.join(output_dir, 'index.json')
+        if written or not os.path.exists(index_file):
+            index = [{
+                "id": client['id'],
+                "company_name": client['company_name'],
+                "business_model": client.get('business_model_v4'),
+                "dii_score": client.get('dii_score'),
+                "dashboard": os.path.basename(path)
+            } for client, path in zip(clients, paths)]
+            with open(index_file, 'w', encoding='utf-8') as f:
+                json.dump({"week_date": self.week_date, "clients": index}, f, ensure_ascii=False, indent=2)
+        graph.save()
+        
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"✅ {len(written)} client dashboards written to {output_dir} in {elapsed:.1f}s "
+              f"({len(clients) - len(pending)} up to date)")
+        return written
+
+
+# Generator, weekly data and output directory shared by pool workers
+_worker_state = None
+
+def _init_worker(generator, shared_data, output_dir):
+    global _worker_state
+    _worker_state = (generator, shared_data, output_dir)
+
+def _render_chunk(clients):
+    generator, shared_data, output_dir = _worker_state
+    return generator.render_client_dashboards(clients, shared_data, output_dir)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='DII 4.0 executive dashboard generator')
+    parser.add_argument('--clients', action='store_true',
+                        help='Batch mode: render one dashboard per client in the historical data')
+    parser.add_argument('--historical-data', default=str(DEFAULT_HISTORICAL_DATA),
+                        help='Client data JSON for --clients')
+    parser.add_argument('--output-dir', help='Output directory for --clients '
+                        '(default: outputs/dashboards/clients/<week date>)')
+    parser.add_argument('-w', '--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='Re-render even when no input changed since the last build')
+    args = parser.parse_args()
+    
     generator = DIIv4ExecutiveDashboardGenerator()
-    generator.generate_dashboard()
\ No newline at end of file
+    if args.clients:
+        generator.generate_client_dashboards(args.historical_data, args.output_dir, args.workers,
+                                             force=args.force)
+    else:
+        generator.generate_dashboard(force=args.force)
\ No newline at end of file
@@ -6,6 +6,7 @@ Shows API status, data freshness, and service health
 
 import json
 import os
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -15,6 +16,11 @@ try:
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+if REQUESTS_AVAILABLE:
+    # Pooled client shared with the collectors
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+    from utils.http_client import get_default_client
+
 
 def check_service_status():
     """Check status of all intelligence services and APIs"""
@@ -197,8 +203,8 @@ def check_endpoint(name: str, config: dict, services: dict):
                 services[name] = {"status": "no_auth"}
                 return
         
-        # Quick timeout to avoid hanging
-        response = requests.head(config["url"], headers=headers, timeout=5)
+        # Quick timeout to avoid hanging; no retries so the status reflects the first answer
+        response = get_default_client().head(config["url"], headers=headers, timeout=5, max_retries=0)
         
         if response.status_code < 400:
             print(f"  {name:25} ✅ Online ({response.status_code})")
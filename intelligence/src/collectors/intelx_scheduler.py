@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Quota-Aware IntelX Search Scheduler
+Runs IntelX searches concurrently over the pooled HTTP client, tracks the
+remaining search credits, orders terms by their historical hit yield and
+defers the least valuable terms when there are not enough credits for all
+of them. Deferred terms gain priority on later runs so nothing starves.
+"""
+
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_client import HTTPClient, get_default_client
+
+INTELX_API_URL = "https://free.intelx.io"
+INTELX_SEARCH_PATH = "/intelligent/search"
+INTELX_TIMEOUT = 30
+MAX_SEARCH_WORKERS = 5
+
+# Yield estimate for a term that has never run (optimistic, so new terms get tried)
+NEW_TERM_YIELD = 10.0
+# Priority bonus per consecutive deferral, so deferred terms eventually run
+DEFERRAL_BONUS = 2.0
+# Weight of the latest run in the rolling hit yield
+YIELD_DECAY = 0.5
+
+# Term statistics location (data/raw/cache/ is gitignored)
+INTELLIGENCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_STATS_PATH = os.path.join(INTELLIGENCE_ROOT, 'data', 'raw', 'cache', 'intelx', 'term_stats.json')
+
+# Headers IntelX (or a proxy in front of it) may use to report remaining credits
+QUOTA_HEADERS = ['X-Credits-Remaining', 'X-RateLimit-Remaining', 'RateLimit-Remaining']
+
+
+def country_sector_terms(countries: Iterable[str], topics: Iterable[str]) -> List[str]:
+    """Build '<country> <topic>' search terms, e.g. 'brazil ransomware'"""
+    return [f"{country} {topic}" for country in countries for topic in topics]
+
+
+class TermStats:
+    """
+    Historical hit yield per search term
+
+    Stored as JSON: {term: {"yield": float, "runs": int, "deferred": int,
+    "last_run": iso-date}}. The yield is an exponentially weighted average
+    of records returned per search.
+    """
+
+    def __init__(self, path: str = DEFAULT_STATS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self.terms: Dict[str, Dict[str, Any]] = json.load(f)
+        except (OSError, ValueError):
+            self.terms = {}
+
+    def priority(self, term: str) -> float:
+        stats = self.terms.get(term)
+        if not stats:
+            return NEW_TERM_YIELD
+        return stats.get('yield', 0.0) + DEFERRAL_BONUS * stats.get('deferred', 0)
+
+    def record_hits(self, term: str, hits: int):
+        with self._lock:
+            stats = self.terms.setdefault(term, {'yield': 0.0, 'runs': 0, 'deferred': 0})
+            if stats['runs']:
+                stats['yield'] = YIELD_DECAY * hits + (1 - YIELD_DECAY) * stats['yield']
+            else:
+                stats['yield'] = float(hits)
+            stats['runs'] += 1
+            stats['deferred'] = 0
+            stats['last_run'] = datetime.now().strftime('%Y-%m-%d')
+
+    def record_deferred(self, term: str):
+        with self._lock:
+            stats = self.terms.setdefault(term, {'yield': NEW_TERM_YIELD, 'runs': 0, 'deferred': 0})
+            stats['deferred'] += 1
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.terms, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+
+class QuotaTracker:
+    """Thread-safe count of remaining search credits (None = unknown)"""
+
+    def __init__(self, remaining: Optional[int] = None):
+        self.remaining = remaining
+        self.exhausted = False
+        self._lock = threading.Lock()
+
+    def reserve(self) -> bool:
+        """Take one credit; False when none are left"""
+        with self._lock:
+            if self.exhausted:
+                return False
+            if self.remaining is None:
+                return True
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def update_from_response(self, response: requests.Response):
+        with self._lock:
+            if response.status_code == 402:
+                self.exhausted = True
+                self.remaining = 0
+                return
+            for header in QUOTA_HEADERS:
+                value = response.headers.get(header)
+                if value is not None:
+                    try:
+                        self.remaining = int(float(value))
+                    except ValueError:
+                        continue
+                    break
+
+
+class IntelXSearchScheduler:
+    """
+    Concurrent, quota-aware IntelX search fan-out
+
+    Example:
+        scheduler = IntelXSearchScheduler(api_key)
+        results = scheduler.run(["brazil ransomware", "mexico cyber"], datefrom, dateto)
+    """
+
+    def __init__(self, api_key: str, api_url: str = INTELX_API_URL,
+                 max_workers: int = MAX_SEARCH_WORKERS,
+                 stats: Optional[TermStats] = None,
+                 client: Optional[HTTPClient] = None,
+                 debug: bool = False):
+        self.api_key = api_key
+        self.api_url = api_url.rstrip('/')
+        self.max_workers = max(1, max_workers)
+        self.stats = stats or TermStats()
+        self.debug = debug
+        self.quota = QuotaTracker()
+        self.auth_failed = False
+
+        # Keep-alive pool shared by all search threads
+        self.client = client or get_default_client()
+        self.headers = {'x-key': api_key}
+
+    def fetch_quota(self) -> Optional[int]:
+        """Read remaining search credits from /authenticate/info (None if unavailable)"""
+        try:
+            response = self.client.get(f"{self.api_url}/authenticate/info", headers=self.headers,
+                                       timeout=INTELX_TIMEOUT)
+            response.raise_for_status()
+            paths = response.json().get('paths', {})
+            credit = paths.get(INTELX_SEARCH_PATH, {}).get('Credit')
+            return int(credit) if credit is not None else None
+        except (requests.exceptions.RequestException, ValueError, AttributeError):
+            return None
+
+    def plan(self, terms: Iterable[str], credits: Optional[int]):
+        """Split terms into (scheduled, deferred) by priority and available credits"""
+        ranked = sorted(dict.fromkeys(terms), key=self.stats.priority, reverse=True)
+        if credits is None:
+            return ranked, []
+        return ranked[:max(0, credits)], ranked[max(0, credits):]
+
+    def search(self, term: str, datefrom: str, dateto: str,
+               maxresults: int = 20) -> Optional[List[Dict[str, Any]]]:
+        """
+        Run one search; returns its records, or None if it was not run
+        (no credits left or authentication failed)
+        """
+        if self.auth_failed or not self.quota.reserve():
+            return None
+
+        payload = {
+            "term": term,
+            "buckets": [],
+            "lookplaces": [],
+            "maxresults": maxresults,
+            "timeout": 0,
+            "datefrom": datefrom,
+            "dateto": dateto,
+            "sort": 4,
+            "media": 0,
+            "terminate": []
+        }
+        response = self.client.post(f"{self.api_url}{INTELX_SEARCH_PATH}", json=payload,
+                                    headers=self.headers, timeout=INTELX_TIMEOUT)
+        self.quota.update_from_response(response)
+
+        if self.debug:
+            print(f"IntelX Response Status for '{term}': {response.status_code}")
+
+        if response.status_code == 402:
+            print(f"WARNING: IntelX API quota exceeded (deferring '{term}')")
+            return None
+        if response.status_code == 401:
+            self.auth_failed = True
+            print("ERROR: IntelX API authentication failed - check your API key")
+            return None
+
+        response.raise_for_status()
+        return response.json().get('records', [])
+
+    def run(self, terms: Iterable[str], datefrom: str, dateto: str,
+            maxresults: int = 20, check_quota: bool = True) -> List[Dict[str, Any]]:
+        """
+        Search all terms that fit the quota, highest-yield terms first
+
+        Returns:
+            All records found, grouped by term in priority order
+        """
+        credits = self.fetch_quota() if check_quota else None
+        self.quota = QuotaTracker(credits)
+
+        scheduled, deferred = self.plan(terms, credits)
+        if deferred:
+            print(f"IntelX: {len(deferred)} low-yield terms deferred ({credits} credits left)")
+
+        records_by_term: Dict[str, List[Dict[str, Any]]] = {}
+        workers = min(self.max_workers, len(scheduled)) or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self.search, term, datefrom, dateto, maxresults): term
+                       for term in scheduled}
+            for future in as_completed(futures):
+                term = futures[future]
+                try:
+                    records = future.result()
+                except requests.exceptions.Timeout:
+                    print(f"WARNING: IntelX search for '{term}' timed out, skipping...")
+                    continue
+                except Exception as e:
+                    print(f"WARNING: Error searching for '{term}': {str(e)}")
+                    continue
+
+                if records is None:
+                    deferred.append(term)
+                    continue
+                records_by_term[term] = records
+                self.stats.record_hits(term, len(records))
+                if records:
+                    print(f"✓ Found {len(records)} results for '{term}'")
+
+        if not self.auth_failed:
+            for term in deferred:
+                self.stats.record_deferred(term)
+        self.stats.save()
+
+        return [record for term in scheduled if term in records_by_term
+                for record in records_by_term[term]]
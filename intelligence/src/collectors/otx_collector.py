@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Incremental AlienVault OTX Pulse Collector
+Pages through /pulses/subscribed (fetching pages concurrently once the total
+count is known), persists a high-water-mark `modified` timestamp between runs
+and checkpoints every completed page, so an interrupted run resumes where it
+stopped and later runs only fetch new or changed pulses.
+"""
+
+import json
+import math
+import os
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.concurrent_fetch import fetch_concurrently
+from utils.http_cache import cached_get
+
+OTX_PULSES_URL = "https://otx.alienvault.com/api/v1/pulses/subscribed"
+OTX_PAGE_LIMIT = 50
+OTX_TIMEOUT = 30
+MAX_PAGE_WORKERS = 4
+PER_HOST_INTERVAL = 0.25  # Seconds between page requests to OTX
+DEFAULT_LOOKBACK_DAYS = 7  # First run (no checkpoint) collects the last week
+
+# Checkpoint location (data/raw/cache/ is gitignored)
+INTELLIGENCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CHECKPOINT_PATH = os.path.join(INTELLIGENCE_ROOT, 'data', 'raw', 'cache', 'otx', 'checkpoint.json')
+
+
+def _write_atomic(path: str, text: str):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class OTXCheckpoint:
+    """
+    Collection state persisted between runs
+
+    The state file holds the high-water mark (latest `modified` timestamp
+    of a completed run, plus the ids seen at exactly that timestamp) and,
+    while a run is in progress, its `modified_since`, page size and the
+    pages already fetched. Pulses of completed pages are spooled to a JSON
+    Lines file next to it so a resumed run does not refetch them.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH):
+        self.path = path
+        self.spool_path = os.path.splitext(path)[0] + '.spool.jsonl'
+        self._lock = threading.Lock()
+        self.state = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _write_atomic(self.path, json.dumps(self.state, indent=2))
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        return self.state.get('high_water_mark')
+
+    @property
+    def boundary_ids(self) -> List[str]:
+        """Pulse ids already collected at exactly the high-water mark"""
+        return self.state.get('boundary_ids', [])
+
+    @property
+    def run(self) -> Optional[Dict[str, Any]]:
+        """The unfinished run, if the last collection was interrupted"""
+        return self.state.get('run')
+
+    def start_run(self, modified_since: str, limit: int):
+        with self._lock:
+            self.state['run'] = {
+                'modified_since': modified_since,
+                'limit': limit,
+                'started_at': datetime.now().isoformat(),
+                'completed_pages': []
+            }
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            self._save()
+
+    def record_page(self, page: int, pulses: List[Dict[str, Any]], **progress):
+        """
+        Spool a fetched page and mark it complete
+
+        Extra keyword arguments (e.g. total_pages, next_page) are stored
+        with the run so a resumed run knows how to continue.
+        """
+        with self._lock:
+            os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+            with open(self.spool_path, 'a', encoding='utf-8') as f:
+                for pulse in pulses:
+                    f.write(json.dumps(pulse, ensure_ascii=False))
+                    f.write('\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.state['run']['completed_pages'].append(page)
+            self.state['run'].update(progress)
+            self._save()
+
+    def completed_pages(self) -> List[int]:
+        return list(self.run['completed_pages']) if self.run else []
+
+    def spooled_pulses(self) -> Iterable[Dict[str, Any]]:
+        if not os.path.exists(self.spool_path):
+            return
+        with open(self.spool_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn final write from a crash; that page was not marked complete
+                    continue
+
+    def finish_run(self, high_water_mark: Optional[str], boundary_ids: List[str]):
+        """Advance the high-water mark and clear the in-progress run"""
+        with self._lock:
+            if high_water_mark:
+                self.state['high_water_mark'] = high_water_mark
+                self.state['boundary_ids'] = boundary_ids
+            self.state['last_completed_at'] = datetime.now().isoformat()
+            self.state.pop('run', None)
+            self._save()
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+
+    def reset(self):
+        """Forget all state (next run does a full lookback pull)"""
+        with self._lock:
+            self.state = {}
+            for path in (self.path, self.spool_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def fetch_otx_page(api_key: str, modified_since: str, page: int,
+                   limit: int = OTX_PAGE_LIMIT) -> Dict[str, Any]:
+    """Fetch one page of subscribed pulses (raises requests exceptions)"""
+    params = {'limit': limit, 'page': page, 'modified_since': modified_since}
+    response = cached_get(OTX_PULSES_URL, params=params,
+                          headers={'X-OTX-API-KEY': api_key}, timeout=OTX_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def _parse_modified(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def _high_water_mark(pulses: List[Dict[str, Any]], previous: Optional[str],
+                     previous_ids: List[str]):
+    """Latest `modified` timestamp among pulses (or previous) and the ids at it"""
+    best_value, best_time = previous, _parse_modified(previous)
+    ids = set(previous_ids)
+    for pulse in pulses:
+        modified = _parse_modified(pulse.get('modified'))
+        if modified is None:
+            continue
+        if best_time is None or modified > best_time:
+            best_value, best_time = pulse['modified'], modified
+            ids = set()
+        if modified == best_time and pulse.get('id'):
+            ids.add(pulse['id'])
+    return best_value, sorted(ids)
+
+
+def collect_otx_pulses(api_key: str, checkpoint: Optional[OTXCheckpoint] = None,
+                       modified_since: Optional[str] = None,
+                       limit: int = OTX_PAGE_LIMIT,
+                       max_workers: int = MAX_PAGE_WORKERS,
+                       debug: bool = False) -> Dict[str, Any]:
+    """
+    Collect every subscribed pulse modified since the last completed run
+
+    Args:
+        api_key: OTX API key
+        checkpoint: Collection state (defaults to the on-disk checkpoint)
+        modified_since: Override the start of the window (ignores the
+            high-water mark, but an interrupted run is still resumed)
+        limit: Pulses per page
+        max_workers: Concurrent page requests
+        debug: Print per-page progress
+
+    Returns:
+        {'results': [...], 'count': n, 'modified_since': ..., 'high_water_mark': ...}
+
+    Raises:
+        requests.exceptions.RequestException if any page fails; completed
+        pages stay checkpointed and the next call resumes the run
+    """
+    checkpoint = checkpoint or OTXCheckpoint()
+
+    if checkpoint.run is not None:
+        modified_since = checkpoint.run['modified_since']
+        limit = checkpoint.run['limit']
+        print(f"Resuming interrupted OTX collection since {modified_since} "
+              f"({len(checkpoint.completed_pages())} pages already fetched)")
+    else:
+        modified_since = (modified_since or checkpoint.high_water_mark or
+                          (datetime.now() - timedelta(days=DEFAULT_LOOKBACK_DAYS)).strftime('%Y-%m-%d'))
+        checkpoint.start_run(modified_since, limit)
+
+    done = set(checkpoint.completed_pages())
+
+    # The first page tells us how many pages there are (or at least
+    # whether there is a next one)
+    if 1 not in done:
+        first = fetch_otx_page(api_key, modified_since, 1, limit)
+        total_pages = max(1, math.ceil(first['count'] / limit)) if first.get('count') is not None else None
+        checkpoint.record_page(1, first.get('results', []), total_pages=total_pages,
+                               next_page=2 if first.get('next') else None)
+        done.add(1)
+        if debug:
+            print(f"OTX page 1: {len(first.get('results', []))} pulses, count={first.get('count')}")
+
+    total_pages = checkpoint.run.get('total_pages')
+    if total_pages is not None:
+        # Known page count: fetch the remaining pages concurrently
+        remaining = [page for page in range(2, total_pages + 1) if page not in done]
+        errors = []
+        for page, data, error in fetch_concurrently(
+                remaining,
+                lambda page: fetch_otx_page(api_key, modified_since, page, limit),
+                lambda page: OTX_PULSES_URL,
+                max_workers=max_workers,
+                per_host_limit=max_workers,
+                per_host_interval=PER_HOST_INTERVAL):
+            if error:
+                errors.append((page, error))
+                continue
+            checkpoint.record_page(page, data.get('results', []))
+            if debug:
+                print(f"OTX page {page}/{total_pages}: {len(data.get('results', []))} pulses")
+        if errors:
+            print(f"ERROR: {len(errors)} OTX page(s) failed; progress checkpointed for resume")
+            raise min(errors, key=lambda item: item[0])[1]
+    else:
+        # No count in the response: follow `next` links one page at a time
+        while checkpoint.run.get('next_page'):
+            page = checkpoint.run['next_page']
+            data = fetch_otx_page(api_key, modified_since, page, limit)
+            checkpoint.record_page(page, data.get('results', []),
+                                   next_page=page + 1 if data.get('next') else None)
+            if debug:
+                print(f"OTX page {page}: {len(data.get('results', []))} pulses")
+
+    # Merge pages, newest version of each pulse wins; drop pulses the
+    # previous run already collected at the high-water mark
+    boundary = set(checkpoint.boundary_ids) if modified_since == checkpoint.high_water_mark else set()
+    pulses: Dict[str, Dict[str, Any]] = {}
+    anonymous = []
+    for pulse in checkpoint.spooled_pulses():
+        pulse_id = pulse.get('id')
+        if pulse_id is None:
+            anonymous.append(pulse)
+            continue
+        if pulse_id in boundary and pulse.get('modified') == modified_since:
+            continue
+        current = pulses.get(pulse_id)
+        if current is None or (_parse_modified(pulse.get('modified')) or datetime.min) >= \
+                (_parse_modified(current.get('modified')) or datetime.min):
+            pulses[pulse_id] = pulse
+    results = list(pulses.values()) + anonymous
+
+    high_water_mark, boundary_ids = _high_water_mark(
+        results, checkpoint.high_water_mark, checkpoint.boundary_ids)
+    checkpoint.finish_run(high_water_mark, boundary_ids)
+
+    return {
+        'results': results,
+        'count': len(results),
+        'modified_since': modified_since,
+        'high_water_mark': high_water_mark
+    }
@@ -8,9 +8,19 @@ import json
 import feedparser
 import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
+import os
 import re
-import time
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.concurrent_fetch import fetch_concurrently
+from utils.http_cache import cached_get
+from utils.incident_store import IncidentStore
+from utils.keyword_matcher import KeywordMatcher
+from utils.near_duplicates import dedupe_incidents
 
 # Configuration
 RSS_FEEDS = [
@@ -21,6 +31,13 @@ RSS_FEEDS = [
     {"name": "ZDNet Security", "url": "https://www.zdnet.com/topic/security/rss.xml"},
 ]
 
+# Fetch settings
+USER_AGENT = 'Mozilla/5.0 (compatible; LabertIntelBot/1.0)'
+FEED_TIMEOUT = 30
+MAX_FEED_WORKERS = 16
+PER_HOST_LIMIT = 1  # Max concurrent requests per feed host
+PER_HOST_INTERVAL = 1.0  # Seconds between requests to the same host
+
 # Keywords for LATAM filtering
 LATAM_KEYWORDS = [
     'latam', 'latin america', 'américa latina', 'latinoamérica',
@@ -50,6 +67,13 @@ BUSINESS_IMPACT_KEYWORDS = [
     'telecom', 'telecommunications', 'telecomunicaciones'
 ]
 
+# Single-pass matcher over all keyword classes, compiled once at import
+RELEVANCE_MATCHER = KeywordMatcher({
+    'latam': LATAM_KEYWORDS,
+    'cyber': CYBER_KEYWORDS,
+    'business': BUSINESS_IMPACT_KEYWORDS
+})
+
 def is_within_date_range(entry_date: datetime) -> bool:
     """Check if entry is within last 7 days"""
     seven_days_ago = datetime.now() - timedelta(days=7)
@@ -94,21 +118,22 @@ def extract_text_content(entry: Dict[str, Any]) -> str:
     clean_text = re.sub('<[^<]+?>', '', full_text)
     return clean_text.lower()
 
+def scan_keywords(text: str) -> Dict[str, set]:
+    """Find LATAM, cyber and business keyword hits in one pass over text"""
+    return RELEVANCE_MATCHER.scan(text)
+
 def is_latam_relevant(text: str) -> bool:
     """Check if content is LATAM/Spain relevant"""
-    return any(keyword in text for keyword in LATAM_KEYWORDS)
+    return bool(scan_keywords(text)['latam'])
 
 def is_cyber_relevant(text: str) -> bool:
     """Check if content is cybersecurity relevant"""
-    return any(keyword in text for keyword in CYBER_KEYWORDS)
+    return bool(scan_keywords(text)['cyber'])
 
-def find_business_impacts(text: str) -> List[str]:
+def find_business_impacts(text: str, hits: Dict[str, set] = None) -> List[str]:
     """Find business impact keywords in text"""
-    found_impacts = []
-    for keyword in BUSINESS_IMPACT_KEYWORDS:
-        if keyword in text:
-            found_impacts.append(keyword)
-    return list(set(found_impacts))  # Remove duplicates
+    hits = hits if hits is not None else scan_keywords(text)
+    return [keyword for keyword in BUSINESS_IMPACT_KEYWORDS if keyword in hits['business']]
 
 def clean_summary(text: str, max_length: int = 300) -> str:
     """Clean and truncate summary text"""
@@ -119,70 +144,110 @@ def clean_summary(text: str, max_length: int = 300) -> str:
         text = text[:max_length] + '...'
     return text
 
-def collect_feeds() -> List[Dict[str, Any]]:
-    """Collect and filter RSS feeds"""
-    all_incidents = []
+def fetch_feed(feed_info: Dict[str, str]) -> bytes:
+    """Download raw feed content (revalidated against the on-disk HTTP cache)"""
+    # Add timeout and headers to avoid blocking
+    headers = {'User-Agent': USER_AGENT}
+    response = cached_get(feed_info['url'], headers=headers, timeout=FEED_TIMEOUT)
+    response.raise_for_status()
+    if response.from_cache:
+        print(f"  {feed_info['name']}: not modified, using cached copy")
+    return response.content
+
+def process_feed(feed_info: Dict[str, str], content: bytes) -> List[Dict[str, Any]]:
+    """Parse feed content and filter LATAM-relevant incidents"""
+    incidents = []
+    
+    # Parse feed
+    feed = feedparser.parse(content)
+    
+    if not feed.entries:
+        print(f"  No entries found in {feed_info['name']}")
+        return incidents
+    
+    print(f"  {feed_info['name']}: found {len(feed.entries)} total entries")
+    
+    for entry in feed.entries:
+        # Parse date
+        entry_date = parse_entry_date(entry)
+        
+        # Check date range
+        if not is_within_date_range(entry_date):
+            continue
+        
+        # Extract all text
+        full_text = extract_text_content(entry)
+        
+        # Check relevance (single scan for all keyword classes)
+        hits = scan_keywords(full_text)
+        if not (hits['latam'] and hits['cyber']):
+            continue
+        
+        # Extract business impacts
+        business_impacts = find_business_impacts(full_text, hits)
+        
+        # Build incident record
+        incident = {
+            'title': entry.get('title', 'No title'),
+            'url': entry.get('link', ''),
+            'date': entry_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'source': feed_info['name'],
+            'summary': clean_summary(entry.get('summary', entry.get('description', 'No summary available'))),
+            'business_impacts': business_impacts,
+            'relevance_score': len(business_impacts) + 2  # +2 for LATAM relevance
+        }
+        
+        incidents.append(incident)
     
-    for feed_info in RSS_FEEDS:
-        print(f"\nCollecting from {feed_info['name']}...")
+    print(f"  {feed_info['name']}: filtered to {len(incidents)} LATAM-relevant incidents")
+    return incidents
+
+def iter_feed_incidents(feeds: List[Dict[str, str]] = None,
+                        max_workers: int = MAX_FEED_WORKERS) -> Iterator[Tuple[Dict[str, str], List[Dict[str, Any]]]]:
+    """
+    Fetch all feeds in parallel and yield (feed_info, incidents) as each completes
+    
+    Feeds are politely throttled per host instead of sleeping between every
+    feed, so total wall-clock tracks the slowest feed rather than the sum.
+    """
+    feeds = RSS_FEEDS if feeds is None else feeds
+    print(f"\nCollecting from {len(feeds)} feeds...")
+    
+    for feed_info, content, error in fetch_concurrently(
+            feeds, fetch_feed, lambda feed: feed['url'],
+            max_workers=max_workers,
+            per_host_limit=PER_HOST_LIMIT,
+            per_host_interval=PER_HOST_INTERVAL):
+        if error is not None:
+            if isinstance(error, requests.RequestException):
+                print(f"  ERROR accessing {feed_info['name']}: {str(error)}")
+            else:
+                print(f"  ERROR fetching {feed_info['name']}: {str(error)}")
+            continue
         
         try:
-            # Add timeout and headers to avoid blocking
-            headers = {'User-Agent': 'Mozilla/5.0 (compatible; LabertIntelBot/1.0)'}
-            response = requests.get(feed_info['url'], headers=headers, timeout=30)
-            response.raise_for_status()
-            
-            # Parse feed
-            feed = feedparser.parse(response.content)
-            
-            if not feed.entries:
-                print(f"  No entries found in {feed_info['name']}")
-                continue
-            
-            print(f"  Found {len(feed.entries)} total entries")
-            
-            relevant_count = 0
-            for entry in feed.entries:
-                # Parse date
-                entry_date = parse_entry_date(entry)
-                
-                # Check date range
-                if not is_within_date_range(entry_date):
-                    continue
-                
-                # Extract all text
-                full_text = extract_text_content(entry)
-                
-                # Check relevance
-                if not (is_latam_relevant(full_text) and is_cyber_relevant(full_text)):
-                    continue
-                
-                # Extract business impacts
-                business_impacts = find_business_impacts(full_text)
-                
-                # Build incident record
-                incident = {
-                    'title': entry.get('title', 'No title'),
-                    'url': entry.get('link', ''),
-                    'date': entry_date.strftime('%Y-%m-%d %H:%M:%S'),
-                    'source': feed_info['name'],
-                    'summary': clean_summary(entry.get('summary', entry.get('description', 'No summary available'))),
-                    'business_impacts': business_impacts,
-                    'relevance_score': len(business_impacts) + (2 if is_latam_relevant(full_text) else 0)
-                }
-                
-                all_incidents.append(incident)
-                relevant_count += 1
-            
-            print(f"  Filtered to {relevant_count} LATAM-relevant incidents")
-            
-        except requests.RequestException as e:
-            print(f"  ERROR accessing {feed_info['name']}: {str(e)}")
+            yield feed_info, process_feed(feed_info, content)
         except Exception as e:
             print(f"  ERROR parsing {feed_info['name']}: {str(e)}")
-        
-        # Small delay between feeds to be polite
-        time.sleep(1)
+
+def collect_feeds(feeds: List[Dict[str, str]] = None, dedupe: bool = True) -> List[Dict[str, Any]]:
+    """
+    Collect and filter RSS feeds
+    
+    With `dedupe`, stories covered by several feeds are merged into one
+    canonical incident listing every source.
+    """
+    all_incidents = []
+    
+    for _, incidents in iter_feed_incidents(feeds):
+        all_incidents.extend(incidents)
+    
+    if dedupe and all_incidents:
+        unique = dedupe_incidents(all_incidents)
+        if len(unique) < len(all_incidents):
+            print(f"\nMerged {len(all_incidents) - len(unique)} duplicate reports "
+                  f"({len(unique)} unique incidents)")
+        all_incidents = unique
     
     return all_incidents
 
@@ -265,6 +330,11 @@ def main():
     output_file = 'intelligence/data/raw_incidents_2025-07-11.json'
     save_results(incidents, output_file)
     
+    # Index into the local incident store (deduplicated across feeds and runs)
+    with IncidentStore() as store:
+        counts = store.add_incidents(incidents)
+    print(f"Incident store: {counts['added']} new, {counts['merged']} already known")
+    
     # Print summary
     print_summary(incidents)
     
@@ -7,6 +7,12 @@ import sys
 from datetime import datetime, timedelta
 import warnings
 
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collectors.intelx_scheduler import IntelXSearchScheduler
+from collectors.otx_collector import OTXCheckpoint, collect_otx_pulses
+
 # Suppress SSL warnings
 warnings.filterwarnings('ignore', category=NotOpenSSLWarning)
 
@@ -67,38 +73,31 @@ def send_telegram_message(message):
         return False
 
 def collect_otx_data(api_key):
-    """Collect data from AlienVault OTX"""
+    """
+    Collect new and changed pulses from AlienVault OTX
+    
+    Follows every result page and only fetches pulses modified since the
+    last completed collection (the first run looks back one week). Set
+    OTX_FULL_SYNC=true to ignore the checkpoint and pull the last week again.
+    """
     if not api_key:
         print("WARNING: OTX_API_KEY not provided, skipping OTX collection")
         return {}
     
-    headers = {'X-OTX-API-KEY': api_key}
-    base_url = "https://otx.alienvault.com/api/v1/pulses/subscribed"
-    
     all_data = {}
     
     try:
-        params = {'limit': 50, 'modified_since': get_last_week_date()}
+        checkpoint = OTXCheckpoint()
+        if os.getenv('OTX_FULL_SYNC', 'false').lower() == 'true':
+            checkpoint.reset()
         
         if DEBUG:
-            print(f"OTX API Request: {base_url}")
-            print(f"Parameters: {params}")
+            print(f"OTX checkpoint: {checkpoint.path}")
+            print(f"High-water mark: {checkpoint.high_water_mark or 'none (first run)'}")
         
-        response = requests.get(base_url, headers=headers, params=params, timeout=30)
-        
-        if DEBUG:
-            print(f"OTX Response Status: {response.status_code}")
-        
-        response.raise_for_status()  # This will raise an error for bad status codes
-        data = response.json()
-        
-        # Process results
-        if 'results' in data:
-            all_data = data
-            print(f"✓ Collected {len(data['results'])} pulses from OTX")
-        else:
-            print("WARNING: No results found in OTX response")
-            all_data = {'results': []}
+        all_data = collect_otx_pulses(api_key, checkpoint=checkpoint, debug=DEBUG)
+        print(f"✓ Collected {len(all_data['results'])} new/changed pulses from OTX "
+              f"(modified since {all_data['modified_since']})")
             
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
@@ -127,66 +126,26 @@ def collect_otx_data(api_key):
     
     return all_data
 
-def collect_intelx_data(api_key):
-    """Collect data from IntelX"""
+# IntelX search terms focusing on Latin America
+INTELX_SEARCH_TERMS = ["latam breach", "brazil ransomware", "mexico cyber",
+                       "colombia hack", "argentina breach"]
+
+def collect_intelx_data(api_key, search_terms=None):
+    """
+    Collect data from IntelX
+    
+    Terms run concurrently; when search credits are short, the terms with
+    the lowest historical hit yield are deferred to a later run.
+    """
     if not api_key:
         print("WARNING: INTELX_API_KEY not provided, skipping IntelX collection")
         return []
     
-    headers = {'x-key': api_key}
-    search_url = "https://free.intelx.io/intelligent/search"
-    
-    all_results = []
-    
-    # Search terms focusing on Latin America
-    search_terms = ["latam breach", "brazil ransomware", "mexico cyber", 
-                   "colombia hack", "argentina breach"]
-    
     try:
-        for term in search_terms:
-            if DEBUG:
-                print(f"IntelX searching for: {term}")
-            
-            payload = {
-                "term": term,
-                "buckets": [],
-                "lookplaces": [],
-                "maxresults": 20,
-                "timeout": 0,
-                "datefrom": get_last_week_date(),
-                "dateto": datetime.now().strftime('%Y-%m-%d'),
-                "sort": 4,
-                "media": 0,
-                "terminate": []
-            }
-            
-            try:
-                response = requests.post(search_url, json=payload, headers=headers, timeout=30)
-                
-                if DEBUG:
-                    print(f"IntelX Response Status for '{term}': {response.status_code}")
-                
-                if response.status_code == 402:
-                    print("WARNING: IntelX API quota exceeded")
-                    break
-                elif response.status_code == 401:
-                    print("ERROR: IntelX API authentication failed - check your API key")
-                    break
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                if 'records' in data:
-                    all_results.extend(data['records'])
-                    print(f"✓ Found {len(data['records'])} results for '{term}'")
-                
-            except requests.exceptions.Timeout:
-                print(f"WARNING: IntelX search for '{term}' timed out, skipping...")
-                continue
-            except Exception as e:
-                print(f"WARNING: Error searching for '{term}': {str(e)}")
-                continue
-                
+        scheduler = IntelXSearchScheduler(api_key, debug=DEBUG)
+        all_results = scheduler.run(search_terms or INTELX_SEARCH_TERMS,
+                                    datefrom=get_last_week_date(),
+                                    dateto=datetime.now().strftime('%Y-%m-%d'))
     except Exception as e:
         print(f"ERROR in IntelX collection: {str(e)}")
         if DEBUG:
@@ -6,10 +6,18 @@ Combines threat intelligence data with Perplexity research to create weekly dash
 
 import os
 import re
+import sys
 import json
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.build_graph import BuildGraph
+from utils.incident_store import open_existing_store
+from utils.template_engine import load_template
+
 class ImmunityDashboardGenerator:
     def __init__(self):
         self.template_path = "../templates/immunity_dashboard_template.html"
@@ -17,17 +25,21 @@ class ImmunityDashboardGenerator:
         self.week_date = datetime.now().strftime('%Y-%m-%d')
         
     def load_template(self):
-        """Load the HTML template"""
-        with open(self.template_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        """Load the compiled HTML template (cached until the file changes)"""
+        return load_template(self.template_path)
     
-    def process_threat_intelligence(self):
-        """Extract data from latest threat intelligence report"""
+    def latest_threat_intelligence_file(self):
         intel_files = list(Path(self.output_dir).glob("threat-intelligence-*.html"))
         if not intel_files:
             return None
-            
-        latest = max(intel_files, key=lambda p: p.stat().st_mtime)
+        return max(intel_files, key=lambda p: p.stat().st_mtime)
+    
+    def process_threat_intelligence(self):
+        """Extract data from latest threat intelligence report"""
+        latest = self.latest_threat_intelligence_file()
+        if latest is None:
+            return None
+        
         with open(latest, 'r', encoding='utf-8') as f:
             content = f.read()
             
@@ -84,6 +96,23 @@ class ImmunityDashboardGenerator:
             print("   Please fill with Perplexity research before running again")
             return default_data
     
+    def load_store_incidents(self, days=7, sector=None, dii_below=None, limit=3):
+        """Recent incidents from the local incident store, lowest DII first"""
+        store = open_existing_store()
+        if store is None:
+            return []
+        with store:
+            stored = store.query(days=days, sector=sector, dii_below=dii_below,
+                                 order_by='dii_score', limit=limit)
+        
+        # Shape them like Perplexity incidents
+        return [{
+            'sector': (inc.get('immunity_impact') or {}).get('sector') or inc.get('affectedSector') or inc.get('sector', 'Sector'),
+            'description': inc.get('title') or inc.get('summary') or inc.get('description', ''),
+            'source': inc.get('source', 'Threat Intel'),
+            'immunity_score': (inc.get('dii_analysis') or {}).get('dii_score', 'N/A')
+        } for inc in stored]
+    
     def generate_chart_points(self, incidents):
         """Generate immunity chart points HTML"""
         # Get average immunity from parsed data
@@ -224,8 +253,11 @@ class ImmunityDashboardGenerator:
             }
         ]
         
-        # Add incidents from perplexity data
-        for incident in perplexity_data.get('incidents', [])[:3]:
+        # Add incidents from perplexity data, topped up from the incident store
+        week_incidents = perplexity_data.get('incidents', [])[:3]
+        if len(week_incidents) < 3:
+            week_incidents += self.load_store_incidents(limit=3 - len(week_incidents))
+        for incident in week_incidents:
             incidents.append({
                 "name": f"{incident.get('sector', 'Sector')}: {incident.get('description', 'Incidente crítico reportado')}",
                 "source": f"Fuente: {incident.get('source', 'Threat Intel')}",
@@ -289,10 +321,24 @@ class ImmunityDashboardGenerator:
         
         return html
     
-    def generate_dashboard(self):
-        """Generate the complete dashboard"""
+    def generate_dashboard(self, force=False):
+        """Generate the complete dashboard (skipped when no input changed, unless forced)"""
         print("🚀 Starting dashboard generation...")
         
+        # Inputs: template, Perplexity research, latest threat report and
+        # the incident store rows the news ticker may use
+        graph = BuildGraph()
+        output_path = os.path.join(self.output_dir, f'immunity-dashboard-{self.week_date}.html')
+        perplexity_file = Path(self.output_dir) / f"perplexity-input-{self.week_date}.json"
+        intel_file = self.latest_threat_intelligence_file()
+        inputs = [self.template_path, str(perplexity_file) if perplexity_file.exists() else None,
+                  str(intel_file) if intel_file else None]
+        store_incidents = self.load_store_incidents()
+        if not force and perplexity_file.exists() and \
+                not graph.needs_rebuild(output_path, inputs, store_incidents):
+            print(f"✅ Dashboard up to date (inputs unchanged): {output_path}")
+            return output_path
+        
         # Load template
         template = self.load_template()
         
@@ -356,14 +402,14 @@ class ImmunityDashboardGenerator:
             '{{TICKER_SOURCE}}': first_news['source']
         }
         
-        dashboard = template
-        for key, value in replacements.items():
-            dashboard = dashboard.replace(key, str(value))
+        dashboard = template.render(replacements)
         
         # Save dashboard
-        output_path = os.path.join(self.output_dir, f'immunity-dashboard-{self.week_date}.html')
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(dashboard)
+        inputs[1] = str(perplexity_file)  # Created from the defaults if it was missing
+        graph.record(output_path, inputs, store_incidents)
+        graph.save()
         
         print(f"✅ Dashboard generated: {output_path}")
         print(f"📊 Metrics included:")
@@ -375,7 +421,7 @@ class ImmunityDashboardGenerator:
 
 if __name__ == "__main__":
     generator = ImmunityDashboardGenerator()
-    dashboard_path = generator.generate_dashboard()
+    dashboard_path = generator.generate_dashboard(force="--force" in sys.argv[1:])
     
     print("\n💡 Next steps:")
     print("1. Review perplexity-input-{date}.json")
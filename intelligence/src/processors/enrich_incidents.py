@@ -4,9 +4,39 @@ Incident Enrichment Script
 Merges raw incidents with research data to calculate DII 4.0 indices and financial impacts
 """
 
+import argparse
+import glob
 import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+
+# Add repository root to path for the shared DII scoring kernel
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+try:
+    from scripts import dii_scoring
+except ImportError:  # NumPy not installed; fall back to per-incident scoring
+    dii_scoring = None
+
+# Add src directory to path for the shared utilities
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.enrichment_memo import EnrichmentMemo, rules_hash
+from utils.incident_store import IncidentStore
+
+# Default inputs for the weekly run
+DEFAULT_RAW_INCIDENTS = 'data/raw_incidents_2025-07-11.json'
+DEFAULT_RESEARCH_DATA = 'data/weekly_research_2025-07-11.json'
+DEFAULT_OUTPUT = 'data/enriched_incidents_2025-07-11.json'
+
+# Parallel enrichment settings
+DEFAULT_CHUNK_SIZE = 200
+
+# Bump when the enrichment logic changes so memoized results are recomputed
+ENRICHMENT_VERSION = "1.0"
 
 # DII 4.0 Business Models
 BUSINESS_MODELS = {
@@ -172,8 +202,8 @@ def calculate_financial_impact(incident: Dict[str, Any], research_data: Dict[str
     
     return financial_impact
 
-def calculate_dii_index(incident: Dict[str, Any]) -> Dict[str, Any]:
-    """Calculate DII 4.0 index based on the formula: DII = (TRD × AER) / (HFP × BRI × RRG)"""
+def calculate_dii_components(incident: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the five DII 4.0 dimensions for an incident"""
     
     # Time to Revenue Degradation (TRD) - hours
     severity = incident['immunity_impact']['severity']
@@ -218,21 +248,56 @@ def calculate_dii_index(incident: Dict[str, Any]) -> Dict[str, Any]:
     }
     rrg = rrg_map.get(sector, 3)
     
+    return {
+        "trd_hours": trd,
+        "aer_ratio": aer,
+        "hfp_probability": hfp,
+        "bri_index": bri,
+        "rrg_grade": rrg
+    }
+
+def calculate_dii_index(incident: Dict[str, Any]) -> Dict[str, Any]:
+    """Calculate DII 4.0 index based on the formula: DII = (TRD × AER) / (HFP × BRI × RRG)"""
+    components = calculate_dii_components(incident)
+    
     # Calculate DII
-    dii = (trd * aer) / (hfp * bri * rrg)
+    dii = (components['trd_hours'] * components['aer_ratio']) / (
+        components['hfp_probability'] * components['bri_index'] * components['rrg_grade'])
     
     return {
         "dii_score": round(dii, 2),
-        "components": {
-            "trd_hours": trd,
-            "aer_ratio": aer,
-            "hfp_probability": hfp,
-            "bri_index": bri,
-            "rrg_grade": rrg
-        },
+        "components": components,
         "interpretation": get_dii_interpretation(dii)
     }
 
+def calculate_dii_indices(incidents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Calculate DII 4.0 indices for many incidents at once
+    
+    Dimensions are derived per incident, then scored and interpreted as
+    columns with the shared NumPy kernel. Results match calculate_dii_index.
+    """
+    if dii_scoring is None:
+        return [calculate_dii_index(incident) for incident in incidents]
+    
+    components = [calculate_dii_components(incident) for incident in incidents]
+    if not components:
+        return []
+    
+    columns = {key: [c[key] for c in components] for key in components[0]}
+    raw = dii_scoring.dii_raw(columns['trd_hours'], columns['aer_ratio'], columns['hfp_probability'],
+                              columns['bri_index'], columns['rrg_grade'])
+    interpretations = dii_scoring.dii_interpretation(raw)
+    
+    return [
+        {
+            "dii_score": round(float(dii), 2),
+            "components": component,
+            "interpretation": interpretation
+        }
+        for dii, component, interpretation in zip(raw, components, interpretations)
+    ]
+
 def get_dii_interpretation(dii_score: float) -> str:
     """Interpret the DII score"""
     if dii_score >= 10:
@@ -275,8 +340,9 @@ def get_operational_impact(model_id: int) -> str:
     }
     return impacts.get(model_id, "Business operations impacted")
 
-def enrich_incident(incident: Dict[str, Any], research_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Enrich a single incident with all additional data"""
+def enrich_incident(incident: Dict[str, Any], research_data: Dict[str, Any],
+                    enriched_at: Optional[str] = None, score_dii: bool = True) -> Dict[str, Any]:
+    """Enrich a single incident with all additional data (DII left unset if score_dii is False)"""
     enriched = incident.copy()
     
     # Add attack vector classification
@@ -286,42 +352,272 @@ def enrich_incident(incident: Dict[str, Any], research_data: Dict[str, Any]) ->
     enriched['financial_impact'] = calculate_financial_impact(incident, research_data)
     
     # Calculate DII 4.0 index
-    enriched['dii_analysis'] = calculate_dii_index(enriched)
+    enriched['dii_analysis'] = calculate_dii_index(enriched) if score_dii else None
     
     # Map to business model
     enriched['business_model'] = map_to_business_model(incident)
     
     # Add enrichment metadata
     enriched['enrichment'] = {
-        "enriched_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        "enrichment_version": "1.0",
+        "enriched_at": enriched_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "enrichment_version": ENRICHMENT_VERSION,
         "data_sources": ["raw_incidents", "weekly_research"]
     }
     
     return enriched
 
-def main():
-    """Main enrichment process"""
+def build_enriched_output(raw_metadata: Dict[str, Any], enriched_incidents: List[Dict[str, Any]],
+                          research_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Assemble the enriched incidents document with metadata and executive summary"""
+    total_incidents = len(enriched_incidents)
+    
+    critical_findings = []
+    if total_incidents >= 2:
+        critical_findings = [
+            f"Healthcare sector shows lowest immunity (DII < 2) with ${enriched_incidents[0]['financial_impact']['estimated_cost_usd']:,} impact",
+            f"Financial services breach could reach ${enriched_incidents[1]['financial_impact']['estimated_cost_usd']:,} based on regional benchmarks"
+        ]
+    critical_findings.append("Supply chain attacks showing 431% growth with high detection difficulty")
+    
+    return {
+        "metadata": {
+            **raw_metadata,
+            "enrichment_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "research_sources": research_data['metadata']['sources'],
+            "enrichment_metrics": {
+                "total_incidents": total_incidents,
+                "total_estimated_cost_usd": sum(inc['financial_impact']['estimated_cost_usd'] for inc in enriched_incidents),
+                "average_dii_score": round(sum(inc['dii_analysis']['dii_score'] for inc in enriched_incidents) / total_incidents, 2) if total_incidents else 0
+            }
+        },
+        "incidents": enriched_incidents,
+        "executive_summary": {
+            "critical_findings": critical_findings,
+            "regional_context": research_data['executive_insights']
+        }
+    }
+
+def enrich_incident_batch(incidents: List[Dict[str, Any]], research_data: Dict[str, Any],
+                          enriched_at: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Enrich a batch of incidents, scoring DII for the whole batch at once"""
+    enriched = [enrich_incident(incident, research_data, enriched_at, score_dii=False) for incident in incidents]
+    for incident, dii_analysis in zip(enriched, calculate_dii_indices(enriched)):
+        incident['dii_analysis'] = dii_analysis
+    return enriched
+
+# Research data shared by pool workers (set once per worker process)
+_worker_research_data: Optional[Dict[str, Any]] = None
+
+def _init_worker(research_data: Dict[str, Any]):
+    global _worker_research_data
+    _worker_research_data = research_data
+
+def _enrich_chunk(task: Tuple[List[Dict[str, Any]], str]) -> List[Dict[str, Any]]:
+    incidents, enriched_at = task
+    return enrich_incident_batch(incidents, _worker_research_data, enriched_at)
+
+def enrich_incidents_parallel(incidents: List[Dict[str, Any]], research_data: Dict[str, Any],
+                              workers: Optional[int] = None,
+                              chunk_size: int = DEFAULT_CHUNK_SIZE,
+                              enriched_at: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Enrich many incidents across a process pool
+    
+    Incidents are sharded into fixed-size chunks, each worker enriches whole
+    chunks, and results are merged back in input order so the output is
+    deterministic regardless of worker scheduling.
+    
+    Args:
+        incidents: Raw incidents to enrich
+        research_data: Weekly research data used for financial impacts
+        workers: Number of worker processes (defaults to CPU count)
+        chunk_size: Incidents per task
+        enriched_at: Enrichment timestamp (defaults to now)
+        
+    Returns:
+        Enriched incidents in the same order as the input
+    """
+    enriched_at = enriched_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    chunks = [incidents[i:i + chunk_size] for i in range(0, len(incidents), chunk_size)]
+    
+    workers = workers or os.cpu_count() or 1
+    
+    # Single-core hosts and small inputs are not worth the process start-up cost
+    if workers <= 1 or len(chunks) <= 1:
+        return [enriched for chunk in chunks
+                for enriched in enrich_incident_batch(chunk, research_data, enriched_at)]
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(research_data,)) as executor:
+        results = executor.map(_enrich_chunk, [(chunk, enriched_at) for chunk in chunks])
+        return [enriched for chunk_result in results for enriched in chunk_result]
+
+def enrichment_memo(research_data: Dict[str, Any]) -> EnrichmentMemo:
+    """Memo of enriched incidents, invalidated by rule-table or research data changes"""
+    rules = rules_hash(BUSINESS_MODELS, SECTOR_TO_BUSINESS_MODEL, ATTACK_VECTORS,
+                       dii_scoring.DII_INTERPRETATION_THRESHOLDS if dii_scoring else None,
+                       research_data)
+    return EnrichmentMemo('enrich_incidents', ENRICHMENT_VERSION, rules)
+
+def enrich_incidents_incremental(incidents: List[Dict[str, Any]], research_data: Dict[str, Any],
+                                 memo: Optional[EnrichmentMemo] = None,
+                                 workers: Optional[int] = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict[str, Any]]:
+    """
+    Enrich incidents, reusing memoized results for unchanged incidents
+    
+    Only incidents whose content, the enrichment version or the rule
+    tables changed since they were last enriched are recomputed. Memoized
+    results are stamped with this run's enrichment time, like fresh ones.
+    """
+    enriched_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    if memo is None:
+        return enrich_incidents_parallel(incidents, research_data, workers, chunk_size, enriched_at)
+    
+    enriched, missing = memo.lookup(incidents)
+    for result in enriched:
+        if result is not None:
+            result['enrichment']['enriched_at'] = enriched_at
+    if missing:
+        fresh = enrich_incidents_parallel([incidents[i] for i in missing], research_data,
+                                          workers, chunk_size, enriched_at)
+        for index, result in zip(missing, fresh):
+            enriched[index] = result
+        memo.store((incidents[index], result) for index, result in zip(missing, fresh))
+    print(f"♻️  Enrichment memo: {memo.summary()}")
+    return enriched
+
+def expand_inputs(patterns: List[str]) -> List[str]:
+    """Expand file paths/globs into a sorted, de-duplicated file list"""
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        paths.update(matches if matches else ([pattern] if os.path.exists(pattern) else []))
+    return sorted(paths)
+
+def enriched_output_path(input_path: str, output_dir: Optional[str] = None) -> str:
+    """Output path for an input file (raw_incidents_X.json -> enriched_incidents_X.json)"""
+    directory, name = os.path.split(input_path)
+    if 'raw_incidents' in name:
+        name = name.replace('raw_incidents', 'enriched_incidents')
+    else:
+        name = f"enriched_{name}"
+    return os.path.join(output_dir or directory, name)
+
+def store_enriched(incidents: List[Dict[str, Any]], store: Optional[IncidentStore] = None):
+    """Merge enriched incidents into the incident store (raw records are updated in place)"""
+    if store is None:
+        with IncidentStore() as store:
+            store_enriched(incidents, store)
+        return
+    counts = store.add_incidents(incidents)
+    print(f"🗄️  Incident store: {counts['added']} new, {counts['merged']} updated")
+
+def run_batch(inputs: List[str], research_file: str, output_dir: Optional[str] = None,
+              merged_output: Optional[str] = None, workers: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE,
+              store: Optional[IncidentStore] = None,
+              incremental: bool = True) -> List[str]:
+    """
+    Enrich every incident in many input files with one shared process pool
+    
+    Enriched incidents are also merged into `store` when one is given. With
+    `incremental`, incidents enriched by an earlier run are taken from the
+    enrichment memo instead of being recomputed.
+    
+    Returns:
+        List of written output files
+    """
+    input_files = expand_inputs(inputs)
+    if not input_files:
+        print("⚠️  No input files matched")
+        return []
+    
+    with open(research_file, 'r', encoding='utf-8') as f:
+        research_data = json.load(f)
+    
+    # Load all files and remember each file's slice of the combined list
+    all_incidents = []
+    file_slices = []
+    for path in input_files:
+        with open(path, 'r', encoding='utf-8') as f:
+            raw_data = json.load(f)
+        incidents = raw_data.get('incidents', [])
+        file_slices.append((path, raw_data.get('metadata', {}), len(all_incidents), len(incidents)))
+        all_incidents.extend(incidents)
+    
+    print(f"📊 Loaded {len(all_incidents)} incidents from {len(input_files)} files")
+    
+    started = datetime.now()
+    memo = enrichment_memo(research_data) if incremental else None
+    enriched_all = enrich_incidents_incremental(all_incidents, research_data, memo, workers, chunk_size)
+    elapsed = (datetime.now() - started).total_seconds()
+    print(f"🔍 Enriched {len(enriched_all)} incidents in {elapsed:.1f}s")
+    
+    written = []
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    for path, metadata, offset, count in file_slices:
+        output_file = enriched_output_path(path, output_dir)
+        output = build_enriched_output(metadata, enriched_all[offset:offset + count], research_data)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        written.append(output_file)
+    
+    if merged_output:
+        merged_metadata = {"source_files": input_files, "total_incidents": len(enriched_all)}
+        output = build_enriched_output(merged_metadata, enriched_all, research_data)
+        with open(merged_output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        written.append(merged_output)
+    
+    if store is not None:
+        store_enriched(enriched_all, store)
+    
+    print(f"✅ Wrote {len(written)} enriched files")
+    return written
+
+def main(store: Optional[IncidentStore] = None, incremental: bool = True):
+    """
+    Main enrichment process
+    
+    Enriched incidents are merged into `store` when given; with
+    `incremental`, incidents unchanged since the last run are not re-enriched.
+    """
     print("🔄 Starting Incident Enrichment Process")
     print("=" * 50)
     
     # Load raw incidents
-    with open('data/raw_incidents_2025-07-11.json', 'r', encoding='utf-8') as f:
+    with open(DEFAULT_RAW_INCIDENTS, 'r', encoding='utf-8') as f:
         raw_data = json.load(f)
     
     # Load research data
-    with open('data/weekly_research_2025-07-11.json', 'r', encoding='utf-8') as f:
+    with open(DEFAULT_RESEARCH_DATA, 'r', encoding='utf-8') as f:
         research_data = json.load(f)
     
     print(f"📊 Loaded {len(raw_data['incidents'])} incidents")
     print(f"📚 Research data from {len(research_data['metadata']['sources'])} sources")
     
-    # Enrich each incident
-    enriched_incidents = []
+    # Reuse results for incidents enriched by an earlier run, stamped with this run's time
+    enriched_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    memo = enrichment_memo(research_data) if incremental else None
+    if memo is not None:
+        enriched_incidents, missing = memo.lookup(raw_data['incidents'])
+        for enriched in enriched_incidents:
+            if enriched is not None:
+                enriched['enrichment']['enriched_at'] = enriched_at
+    else:
+        enriched_incidents, missing = [None] * len(raw_data['incidents']), range(len(raw_data['incidents']))
+    missing = set(missing)
+    
+    # Enrich each new or changed incident
     for i, incident in enumerate(raw_data['incidents'], 1):
-        print(f"\n🔍 Enriching incident {i}: {incident['title'][:50]}...")
-        enriched = enrich_incident(incident, research_data)
-        enriched_incidents.append(enriched)
+        if i - 1 in missing:
+            print(f"\n🔍 Enriching incident {i}: {incident['title'][:50]}...")
+            enriched_incidents[i - 1] = enrich_incident(incident, research_data, enriched_at)
+        else:
+            print(f"\n♻️  Unchanged incident {i}: {incident['title'][:50]}...")
+        enriched = enriched_incidents[i - 1]
         
         # Print summary
         print(f"   ✓ Attack Vector: {enriched['attack_vector']['type']}")
@@ -329,39 +625,88 @@ def main():
         print(f"   ✓ DII Score: {enriched['dii_analysis']['dii_score']}")
         print(f"   ✓ Business Model: {enriched['business_model']['primary_model_name']}")
     
+    if memo is not None:
+        memo.store((raw_data['incidents'][i], enriched_incidents[i]) for i in sorted(missing))
+        print(f"\n♻️  Enrichment memo: {memo.summary()}")
+    
     # Create enriched output
-    enriched_output = {
-        "metadata": {
-            **raw_data['metadata'],
-            "enrichment_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            "research_sources": research_data['metadata']['sources'],
-            "enrichment_metrics": {
-                "total_incidents": len(enriched_incidents),
-                "total_estimated_cost_usd": sum(inc['financial_impact']['estimated_cost_usd'] for inc in enriched_incidents),
-                "average_dii_score": round(sum(inc['dii_analysis']['dii_score'] for inc in enriched_incidents) / len(enriched_incidents), 2)
-            }
-        },
-        "incidents": enriched_incidents,
-        "executive_summary": {
-            "critical_findings": [
-                f"Healthcare sector shows lowest immunity (DII < 2) with ${enriched_incidents[0]['financial_impact']['estimated_cost_usd']:,} impact",
-                f"Financial services breach could reach ${enriched_incidents[1]['financial_impact']['estimated_cost_usd']:,} based on regional benchmarks",
-                "Supply chain attacks showing 431% growth with high detection difficulty"
-            ],
-            "regional_context": research_data['executive_insights']
-        }
-    }
+    enriched_output = build_enriched_output(raw_data['metadata'], enriched_incidents, research_data)
     
     # Save enriched data
-    output_file = 'data/enriched_incidents_2025-07-11.json'
+    output_file = DEFAULT_OUTPUT
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(enriched_output, f, ensure_ascii=False, indent=2)
     
+    if store is not None:
+        store_enriched(enriched_incidents, store)
+    
     print(f"\n✅ Enrichment complete! Saved to {output_file}")
     print(f"\n📈 Summary:")
     print(f"   Total estimated impact: ${enriched_output['metadata']['enrichment_metrics']['total_estimated_cost_usd']:,}")
     print(f"   Average DII score: {enriched_output['metadata']['enrichment_metrics']['average_dii_score']}")
     print(f"   Most affected sector: Healthcare (Critical)")
 
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+def cli():
+    """Command line entry point; without input files runs the weekly main()"""
+    parser = argparse.ArgumentParser(
+        description='Enrich raw incident files with attack vectors, financial impact, DII 4.0 and business models'
+    )
+    parser.add_argument(
+        'inputs', nargs='*',
+        help='Raw incident JSON files or globs (e.g. "archive/**/raw_incidents_*.json")'
+    )
+    parser.add_argument(
+        '-r', '--research', default=DEFAULT_RESEARCH_DATA,
+        help=f'Weekly research JSON used for financial impacts (default: {DEFAULT_RESEARCH_DATA})'
+    )
+    parser.add_argument(
+        '-o', '--output-dir',
+        help='Directory for per-file enriched outputs (default: next to each input)'
+    )
+    parser.add_argument(
+        '-m', '--merged',
+        help='Also write all enriched incidents to this single file'
+    )
+    parser.add_argument(
+        '-w', '--workers', type=positive_int,
+        help='Worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--chunk-size', type=positive_int, default=DEFAULT_CHUNK_SIZE,
+        help=f'Incidents per worker task (default: {DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--no-store', action='store_true',
+        help='Do not merge enriched incidents into the local incident store'
+    )
+    parser.add_argument(
+        '--full', action='store_true',
+        help='Re-enrich every incident instead of reusing memoized results'
+    )
+    args = parser.parse_args()
+    store = None if args.no_store else IncidentStore()
+    try:
+        if not args.inputs:
+            main(store, incremental=not args.full)
+            return
+        
+        written = run_batch(args.inputs, args.research, args.output_dir, args.merged,
+                            args.workers, args.chunk_size, store, incremental=not args.full)
+    finally:
+        if store is not None:
+            store.close()
+    if not written:
+        sys.exit(1)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli()
\ No newline at end of file
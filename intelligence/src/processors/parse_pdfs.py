@@ -5,123 +5,31 @@ Extracts content from PDFs to populate perplexity-input JSON
 """
 
 import json
-import re
+import os
 from datetime import datetime
-import subprocess
 import sys
 
+# Add src directory to path for the shared utilities
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_text import PDFExtractor
+from utils.report_scanner import scan_report
+
+# Shared extractor: text is cached on disk by PDF content hash
+_extractor = PDFExtractor()
+
 def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF using pdftotext (if available) or basic parsing"""
-    try:
-        # Try using pdftotext command
-        result = subprocess.run(['pdftotext', '-layout', pdf_path, '-'], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            return result.stdout
-    except:
-        pass
-    
-    # Fallback: try PyPDF2
-    try:
-        import PyPDF2
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
-    except:
-        pass
-    
-    # Final fallback: use strings command
-    try:
-        result = subprocess.run(['strings', pdf_path], 
-                              capture_output=True, text=True)
-        if result.returncode == 0:
-            return result.stdout
-    except:
-        pass
-    
-    return ""
+    """Extract text from PDF using pdftotext (if available), PyPDF2 or strings; cached per file"""
+    return _extractor.extract_text(pdf_path)
 
 def parse_cyber_incidents_report(text):
-    """Parse the Cyber Incident Report PDF"""
-    incidents = []
-    threat_actors = []
-    
-    # Look for incident patterns
-    incident_patterns = [
-        r'(\w+[\s\w]*)\s*(?:sufrió|reportó|experimentó|fue víctima)',
-        r'(?:ataque|incidente|brecha).*?(?:en|contra)\s+(\w+[\s\w]*)',
-        r'(\w+[\s\w]*)\s*(?:comprometid[oa]|afectad[oa])'
-    ]
-    
-    # Look for sectors/companies
-    sectors = ['gobierno', 'salud', 'fintech', 'banca', 'retail', 'educación', 
-               'energía', 'manufactura', 'tecnología', 'telecomunicaciones']
-    
-    # Extract incidents
-    lines = text.split('\n')
-    for line in lines:
-        line_lower = line.lower()
-        for sector in sectors:
-            if sector in line_lower and any(word in line_lower for word in ['ataque', 'incidente', 'brecha', 'comprometid']):
-                incidents.append({
-                    "sector": sector.capitalize(),
-                    "immunity_score": "2.5",  # Default estimate
-                    "description": line.strip()[:100]
-                })
-                break
-    
-    # Look for threat actor mentions
-    threat_patterns = [
-        r'(?:grupo|actor|amenaza)\s+(\w+)',
-        r'(\w+)\s+(?:ransomware|malware|APT)',
-        r'(?:atribuido a|vinculado a)\s+(\w+)'
-    ]
-    
-    for pattern in threat_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            if len(match) > 3:  # Filter out short matches
-                threat_actors.append({
-                    "name": match.strip(),
-                    "immunity_threshold": "4"
-                })
-    
-    return incidents[:5], threat_actors[:3]  # Return top entries
+    """Parse the Cyber Incident Report PDF (text or page texts)"""
+    scanner = scan_report(text)
+    return scanner.incidents, scanner.threat_actors  # Return top entries
 
 def parse_business_model_pdf(text):
-    """Parse the Business Model PDF for statistics"""
-    stats = {
-        "attacks_vs_global": "40%",
-        "main_vector": "Ataques Web/Email",
-        "vector_pct": "64%"
-    }
-    
-    # Look for percentages related to LATAM
-    latam_pattern = r'(?:LATAM|América Latina|Latinoamérica).*?(\d+)%'
-    matches = re.findall(latam_pattern, text, re.IGNORECASE)
-    if matches:
-        stats["attacks_vs_global"] = f"{matches[0]}%"
-    
-    # Look for attack vectors
-    vector_patterns = [
-        r'(?:phishing|email).*?(\d+)%',
-        r'(?:web|aplicación).*?(\d+)%',
-        r'(?:ransomware).*?(\d+)%'
-    ]
-    
-    vectors = []
-    for pattern in vector_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        if matches:
-            vectors.append(int(matches[0]))
-    
-    if vectors:
-        stats["vector_pct"] = f"{max(vectors)}%"
-    
-    return stats
+    """Parse the Business Model PDF (text or page texts) for statistics"""
+    return scan_report(text).statistics
 
 def main():
     """Main function to parse PDFs and create perplexity-input JSON"""
@@ -131,9 +39,10 @@ def main():
     pdf1 = "intelligence/Cyber Incident Report_ LATAM & Spain (Last 7 Days).pdf"
     pdf2 = "intelligence/Cyber Incidents in LATAM and Spain_ Business Model.pdf"
     
-    # Extract text from PDFs
-    text1 = extract_text_from_pdf(pdf1)
-    text2 = extract_text_from_pdf(pdf2)
+    # Extract text from both PDFs in one pool (cached PDFs are not re-extracted)
+    pages = _extractor.extract_many([pdf1, pdf2])
+    text1 = pages[pdf1]
+    text2 = pages[pdf2]
     
     if not text1 and not text2:
         print("⚠️  Warning: Could not extract text from PDFs")
@@ -9,9 +9,214 @@ Maps technical threats to DII business models based on attack patterns
 
 import json
 import os
+import sys
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 import re
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # Batch scoring falls back to per-threat analysis
+    np = None
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from translators.threat_classifier import ThreatClassifier
+from utils.frozen import freeze
+from utils.ioc_table import IOCTable
+
+# DII business model IDs
+MODEL_IDS = list(range(1, 9))
+
+# Rule tables: built once at import, read-only and shared by every mapper instance
+BUSINESS_MODELS = freeze({
+    1: "Comercio Híbrido",
+    2: "Software Crítico", 
+    3: "Servicios de Datos",
+    4: "Ecosistema Digital",
+    5: "Servicios Financieros",
+    6: "Infraestructura Heredada",
+    7: "Cadena de Suministro",
+    8: "Información Regulada"
+})
+
+# Attack pattern mapping rules from spec
+ATTACK_PATTERNS = freeze({
+    "ransomware": {
+        "affects": [1, 2, 3, 4, 5, 6, 7, 8],  # All models
+        "primary_impact": [6],  # Infraestructura Heredada
+        "keywords": ["ransomware", "ransom", "encrypt", "lockbit", "blackcat", "alphv", "conti", "revil", "ryuk"]
+    },
+    "api_exploitation": {
+        "affects": [2, 3, 4, 5],
+        "primary_impact": [4],  # Ecosistema Digital
+        "keywords": ["api", "endpoint", "rest", "graphql", "swagger", "oauth", "jwt", "authentication bypass"]
+    },
+    "supply_chain": {
+        "affects": [1, 6, 7],
+        "primary_impact": [7],  # Cadena de Suministro
+        "keywords": ["supply chain", "third party", "vendor", "provider", "solarwinds", "kaseya", "dependency"]
+    },
+    "data_exfiltration": {
+        "affects": [3, 5, 8],
+        "primary_impact": [3],  # Servicios de Datos
+        "keywords": ["exfiltration", "data breach", "leak", "stolen data", "database", "pii", "gdpr", "sensitive"]
+    },
+    "pos_malware": {
+        "affects": [1, 5],
+        "primary_impact": [1],  # Comercio Híbrido
+        "keywords": ["pos", "point of sale", "retail", "credit card", "skimmer", "magecart"]
+    },
+    "cloud_misconfiguration": {
+        "affects": [2, 3, 4],
+        "primary_impact": [2],  # Software Crítico
+        "keywords": ["s3", "bucket", "cloud", "aws", "azure", "gcp", "misconfiguration", "exposed"]
+    },
+    "ics_ot_attack": {
+        "affects": [6, 7],
+        "primary_impact": [6],  # Infraestructura Heredada
+        "keywords": ["ics", "scada", "ot", "industrial", "plc", "hmi", "modbus", "critical infrastructure"]
+    },
+    "healthcare_targeted": {
+        "affects": [8],
+        "primary_impact": [8],  # Información Regulada
+        "keywords": ["healthcare", "hospital", "medical", "patient", "hipaa", "health records", "ehr"]
+    },
+    "financial_malware": {
+        "affects": [5],
+        "primary_impact": [5],  # Servicios Financieros
+        "keywords": ["banking", "trojan", "financial", "swift", "atm", "fintech", "payment", "transaction"]
+    },
+    "ddos": {
+        "affects": [2, 4, 5],
+        "primary_impact": [4],  # Ecosistema Digital
+        "keywords": ["ddos", "denial of service", "botnet", "amplification", "volumetric", "flood"]
+    },
+    "bec": {
+        "affects": [1, 5, 7],
+        "primary_impact": [5],  # Servicios Financieros
+        "keywords": ["bec", "business email", "ceo fraud", "wire transfer", "invoice", "phishing"]
+    }
+})
+
+# Sector to model mapping for additional context
+SECTOR_PATTERNS = freeze({
+    "retail": [1],
+    "ecommerce": [1, 4],
+    "saas": [2],
+    "software": [2],
+    "analytics": [3],
+    "data": [3],
+    "platform": [4],
+    "marketplace": [4],
+    "banking": [5],
+    "finance": [5],
+    "fintech": [5],
+    "telecom": [6],
+    "energy": [6],
+    "utility": [6],
+    "manufacturing": [6, 7],
+    "logistics": [7],
+    "supply": [7],
+    "healthcare": [8],
+    "medical": [8],
+    "insurance": [8]
+})
+
+# Model-specific IOC weights used for exposure scoring
+MODEL_IOC_WEIGHTS = freeze({
+    1: {  # Comercio Híbrido
+        "domain": 0.3,
+        "IPv4": 0.2,
+        "FileHash-MD5": 0.4,
+        "email": 0.1
+    },
+    2: {  # Software Crítico
+        "domain": 0.4,
+        "URL": 0.3,
+        "CVE": 0.2,
+        "IPv4": 0.1
+    },
+    3: {  # Servicios de Datos
+        "domain": 0.3,
+        "IPv4": 0.3,
+        "URL": 0.2,
+        "FileHash-SHA256": 0.2
+    },
+    4: {  # Ecosistema Digital
+        "domain": 0.4,
+        "URL": 0.3,
+        "IPv4": 0.2,
+        "email": 0.1
+    },
+    5: {  # Servicios Financieros
+        "domain": 0.3,
+        "FileHash-MD5": 0.3,
+        "email": 0.2,
+        "IPv4": 0.2
+    },
+    6: {  # Infraestructura Heredada
+        "IPv4": 0.4,
+        "CVE": 0.3,
+        "FileHash-MD5": 0.2,
+        "domain": 0.1
+    },
+    7: {  # Cadena de Suministro
+        "email": 0.3,
+        "domain": 0.3,
+        "FileHash-SHA256": 0.2,
+        "URL": 0.2
+    },
+    8: {  # Información Regulada
+        "FileHash-SHA256": 0.3,
+        "email": 0.3,
+        "domain": 0.2,
+        "IPv4": 0.2
+    }
+})
+
+# Phrases that mark a threat as generic/widespread
+GENERIC_INDICATORS = freeze([
+    "widespread", "multiple sectors", "various industries",
+    "global campaign", "mass exploitation", "opportunistic"
+])
+
+
+@lru_cache(maxsize=None)
+def _compiled_rules():
+    """
+    Classifier and exposure matrices compiled from the rule tables
+
+    Built on first use and shared by every mapper in the process.
+    """
+    # Precompiled single-pass classifier over all keyword rules
+    classifier = ThreatClassifier({
+        "pattern": {
+            attack_type: pattern["keywords"]
+            for attack_type, pattern in ATTACK_PATTERNS.items()
+        },
+        "sector": {sector: [sector] for sector in SECTOR_PATTERNS},
+        "generic": {"generic": GENERIC_INDICATORS}
+    })
+    
+    # Dense model x IOC-type weight matrix for batch exposure scoring
+    ioc_type_columns = tuple(sorted({
+        ioc_type for weights in MODEL_IOC_WEIGHTS.values() for ioc_type in weights
+    }))
+    exposure_weights = exposure_totals = None
+    if np is not None:
+        exposure_weights = np.array([
+            [MODEL_IOC_WEIGHTS[model_id].get(ioc_type, 0.0) for ioc_type in ioc_type_columns]
+            for model_id in MODEL_IDS
+        ])
+        exposure_totals = np.array([
+            sum(MODEL_IOC_WEIGHTS[model_id].values()) or 1.0 for model_id in MODEL_IDS
+        ])
+        exposure_weights.flags.writeable = False
+        exposure_totals.flags.writeable = False
+    return classifier, ioc_type_columns, exposure_weights, exposure_totals
 
 
 class BusinessModelMapper:
@@ -20,163 +225,93 @@ class BusinessModelMapper:
     """
     
     def __init__(self):
-        """Initialize mapper with attack pattern rules"""
-        self.business_models = {
-            1: "Comercio Híbrido",
-            2: "Software Crítico", 
-            3: "Servicios de Datos",
-            4: "Ecosistema Digital",
-            5: "Servicios Financieros",
-            6: "Infraestructura Heredada",
-            7: "Cadena de Suministro",
-            8: "Información Regulada"
-        }
-        
-        # Attack pattern mapping rules from spec
-        self.attack_patterns = {
-            "ransomware": {
-                "affects": [1, 2, 3, 4, 5, 6, 7, 8],  # All models
-                "primary_impact": [6],  # Infraestructura Heredada
-                "keywords": ["ransomware", "ransom", "encrypt", "lockbit", "blackcat", "alphv", "conti", "revil", "ryuk"]
-            },
-            "api_exploitation": {
-                "affects": [2, 3, 4, 5],
-                "primary_impact": [4],  # Ecosistema Digital
-                "keywords": ["api", "endpoint", "rest", "graphql", "swagger", "oauth", "jwt", "authentication bypass"]
-            },
-            "supply_chain": {
-                "affects": [1, 6, 7],
-                "primary_impact": [7],  # Cadena de Suministro
-                "keywords": ["supply chain", "third party", "vendor", "provider", "solarwinds", "kaseya", "dependency"]
-            },
-            "data_exfiltration": {
-                "affects": [3, 5, 8],
-                "primary_impact": [3],  # Servicios de Datos
-                "keywords": ["exfiltration", "data breach", "leak", "stolen data", "database", "pii", "gdpr", "sensitive"]
-            },
-            "pos_malware": {
-                "affects": [1, 5],
-                "primary_impact": [1],  # Comercio Híbrido
-                "keywords": ["pos", "point of sale", "retail", "credit card", "skimmer", "magecart"]
-            },
-            "cloud_misconfiguration": {
-                "affects": [2, 3, 4],
-                "primary_impact": [2],  # Software Crítico
-                "keywords": ["s3", "bucket", "cloud", "aws", "azure", "gcp", "misconfiguration", "exposed"]
-            },
-            "ics_ot_attack": {
-                "affects": [6, 7],
-                "primary_impact": [6],  # Infraestructura Heredada
-                "keywords": ["ics", "scada", "ot", "industrial", "plc", "hmi", "modbus", "critical infrastructure"]
-            },
-            "healthcare_targeted": {
-                "affects": [8],
-                "primary_impact": [8],  # Información Regulada
-                "keywords": ["healthcare", "hospital", "medical", "patient", "hipaa", "health records", "ehr"]
-            },
-            "financial_malware": {
-                "affects": [5],
-                "primary_impact": [5],  # Servicios Financieros
-                "keywords": ["banking", "trojan", "financial", "swift", "atm", "fintech", "payment", "transaction"]
-            },
-            "ddos": {
-                "affects": [2, 4, 5],
-                "primary_impact": [4],  # Ecosistema Digital
-                "keywords": ["ddos", "denial of service", "botnet", "amplification", "volumetric", "flood"]
-            },
-            "bec": {
-                "affects": [1, 5, 7],
-                "primary_impact": [5],  # Servicios Financieros
-                "keywords": ["bec", "business email", "ceo fraud", "wire transfer", "invoice", "phishing"]
-            }
-        }
+        """Initialize mapper with the shared, read-only attack pattern rules"""
+        self.business_models = BUSINESS_MODELS
+        self.attack_patterns = ATTACK_PATTERNS
+        self.sector_patterns = SECTOR_PATTERNS
+        self.model_ioc_weights = MODEL_IOC_WEIGHTS
+        self.generic_indicators = GENERIC_INDICATORS
+        (self.classifier, self._ioc_type_columns,
+         self._exposure_weights, self._exposure_totals) = _compiled_rules()
+    
+    def classify_threat(self, threat_data: dict) -> Dict[str, List[str]]:
+        """
+        Classify threat text against all keyword rules in a single pass
         
-        # Sector to model mapping for additional context
-        self.sector_patterns = {
-            "retail": [1],
-            "ecommerce": [1, 4],
-            "saas": [2],
-            "software": [2],
-            "analytics": [3],
-            "data": [3],
-            "platform": [4],
-            "marketplace": [4],
-            "banking": [5],
-            "finance": [5],
-            "fintech": [5],
-            "telecom": [6],
-            "energy": [6],
-            "utility": [6],
-            "manufacturing": [6, 7],
-            "logistics": [7],
-            "supply": [7],
-            "healthcare": [8],
-            "medical": [8],
-            "insurance": [8]
-        }
+        Args:
+            threat_data: Threat information dictionary
+            
+        Returns:
+            Dictionary with matched "pattern", "sector" and "generic" labels
+        """
+        return self.classifier.classify(self._extract_threat_text(threat_data))
         
-    def map_threat_to_model(self, threat_data: dict) -> List[int]:
+    def map_threat_to_model(self, threat_data: dict,
+                            classification: Optional[Dict[str, List[str]]] = None,
+                            iocs: Optional[IOCTable] = None) -> List[int]:
         """
         Maps a threat to affected business models
         
         Args:
             threat_data: Dictionary containing threat information
                 Expected keys: title, description, tags, indicators, malware_families
+            classification: Precomputed result of classify_threat (optional)
+            iocs: Precomputed IOCTable of the threat's indicators (optional)
                 
         Returns:
             List of affected business model IDs (1-8)
         """
         affected_models = set()
         
-        # Extract text content for analysis
-        text_content = self._extract_threat_text(threat_data)
-        text_lower = text_content.lower()
+        if classification is None:
+            classification = self.classify_threat(threat_data)
         
         # Check against attack patterns
-        for attack_type, pattern in self.attack_patterns.items():
-            if any(keyword in text_lower for keyword in pattern["keywords"]):
-                affected_models.update(pattern["affects"])
+        for attack_type in classification["pattern"]:
+            affected_models.update(self.attack_patterns[attack_type]["affects"])
         
         # Check sector mentions
-        for sector, models in self.sector_patterns.items():
-            if sector in text_lower:
-                affected_models.update(models)
+        for sector in classification["sector"]:
+            affected_models.update(self.sector_patterns[sector])
         
         # If no specific patterns matched, analyze indicators
         if not affected_models:
-            affected_models = self._analyze_indicators(threat_data)
+            affected_models = self._analyze_indicators(threat_data, iocs)
         
         # Default to all models if completely generic threat
-        if not affected_models and self._is_generic_threat(threat_data):
+        if not affected_models and self._is_generic_threat(threat_data, classification):
             affected_models = set(range(1, 9))
         
         return sorted(list(affected_models))
     
-    def get_primary_impact_models(self, threat_data: dict) -> List[int]:
+    def get_primary_impact_models(self, threat_data: dict,
+                                  classification: Optional[Dict[str, List[str]]] = None) -> List[int]:
         """
         Get business models with primary impact from the threat
         
         Args:
             threat_data: Threat information dictionary
+            classification: Precomputed result of classify_threat (optional)
             
         Returns:
             List of primary impact model IDs
         """
         primary_models = set()
-        text_lower = self._extract_threat_text(threat_data).lower()
         
-        for attack_type, pattern in self.attack_patterns.items():
-            if any(keyword in text_lower for keyword in pattern["keywords"]):
-                primary_models.update(pattern["primary_impact"])
+        if classification is None:
+            classification = self.classify_threat(threat_data)
+        
+        for attack_type in classification["pattern"]:
+            primary_models.update(self.attack_patterns[attack_type]["primary_impact"])
         
         return sorted(list(primary_models))
     
-    def get_model_exposure(self, iocs: List[dict], model_id: int) -> float:
+    def get_model_exposure(self, iocs, model_id: int) -> float:
         """
         Calculate exposure level (0-1) for specific model based on IOCs
         
         Args:
-            iocs: List of indicators of compromise
+            iocs: Indicators of compromise (list of records or IOCTable)
             model_id: Business model ID (1-8)
             
         Returns:
@@ -185,68 +320,12 @@ class BusinessModelMapper:
         if not iocs or model_id not in range(1, 9):
             return 0.0
         
+        return self._exposure_from_counts(IOCTable.of(iocs).counts, model_id)
+    
+    def _exposure_from_counts(self, ioc_type_counts: Dict[str, int], model_id: int) -> float:
+        """Exposure score (0-1) for one model from precomputed IOC type counts"""
         exposure_score = 0.0
-        model_name = self.business_models[model_id]
-        
-        # Model-specific IOC patterns
-        model_ioc_weights = {
-            1: {  # Comercio Híbrido
-                "domain": 0.3,
-                "IPv4": 0.2,
-                "FileHash-MD5": 0.4,
-                "email": 0.1
-            },
-            2: {  # Software Crítico
-                "domain": 0.4,
-                "URL": 0.3,
-                "CVE": 0.2,
-                "IPv4": 0.1
-            },
-            3: {  # Servicios de Datos
-                "domain": 0.3,
-                "IPv4": 0.3,
-                "URL": 0.2,
-                "FileHash-SHA256": 0.2
-            },
-            4: {  # Ecosistema Digital
-                "domain": 0.4,
-                "URL": 0.3,
-                "IPv4": 0.2,
-                "email": 0.1
-            },
-            5: {  # Servicios Financieros
-                "domain": 0.3,
-                "FileHash-MD5": 0.3,
-                "email": 0.2,
-                "IPv4": 0.2
-            },
-            6: {  # Infraestructura Heredada
-                "IPv4": 0.4,
-                "CVE": 0.3,
-                "FileHash-MD5": 0.2,
-                "domain": 0.1
-            },
-            7: {  # Cadena de Suministro
-                "email": 0.3,
-                "domain": 0.3,
-                "FileHash-SHA256": 0.2,
-                "URL": 0.2
-            },
-            8: {  # Información Regulada
-                "FileHash-SHA256": 0.3,
-                "email": 0.3,
-                "domain": 0.2,
-                "IPv4": 0.2
-            }
-        }
-        
-        weights = model_ioc_weights.get(model_id, {})
-        ioc_type_counts = {}
-        
-        # Count IOC types
-        for ioc in iocs:
-            ioc_type = ioc.get("type", "")
-            ioc_type_counts[ioc_type] = ioc_type_counts.get(ioc_type, 0) + 1
+        weights = self.model_ioc_weights.get(model_id, {})
         
         # Calculate weighted exposure
         total_weight = sum(weights.values()) if weights else 1.0
@@ -272,19 +351,23 @@ class BusinessModelMapper:
         Returns:
             Dictionary with business context analysis
         """
-        affected_models = self.map_threat_to_model(threat_data)
-        primary_models = self.get_primary_impact_models(threat_data)
+        # Scan threat text once for all pattern/sector rules; index IOCs once
+        classification = self.classify_threat(threat_data)
+        iocs = IOCTable.of(threat_data.get("indicators"))
+        
+        affected_models = self.map_threat_to_model(threat_data, classification, iocs)
+        primary_models = self.get_primary_impact_models(threat_data, classification)
         
         # Extract attack type
-        attack_type = self._identify_attack_type(threat_data)
+        attack_type = self._identify_attack_type(threat_data, classification)
         
-        # Calculate exposure for each affected model
-        iocs = threat_data.get("indicators", [])
+        # Calculate exposure for each affected model (IOC types counted once)
+        ioc_type_counts = iocs.counts
         model_exposures = {}
         for model_id in affected_models:
             model_exposures[model_id] = {
                 "model_name": self.business_models[model_id],
-                "exposure_score": self.get_model_exposure(iocs, model_id),
+                "exposure_score": self._exposure_from_counts(ioc_type_counts, model_id),
                 "is_primary_impact": model_id in primary_models
             }
         
@@ -297,6 +380,75 @@ class BusinessModelMapper:
             "analysis_timestamp": datetime.now().isoformat()
         }
     
+    def get_exposure_matrix(self, ioc_type_counts: List[Dict[str, int]]):
+        """
+        Exposure scores for every threat and every business model at once
+        
+        Args:
+            ioc_type_counts: One IOC type count dictionary per threat
+            
+        Returns:
+            Array of shape (n_threats, 8); column j is model j + 1
+        """
+        counts = np.zeros((len(ioc_type_counts), len(self._ioc_type_columns)))
+        column_index = {ioc_type: j for j, ioc_type in enumerate(self._ioc_type_columns)}
+        for i, type_counts in enumerate(ioc_type_counts):
+            for ioc_type, count in type_counts.items():
+                j = column_index.get(ioc_type)
+                if j is not None:
+                    counts[i, j] = count
+        
+        # Normalize counts (cap at 10), weight per model, normalize to 0-1
+        normalized = np.minimum(counts, 10) / 10
+        exposure = np.minimum((normalized @ self._exposure_weights.T) / self._exposure_totals, 1.0)
+        return np.round(exposure, 2)
+    
+    def analyze_batch(self, threats: List[dict]) -> List[Dict[str, any]]:
+        """
+        Business context analysis for many threats in one pass
+        
+        Equivalent to calling analyze_threat_context on each threat, but IOC
+        types are counted once per threat and the exposure of all 8 models is
+        computed for all threats as a single matrix operation.
+        
+        Args:
+            threats: List of threat information dictionaries
+            
+        Returns:
+            List of analysis dictionaries, in input order
+        """
+        if np is None:
+            return [self.analyze_threat_context(threat) for threat in threats]
+        
+        timestamp = datetime.now().isoformat()
+        classifications = [self.classify_threat(threat) for threat in threats]
+        ioc_tables = [IOCTable.of(threat.get("indicators")) for threat in threats]
+        exposures = self.get_exposure_matrix([iocs.counts for iocs in ioc_tables]).tolist()
+        
+        results = []
+        for threat_data, classification, iocs, exposure_row in zip(threats, classifications,
+                                                                   ioc_tables, exposures):
+            affected_models = self.map_threat_to_model(threat_data, classification, iocs)
+            primary_models = self.get_primary_impact_models(threat_data, classification)
+            
+            results.append({
+                "affected_models": affected_models,
+                "primary_impact_models": primary_models,
+                "model_exposures": {
+                    model_id: {
+                        "model_name": self.business_models[model_id],
+                        "exposure_score": exposure_row[model_id - 1],
+                        "is_primary_impact": model_id in primary_models
+                    }
+                    for model_id in affected_models
+                },
+                "attack_type": self._identify_attack_type(threat_data, classification),
+                "threat_classification": self._classify_threat_severity(affected_models, primary_models),
+                "analysis_timestamp": timestamp
+            })
+        
+        return results
+    
     def _extract_threat_text(self, threat_data: dict) -> str:
         """Extract searchable text from threat data"""
         text_parts = []
@@ -331,54 +483,55 @@ class BusinessModelMapper:
         
         return " ".join(text_parts)
     
-    def _analyze_indicators(self, threat_data: dict) -> set:
+    def _analyze_indicators(self, threat_data: dict, iocs: Optional[IOCTable] = None) -> set:
         """Analyze indicators to determine affected models"""
         affected = set()
-        indicators = threat_data.get("indicators", [])
+        if iocs is None:
+            iocs = IOCTable.of(threat_data.get("indicators"))
         
-        if not indicators:
+        if not iocs:
             return affected
         
-        # IOC type patterns
-        for ioc in indicators:
-            ioc_type = ioc.get("type", "").lower()
-            ioc_value = ioc.get("indicator", "").lower()
+        # IOC type patterns (decided once per type; only domains/URLs look at values)
+        for ioc_type in iocs.types:
+            ioc_type_lower = ioc_type.lower()
             
             # File hashes suggest malware
-            if "filehash" in ioc_type:
+            if "filehash" in ioc_type_lower:
                 affected.update([1, 2, 5, 6])  # Common malware targets
             
             # Email addresses suggest phishing/BEC
-            elif ioc_type == "email":
+            elif ioc_type_lower == "email":
                 affected.update([1, 5, 7])
             
             # Domains/URLs could affect any online service
-            elif ioc_type in ["domain", "url"]:
+            elif ioc_type_lower in ["domain", "url"]:
                 # Check for specific patterns
-                if any(fin in ioc_value for fin in ["bank", "pay", "transf"]):
-                    affected.add(5)
-                elif any(api in ioc_value for api in ["api", "swagger", "graphql"]):
-                    affected.update([2, 4])
+                for ioc_value in iocs.values_of(ioc_type):
+                    ioc_value = ioc_value.lower()
+                    if any(fin in ioc_value for fin in ["bank", "pay", "transf"]):
+                        affected.add(5)
+                    elif any(api in ioc_value for api in ["api", "swagger", "graphql"]):
+                        affected.update([2, 4])
         
         return affected
     
-    def _is_generic_threat(self, threat_data: dict) -> bool:
+    def _is_generic_threat(self, threat_data: dict,
+                           classification: Optional[Dict[str, List[str]]] = None) -> bool:
         """Determine if threat is generic/widespread"""
-        generic_indicators = [
-            "widespread", "multiple sectors", "various industries",
-            "global campaign", "mass exploitation", "opportunistic"
-        ]
-        
-        text = self._extract_threat_text(threat_data).lower()
-        return any(indicator in text for indicator in generic_indicators)
+        if classification is None:
+            classification = self.classify_threat(threat_data)
+        return bool(classification["generic"])
     
-    def _identify_attack_type(self, threat_data: dict) -> str:
+    def _identify_attack_type(self, threat_data: dict,
+                              classification: Optional[Dict[str, List[str]]] = None) -> str:
         """Identify the primary attack type"""
-        text = self._extract_threat_text(threat_data).lower()
+        if classification is None:
+            classification = self.classify_threat(threat_data)
         
-        for attack_type, pattern in self.attack_patterns.items():
-            if any(keyword in text for keyword in pattern["keywords"]):
-                return attack_type
+        # First matching pattern in rule order
+        if classification["pattern"]:
+            return classification["pattern"][0]
         
         return "unknown"
     
@@ -10,20 +10,123 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from translators.business_model_mapper import BusinessModelMapper
+from utils.enrichment_memo import EnrichmentMemo, rules_hash
+from utils.json_stream import JSONArrayStream, write_jsonl
 
 
-def enhance_weekly_intelligence(input_file: str, output_file: str = None):
+# Records mapped per analyze_batch call in streaming mode
+STREAM_BATCH_SIZE = 500
+
+MAPPER_VERSION = "1.0.0"
+
+
+def incident_to_threat(incident: dict) -> dict:
+    """Prepare an enriched incident record for the mapper"""
+    return {
+        "name": incident.get("title", ""),
+        "description": incident.get("summary", ""),
+        "tags": incident.get("tags", []),
+        "indicators": incident.get("indicators", []),
+        "malware_families": incident.get("malware_families", []),
+        "targeted_sectors": [incident.get("immunity_impact", {}).get("sector", "")]
+    }
+
+
+def result_to_threat(item: dict) -> dict:
+    """Prepare an OTX pulse (or similar result record) for the mapper"""
+    return {
+        "name": item.get("name", ""),
+        "description": item.get("description", ""),
+        "tags": item.get("tags", []),
+        "indicators": item.get("indicators", []),
+        "malware_families": item.get("malware_families", [])
+    }
+
+
+def incident_business_analysis(mapper: BusinessModelMapper, analysis: dict) -> dict:
+    """Business model mapping block attached to an incident"""
+    return {
+        "affected_models": analysis["affected_models"],
+        "primary_impact_models": analysis["primary_impact_models"],
+        "model_names": {
+            model_id: mapper.business_models[model_id] 
+            for model_id in analysis["affected_models"]
+        },
+        "attack_type": analysis["attack_type"],
+        "model_exposures": analysis["model_exposures"]
+    }
+
+
+def result_business_analysis(mapper: BusinessModelMapper, analysis: dict) -> dict:
+    """Business model mapping block attached to a result record"""
+    return {
+        "affected_models": analysis["affected_models"],
+        "primary_impact_models": analysis["primary_impact_models"],
+        "model_names": {
+            model_id: mapper.business_models[model_id] 
+            for model_id in analysis["affected_models"]
+        },
+        "attack_type": analysis["attack_type"],
+        "threat_classification": analysis["threat_classification"]
+    }
+
+
+def mapper_memo(mapper: BusinessModelMapper) -> EnrichmentMemo:
+    """Memo of mapper analyses, invalidated when the mapper's rule tables change"""
+    rules = rules_hash(mapper.business_models, mapper.attack_patterns, mapper.sector_patterns,
+                       mapper.model_ioc_weights, mapper.generic_indicators)
+    return EnrichmentMemo('business_model_mapping', MAPPER_VERSION, rules)
+
+
+def analyze_incremental(mapper: BusinessModelMapper, threats: List[dict],
+                        memo: EnrichmentMemo = None) -> List[dict]:
+    """
+    analyze_batch, but only for threats not analyzed by an earlier run
+
+    Every analysis, memoized or fresh, carries this run's timestamp.
+    """
+    if memo is None:
+        return mapper.analyze_batch(threats)
+    timestamp = datetime.now().isoformat()
+    analyses, missing = memo.lookup(threats)
+    if missing:
+        fresh = mapper.analyze_batch([threats[i] for i in missing])
+        for index, analysis in zip(missing, fresh):
+            analyses[index] = analysis
+        memo.store((threats[index], analysis) for index, analysis in zip(missing, fresh))
+    for analysis in analyses:
+        analysis['analysis_timestamp'] = timestamp
+    return analyses
+
+
+def default_output_file(input_file: str, suffix: str = None) -> str:
+    """Output path next to the input with a _business_enhanced suffix"""
+    input_path = Path(input_file)
+    return str(input_path.parent / f"{input_path.stem}_business_enhanced{suffix or input_path.suffix}")
+
+
+def print_mapping_summary(mapper: BusinessModelMapper, model_counts: Dict[int, int]):
+    """Print per-model incident counts"""
+    print("\n=== Business Model Mapping Summary ===")
+    for model_id, count in model_counts.items():
+        if count > 0:
+            print(f"[{model_id}] {mapper.business_models[model_id]:30} - {count} incidents")
+
+
+def enhance_weekly_intelligence(input_file: str, output_file: str = None, incremental: bool = True):
     """
     Enhance weekly intelligence JSON with business model mappings
     
     Args:
         input_file: Path to existing weekly intelligence JSON
         output_file: Path for enhanced output (optional, defaults to _enhanced suffix)
+        incremental: Reuse memoized mappings for records unchanged since an earlier run
     """
     print(f"Enhancing intelligence data with business model mappings...")
     print(f"Input: {input_file}")
@@ -34,38 +137,19 @@ def enhance_weekly_intelligence(input_file: str, output_file: str = None):
     
     # Initialize mapper
     mapper = BusinessModelMapper()
+    memo = mapper_memo(mapper) if incremental else None
     
     # Process based on data structure
     if "incidents" in intel_data:
         # Process enriched incidents format
         enhanced_incidents = []
         
-        for incident in intel_data["incidents"]:
-            # Prepare threat data for mapper
-            threat_data = {
-                "name": incident.get("title", ""),
-                "description": incident.get("summary", ""),
-                "tags": incident.get("tags", []),
-                "indicators": incident.get("indicators", []),
-                "malware_families": incident.get("malware_families", []),
-                "targeted_sectors": [incident.get("immunity_impact", {}).get("sector", "")]
-            }
-            
-            # Get business model analysis
-            analysis = mapper.analyze_threat_context(threat_data)
-            
+        # Get business model analysis for all incidents in one batch
+        analyses = analyze_incremental(mapper, [incident_to_threat(incident) for incident in intel_data["incidents"]], memo)
+        
+        for incident, analysis in zip(intel_data["incidents"], analyses):
             # Add business model mapping to incident
-            incident["business_model_analysis"] = {
-                "affected_models": analysis["affected_models"],
-                "primary_impact_models": analysis["primary_impact_models"],
-                "model_names": {
-                    model_id: mapper.business_models[model_id] 
-                    for model_id in analysis["affected_models"]
-                },
-                "attack_type": analysis["attack_type"],
-                "model_exposures": analysis["model_exposures"]
-            }
-            
+            incident["business_model_analysis"] = incident_business_analysis(mapper, analysis)
             enhanced_incidents.append(incident)
         
         intel_data["incidents"] = enhanced_incidents
@@ -76,7 +160,7 @@ def enhance_weekly_intelligence(input_file: str, output_file: str = None):
         
         intel_data["metadata"]["business_model_enhancement"] = {
             "enhanced_date": datetime.now().isoformat(),
-            "mapper_version": "1.0.0",
+            "mapper_version": MAPPER_VERSION,
             "total_incidents_mapped": len(enhanced_incidents)
         }
         
@@ -85,28 +169,10 @@ def enhance_weekly_intelligence(input_file: str, output_file: str = None):
         results = intel_data.get("results", intel_data) if isinstance(intel_data, dict) else intel_data
         enhanced_results = []
         
-        for item in results:
-            threat_data = {
-                "name": item.get("name", ""),
-                "description": item.get("description", ""),
-                "tags": item.get("tags", []),
-                "indicators": item.get("indicators", []),
-                "malware_families": item.get("malware_families", [])
-            }
-            
-            analysis = mapper.analyze_threat_context(threat_data)
-            
-            item["business_model_analysis"] = {
-                "affected_models": analysis["affected_models"],
-                "primary_impact_models": analysis["primary_impact_models"],
-                "model_names": {
-                    model_id: mapper.business_models[model_id] 
-                    for model_id in analysis["affected_models"]
-                },
-                "attack_type": analysis["attack_type"],
-                "threat_classification": analysis["threat_classification"]
-            }
-            
+        analyses = analyze_incremental(mapper, [result_to_threat(item) for item in results], memo)
+        
+        for item, analysis in zip(results, analyses):
+            item["business_model_analysis"] = result_business_analysis(mapper, analysis)
             enhanced_results.append(item)
         
         if isinstance(intel_data, dict):
@@ -116,18 +182,18 @@ def enhance_weekly_intelligence(input_file: str, output_file: str = None):
     
     # Determine output file
     if not output_file:
-        input_path = Path(input_file)
-        output_file = str(input_path.parent / f"{input_path.stem}_business_enhanced{input_path.suffix}")
+        output_file = default_output_file(input_file)
     
     # Save enhanced data
     with open(output_file, 'w') as f:
         json.dump(intel_data, f, indent=2, ensure_ascii=False)
     
     print(f"Output: {output_file}")
+    if memo is not None:
+        print(f"Mapping memo: {memo.summary()}")
     print(f"Enhancement complete!")
     
     # Generate summary statistics
-    print("\n=== Business Model Mapping Summary ===")
     model_counts = {i: 0 for i in range(1, 9)}
     
     if "incidents" in intel_data:
@@ -135,9 +201,92 @@ def enhance_weekly_intelligence(input_file: str, output_file: str = None):
             for model in incident["business_model_analysis"]["affected_models"]:
                 model_counts[model] += 1
     
-    for model_id, count in model_counts.items():
-        if count > 0:
-            print(f"[{model_id}] {mapper.business_models[model_id]:30} - {count} incidents")
+    print_mapping_summary(mapper, model_counts)
+
+
+def _batched(records: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def enhance_weekly_intelligence_stream(input_file: str, output_file: str = None,
+                                       batch_size: int = STREAM_BATCH_SIZE,
+                                       incremental: bool = True) -> str:
+    """
+    Streaming variant of enhance_weekly_intelligence for very large exports
+    
+    Records of the "incidents" or "results" array (or a top-level list) are
+    parsed incrementally, mapped in batches and written immediately as JSON
+    Lines, so memory stays flat regardless of input size. All other
+    top-level fields (e.g. metadata) plus the enhancement metadata are
+    written to a sidecar `<output>.meta.json` once the stream finishes.
+    
+    Args:
+        input_file: Path to intelligence JSON (incidents or OTX results)
+        output_file: Path for JSON Lines output (optional, defaults to
+            _business_enhanced.jsonl next to the input)
+        batch_size: Records mapped per analyze_batch call
+        incremental: Reuse memoized mappings for records unchanged since an earlier run
+        
+    Returns:
+        Path of the JSON Lines output
+    """
+    print(f"Streaming business model enhancement...")
+    print(f"Input: {input_file}")
+    
+    mapper = BusinessModelMapper()
+    memo = mapper_memo(mapper) if incremental else None
+    stream = JSONArrayStream(input_file, keys=("incidents", "results"))
+    
+    if not output_file:
+        output_file = default_output_file(input_file, ".jsonl")
+    
+    model_counts = {i: 0 for i in range(1, 9)}
+    total = 0
+    
+    with open(output_file, 'w', encoding='utf-8') as out:
+        for batch in _batched(stream, batch_size):
+            # The array key is known once the first record has been parsed
+            is_incident = stream.array_key == "incidents"
+            to_threat = incident_to_threat if is_incident else result_to_threat
+            build_analysis = incident_business_analysis if is_incident else result_business_analysis
+            
+            analyses = analyze_incremental(mapper, [to_threat(record) for record in batch], memo)
+            for record, analysis in zip(batch, analyses):
+                record["business_model_analysis"] = build_analysis(mapper, analysis)
+                if is_incident:
+                    for model in analysis["affected_models"]:
+                        model_counts[model] += 1
+            
+            total += write_jsonl(batch, out)
+            out.flush()
+    
+    # Sidecar with the non-record fields of the input document
+    meta = dict(stream.other_fields)
+    meta.setdefault("metadata", {})
+    meta["metadata"]["business_model_enhancement"] = {
+        "enhanced_date": datetime.now().isoformat(),
+        "mapper_version": MAPPER_VERSION,
+        "total_incidents_mapped": total,
+        "records_file": os.path.basename(output_file),
+        "records_key": stream.array_key
+    }
+    with open(f"{output_file}.meta.json", 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    
+    print(f"Output: {output_file} ({total} records)")
+    if memo is not None:
+        print(f"Mapping memo: {memo.summary()}")
+    print(f"Enhancement complete!")
+    
+    print_mapping_summary(mapper, model_counts)
+    return output_file
 
 
 def enhance_otx_data(otx_file: str):
@@ -165,21 +314,32 @@ def enhance_otx_data(otx_file: str):
 
 def main():
     """Main entry point for command line usage"""
-    if len(sys.argv) < 2:
-        print("Usage: python enhance_with_business_models.py <input_file> [output_file]")
+    args = sys.argv[1:]
+    stream_mode = "--stream" in args
+    incremental = "--full" not in args
+    args = [arg for arg in args if arg not in ("--stream", "--full")]
+    
+    if len(args) < 1:
+        print("Usage: python enhance_with_business_models.py [--stream] [--full] <input_file> [output_file]")
         print("\nExample:")
         print("  python enhance_with_business_models.py data/enriched_incidents_2025-07-11.json")
         print("  python enhance_with_business_models.py data/raw/otx_result.json")
+        print("  python enhance_with_business_models.py --stream data/raw/otx_export.json")
+        print("\n--stream parses the input incrementally and writes JSON Lines output")
+        print("--full re-maps every record instead of reusing memoized mappings")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else None
     
     if not os.path.exists(input_file):
         print(f"Error: Input file not found: {input_file}")
         sys.exit(1)
     
-    enhance_weekly_intelligence(input_file, output_file)
+    if stream_mode:
+        enhance_weekly_intelligence_stream(input_file, output_file, incremental=incremental)
+    else:
+        enhance_weekly_intelligence(input_file, output_file, incremental=incremental)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Threat Classifier - shared keyword classification engine
+Precompiles every rule group of a mapper (attack patterns, sectors, attack
+vectors, ...) into one KeywordMatcher so a threat's text is scanned once and
+all rule hits come back together
+
+@author: Lãberit Intelligence
+@version: 1.0.0
+"""
+
+import os
+import sys
+from typing import Dict, List
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.keyword_matcher import KeywordMatcher
+
+
+class ThreatClassifier:
+    """
+    Single-pass rule matcher for threat text
+
+    Rule groups map a group name to {label: keywords}. `classify` returns,
+    for every group, the labels whose keywords occur in the text, in the
+    order the labels were declared (so "first matching rule" semantics
+    are preserved).
+    """
+
+    def __init__(self, rule_groups: Dict[str, Dict[str, List[str]]]):
+        """
+        Args:
+            rule_groups: e.g. {"pattern": {"ransomware": ["ransom", ...]},
+                               "sector": {"banking": ["banking"]}}
+        """
+        self.rule_groups = rule_groups
+        self._labels = {group: list(rules) for group, rules in rule_groups.items()}
+        self._matcher = KeywordMatcher({
+            (group, label): keywords
+            for group, rules in rule_groups.items()
+            for label, keywords in rules.items()
+        })
+
+    def classify(self, text: str) -> Dict[str, List[str]]:
+        """
+        Classify text against all rule groups in one scan
+
+        Args:
+            text: Threat text (case-insensitive)
+
+        Returns:
+            Dictionary of group name to matched labels in declaration order
+        """
+        hits = self._matcher.scan(text)
+        return {
+            group: [label for label in labels if hits[(group, label)]]
+            for group, labels in self._labels.items()
+        }
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Incremental Build Graph for Generated Outputs
+Records, for every generated file, the content hashes of the input files it
+was built from (data JSON, templates, benchmarks) plus a hash of any
+in-memory parameters. An output is rebuilt only when it is missing, was
+modified since it was written, or one of its inputs changed.
+
+File hashes are cached by size and modification time, so checking an
+unchanged input costs one stat() call.
+
+Example:
+    graph = BuildGraph()
+    if graph.needs_rebuild(output, [data_file, template_file]):
+        write(output)
+        graph.record(output, [data_file, template_file])
+        graph.save()
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+# Manifest location (data/raw/cache/ is gitignored)
+INTELLIGENCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MANIFEST_PATH = os.path.join(INTELLIGENCE_ROOT, 'data', 'raw', 'cache', 'build', 'manifest.json')
+
+
+def params_hash(params: Any) -> Optional[str]:
+    """Hash of JSON-serializable build parameters (None when there are none)"""
+    if params is None:
+        return None
+    encoded = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class BuildGraph:
+    """
+    Persistent output -> inputs dependency record
+
+    Manifest format:
+        {"files": {path: {"sha256", "size", "mtime_ns"}},
+         "outputs": {path: {"inputs": {path: sha256}, "params": hash, "sha256": hash}}}
+    """
+
+    def __init__(self, manifest_path: str = DEFAULT_MANIFEST_PATH):
+        self.manifest_path = manifest_path
+        self._lock = threading.Lock()
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        self.files: Dict[str, Dict[str, Any]] = manifest.get('files', {})
+        self.outputs: Dict[str, Dict[str, Any]] = manifest.get('outputs', {})
+
+    def file_hash(self, path: str) -> Optional[str]:
+        """SHA-256 of a file's content (None if it does not exist)"""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self.files.get(path)
+            if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+                return cached['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        sha256 = digest.hexdigest()
+        with self._lock:
+            self.files[path] = {'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return sha256
+
+    def needs_rebuild(self, output: str, inputs: Iterable[str], params: Any = None) -> bool:
+        """True if `output` is missing, was edited, or any input/parameter changed"""
+        output = os.path.abspath(output)
+        record = self.outputs.get(output)
+        if record is None:
+            return True
+        if self.file_hash(output) != record.get('sha256'):
+            return True
+        if params_hash(params) != record.get('params'):
+            return True
+        recorded_inputs = record.get('inputs', {})
+        current_inputs = {os.path.abspath(path) for path in inputs if path}
+        if current_inputs != set(recorded_inputs):
+            return True
+        return any(self.file_hash(path) != recorded_inputs[path] for path in current_inputs)
+
+    def record(self, output: str, inputs: Iterable[str], params: Any = None):
+        """Remember what a freshly written `output` was built from"""
+        output = os.path.abspath(output)
+        entry = {
+            'inputs': {os.path.abspath(path): self.file_hash(path) for path in inputs if path},
+            'params': params_hash(params),
+            'sha256': self.file_hash(output)
+        }
+        with self._lock:
+            self.outputs[output] = entry
+
+    def stale(self, outputs: Dict[str, List[str]], params: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Outputs (of an {output: inputs} mapping) that need rebuilding"""
+        params = params or {}
+        return [output for output, inputs in outputs.items()
+                if self.needs_rebuild(output, inputs, params.get(output))]
+
+    def save(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'files': self.files, 'outputs': self.outputs}, f, indent=1)
+            os.replace(tmp_path, self.manifest_path)
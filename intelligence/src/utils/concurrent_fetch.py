@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Concurrent Fetch Engine for Intelligence Collectors
+Runs many network fetches in parallel on a bounded thread pool while
+keeping per-host politeness limits (max in-flight requests and a minimum
+interval between requests to the same host)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+# Defaults tuned for RSS/API collection
+DEFAULT_MAX_WORKERS = 16
+DEFAULT_PER_HOST_LIMIT = 2
+DEFAULT_PER_HOST_INTERVAL = 1.0  # seconds between request starts on one host
+
+
+class HostThrottle:
+    """
+    Per-host politeness gate
+
+    Caps concurrent requests to a host and spaces out request starts so
+    that no host sees more than one new request every `min_interval` seconds.
+    Requests to different hosts never wait on each other.
+    """
+
+    def __init__(self, per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 min_interval: float = DEFAULT_PER_HOST_INTERVAL):
+        self.per_host_limit = max(1, per_host_limit)
+        self.min_interval = max(0.0, min_interval)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_slot: Dict[str, float] = {}
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._semaphores[host]
+
+    def _reserve_slot(self, host: str) -> float:
+        """Reserve the next start time for host and return how long to wait"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = start + self.min_interval
+            return start - now
+
+    def acquire(self, host: str):
+        self._semaphore(host).acquire()
+        wait = self._reserve_slot(host)
+        if wait > 0:
+            time.sleep(wait)
+
+    def release(self, host: str):
+        self._semaphore(host).release()
+
+
+def host_of(url: str) -> str:
+    """Return the lowercased network location of a URL"""
+    return urlparse(url).netloc.lower()
+
+
+def fetch_concurrently(items: Iterable[Any],
+                       fetch_fn: Callable[[Any], Any],
+                       url_of: Callable[[Any], str],
+                       max_workers: int = DEFAULT_MAX_WORKERS,
+                       per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                       per_host_interval: float = DEFAULT_PER_HOST_INTERVAL,
+                       throttle: Optional[HostThrottle] = None
+                       ) -> Iterator[Tuple[Any, Any, Optional[Exception]]]:
+    """
+    Fetch all items in parallel and yield results as they complete
+
+    Args:
+        items: Work items (e.g. feed config dicts)
+        fetch_fn: Called with one item, returns its payload
+        url_of: Returns the URL for an item (used for per-host throttling)
+        max_workers: Upper bound on threads in the pool
+        per_host_limit: Max in-flight requests per host
+        per_host_interval: Min seconds between request starts per host
+        throttle: Optional shared HostThrottle (overrides the two limits)
+
+    Yields:
+        (item, result, error) tuples in completion order; exactly one of
+        result/error is meaningful
+    """
+    items = list(items)
+    if not items:
+        return
+
+    gate = throttle or HostThrottle(per_host_limit, per_host_interval)
+
+    def run(item):
+        host = host_of(url_of(item))
+        gate.acquire(host)
+        try:
+            return fetch_fn(item)
+        finally:
+            gate.release(host)
+
+    workers = max(1, min(max_workers, len(items)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                yield item, None, e
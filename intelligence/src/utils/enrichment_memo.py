@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Persistent Enrichment Memo
+Remembers the result of enriching each record so pipeline re-runs only do
+work for new or changed records. Entries are keyed by the record's content
+hash, the enrichment version and a hash of the rule tables the enrichment
+reads; changing any of them simply misses the old entries.
+
+Entries not used for `max_age_days`, and the least recently used ones
+beyond `max_entries`, are purged whenever new results are stored, so the
+memo does not grow without bound as new incidents arrive or rules change.
+
+Example:
+    memo = EnrichmentMemo('enrich_incidents', ENRICHMENT_VERSION,
+                          rules_hash(ATTACK_VECTORS, research_data))
+    cached, missing = memo.lookup(incidents)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Memo location (data/raw/cache/ is gitignored)
+INTELLIGENCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_MEMO_DIR = os.path.join(INTELLIGENCE_ROOT, 'data', 'raw', 'cache', 'enrichment')
+
+# Eviction limits
+DEFAULT_MAX_AGE_DAYS = 90
+DEFAULT_MAX_ENTRIES = 200000
+
+
+def _canonical_json(value: Any) -> bytes:
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def record_hash(record: Any) -> str:
+    """SHA-256 of a record's canonical JSON (key order does not matter)"""
+    return hashlib.sha256(_canonical_json(record)).hexdigest()
+
+
+def rules_hash(*tables: Any) -> str:
+    """Fingerprint of the rule tables (and other inputs) an enrichment depends on"""
+    digest = hashlib.sha256()
+    for table in tables:
+        digest.update(_canonical_json(table))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+class EnrichmentMemo:
+    """
+    SQLite-backed memo of enrichment results for one enrichment step
+
+    Values are pickled, so results with non-string dictionary keys
+    round-trip unchanged.
+    """
+
+    def __init__(self, namespace: str, version: str, rules: str,
+                 memo_dir: str = DEFAULT_MEMO_DIR,
+                 max_age_days: Optional[float] = DEFAULT_MAX_AGE_DAYS,
+                 max_entries: Optional[int] = DEFAULT_MAX_ENTRIES):
+        self.namespace = namespace
+        self.version = version
+        self.rules = rules
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self.path = os.path.join(memo_dir, f"{namespace}.sqlite")
+        os.makedirs(memo_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(
+            'CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, value BLOB NOT NULL, last_used REAL)')
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(memo)')}
+        if 'last_used' not in columns:  # Memo written before eviction existed
+            self.conn.execute('ALTER TABLE memo ADD COLUMN last_used REAL')
+            self.conn.execute('UPDATE memo SET last_used = ?', (time.time(),))
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_memo_last_used ON memo(last_used)')
+        self.conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, record: Any) -> str:
+        return hashlib.sha256(
+            f"{record_hash(record)}|{self.version}|{self.rules}".encode('utf-8')).hexdigest()
+
+    def lookup(self, records: List[Any]) -> Tuple[List[Optional[Any]], List[int]]:
+        """
+        Find memoized results for many records
+
+        Returns:
+            (results, missing): results[i] is the stored result for
+            records[i] or None, and missing lists the indexes to compute
+        """
+        keys = [self.key(record) for record in records]
+        found: Dict[str, bytes] = {}
+        now = time.time()
+        with self._lock, self.conn:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f'SELECT key, value FROM memo WHERE key IN ({placeholders})', chunk).fetchall()
+                found.update(rows)
+                if rows:
+                    hit_keys = [key for key, _ in rows]
+                    self.conn.execute(
+                        f'UPDATE memo SET last_used = ? WHERE key IN ({",".join("?" * len(hit_keys))})',
+                        [now] + hit_keys)
+
+        results: List[Optional[Any]] = []
+        missing = []
+        for index, key in enumerate(keys):
+            if key in found:
+                results.append(pickle.loads(found[key]))
+            else:
+                results.append(None)
+                missing.append(index)
+        self.hits += len(records) - len(missing)
+        self.misses += len(missing)
+        return results, missing
+
+    def store(self, items: Iterable[Tuple[Any, Any]]):
+        """Remember (record, result) pairs, then purge stale entries"""
+        now = time.time()
+        rows = [(self.key(record), pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), now)
+                for record, result in items]
+        with self._lock, self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO memo (key, value, last_used) VALUES (?, ?, ?)', rows)
+        self.purge()
+
+    def purge(self) -> int:
+        """
+        Drop entries unused for max_age_days and the least recently used beyond
+        max_entries (ties broken by insertion order, the last stored kept)
+        """
+        removed = 0
+        with self._lock, self.conn:
+            if self.max_age_days is not None:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self.conn.execute(
+                    'DELETE FROM memo WHERE last_used < ?', (cutoff,)).rowcount
+            if self.max_entries is not None:
+                removed += self.conn.execute(
+                    'DELETE FROM memo WHERE key IN '
+                    '(SELECT key FROM memo ORDER BY last_used DESC, rowid DESC LIMIT -1 OFFSET ?)',
+                    (self.max_entries,)).rowcount
+        return removed
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM memo')
+
+    def close(self):
+        self.conn.close()
+
+    def summary(self) -> str:
+        return f"{self.hits} unchanged (memoized), {self.misses} enriched"
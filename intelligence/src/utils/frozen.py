@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Read-Only Rule Tables
+Deep-freezes nested rule tables (dicts of lists of dicts ...) so one
+module-level copy can be shared by every mapper instance without any
+instance being able to change it for the others.
+
+Frozen dicts are still dicts and frozen lists are tuples, so lookups,
+iteration, json.dumps and pickling behave as before; only mutation raises.
+
+Example:
+    SECTOR_PATTERNS = freeze({"retail": [1], "ecommerce": [1, 4]})
+    SECTOR_PATTERNS["retail"]        # (1,)
+    SECTOR_PATTERNS["saas"] = [2]    # TypeError
+"""
+
+from typing import Any
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"'{type(self).__name__}' object is read-only")
+
+
+class FrozenDict(dict):
+    """A dict that cannot be modified after construction"""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDicts, lists to tuples and sets to frozensets"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(freeze(item) for item in value)
+    return value
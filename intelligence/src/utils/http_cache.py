@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP Cache for Intelligence Collectors
+Stores response bodies on disk and revalidates them with conditional GETs
+(If-None-Match / If-Modified-Since), so unchanged feeds and API payloads come
+back as 304s and are served from disk. Total cache size is bounded with
+least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils.http_client import HTTPClient, get_default_client
+
+# Cache location (data/raw/cache/ is gitignored)
+INTELLIGENCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR = os.path.join(INTELLIGENCE_ROOT, 'data', 'raw', 'cache', 'http')
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+# Response headers kept alongside the cached body
+STORED_HEADERS = ['Content-Type', 'Content-Encoding', 'ETag', 'Last-Modified']
+
+
+class HTTPCache:
+    """
+    Size-bounded on-disk cache of validated HTTP responses
+
+    Each entry is a body file plus a small JSON metadata file holding the
+    validators. Entries are keyed by URL, query params and request headers,
+    so different API keys never share an entry.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None,
+                 headers: Optional[Dict[str, str]] = None) -> str:
+        """Build a stable cache key for a request"""
+        material = json.dumps({
+            'url': url,
+            'params': sorted((str(k), str(v)) for k, v in (params or {}).items()),
+            'headers': sorted((k.lower(), str(v)) for k, v in (headers or {}).items()
+                              if k.lower() != 'user-agent')
+        })
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.cache_dir, key)
+        return base + '.body', base + '.json'
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return stored metadata for key, or None if missing/corrupt"""
+        body_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return meta
+
+    def read_body(self, key: str) -> bytes:
+        body_path, meta_path = self._paths(key)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+        # Refresh recency for LRU eviction
+        try:
+            os.utime(meta_path, None)
+        except OSError:
+            pass
+        return body
+
+    def store(self, key: str, url: str, response: requests.Response):
+        """Store a 200 response if it carries validators"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        body_path, meta_path = self._paths(key)
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'size': len(response.content),
+            'headers': {h: response.headers[h] for h in STORED_HEADERS if h in response.headers}
+        }
+
+        # Write atomically so concurrent readers never see partial files
+        self._write_atomic(body_path, response.content)
+        self._write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+        self.evict()
+
+    def conditional_headers(self, meta: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                key = name[:-5]
+                body_path, meta_path = self._paths(key)
+                try:
+                    size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+                    last_used = os.path.getmtime(meta_path)
+                except OSError:
+                    continue
+                entries.append((last_used, key, size))
+                total += size
+
+            if total <= self.max_bytes:
+                return
+
+            for _, key, size in sorted(entries):
+                for path in self._paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> HTTPCache:
+    """Shared process-wide cache instance"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = HTTPCache()
+        return _default_cache
+
+
+def _response_from_cache(url: str, meta: Dict[str, Any], body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.headers = CaseInsensitiveDict(meta.get('headers', {}))
+    response.from_cache = True
+    return response
+
+
+def cached_get(url: str, params: Optional[Dict[str, Any]] = None,
+               headers: Optional[Dict[str, str]] = None,
+               timeout: float = 30,
+               cache: Optional[HTTPCache] = None,
+               client: Optional[HTTPClient] = None) -> requests.Response:
+    """
+    GET with on-disk revalidation
+
+    Args:
+        url: Request URL
+        params: Query parameters
+        headers: Request headers (part of the cache key)
+        timeout: Request timeout in seconds
+        cache: Cache to use (defaults to the shared process-wide cache)
+        client: HTTP client to use (defaults to the shared pooled client)
+
+    Returns:
+        A requests.Response. On a 304 the cached body is returned as a 200
+        response with `from_cache = True`.
+    """
+    cache = cache or get_default_cache()
+    client = client or get_default_client()
+    key = cache.make_key(url, params, headers)
+    meta = cache.lookup(key)
+
+    request_headers = dict(headers or {})
+    if meta:
+        request_headers.update(cache.conditional_headers(meta))
+
+    response = client.get(url, params=params, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and meta:
+        try:
+            return _response_from_cache(url, meta, cache.read_body(key))
+        except OSError:
+            # Entry vanished between lookup and read; refetch unconditionally
+            response = client.get(url, params=params, headers=headers, timeout=timeout)
+
+    response.from_cache = False
+    if response.status_code == 200:
+        cache.store(key, url, response)
+    return response
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client for Intelligence Collectors
+One process-wide requests.Session with keep-alive connection pools, so
+repeated calls to a host reuse DNS/TCP/TLS setup. Adds exponential backoff
+with jitter on 429/5xx and connection failures (honouring Retry-After),
+per-host concurrency caps and default timeouts.
+"""
+
+import random
+import threading
+import time
+from typing import Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.concurrent_fetch import HostThrottle, host_of
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (5, 30)  # (connect, read) seconds
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5  # First retry waits up to 0.5s, then 1s, 2s, ...
+DEFAULT_BACKOFF_MAX = 30.0
+DEFAULT_PER_HOST_LIMIT = 4  # Max in-flight requests per host
+DEFAULT_POOL_SIZE = 16  # Keep-alive connections kept per host
+
+# Statuses worth retrying for any method (request was rejected, not processed)
+RETRY_ALWAYS_STATUSES = {429, 503}
+# Statuses retried only for idempotent requests
+RETRY_IDEMPOTENT_STATUSES = {500, 502, 504}
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'}
+
+
+class HTTPClient:
+    """
+    Thread-safe pooled client with retry/backoff
+
+    Example:
+        client = get_default_client()
+        response = client.get(url, headers=headers, params=params)
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+                 pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 user_agent: Optional[str] = None):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.throttle = HostThrottle(per_host_limit, min_interval=0.0)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if user_agent:
+            self.session.headers['User-Agent'] = user_agent
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Delay before retry number `attempt` (1-based), full jitter"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass  # HTTP-date form; fall back to exponential backoff
+        ceiling = min(self.backoff_max, self.backoff_factor * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def _should_retry(self, status: int, idempotent: bool) -> bool:
+        if status in RETRY_ALWAYS_STATUSES:
+            return True
+        return idempotent and status in RETRY_IDEMPOTENT_STATUSES
+
+    def request(self, method: str, url: str, max_retries: Optional[int] = None,
+                idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Send a request, retrying throttled/failed attempts
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            max_retries: Override the client's retry count (0 disables retries)
+            idempotent: Whether 5xx and connection errors may be retried
+                (defaults to True for GET/HEAD/OPTIONS/PUT/DELETE)
+            **kwargs: Passed to requests.Session.request (timeout defaults
+                to the client timeout)
+
+        Returns:
+            The final response (which may still be an error status)
+
+        Raises:
+            requests.exceptions.RequestException after the last failed attempt
+        """
+        method = method.upper()
+        retries = self.max_retries if max_retries is None else max_retries
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        kwargs.setdefault('timeout', self.timeout)
+        host = host_of(url)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            self.throttle.acquire(host)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not idempotent or attempt > retries:
+                    raise
+                response = None
+            finally:
+                self.throttle.release(host)
+
+            if response is not None and (attempt > retries or
+                                         not self._should_retry(response.status_code, idempotent)):
+                return response
+
+            time.sleep(self._backoff(attempt, response))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request('HEAD', url, **kwargs)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> HTTPClient:
+    """Shared process-wide client (one connection pool per host)"""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HTTPClient()
+        return _default_client
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Local Incident Store
+Keeps every collected/enriched incident in one SQLite database instead of
+dated JSON files. Incidents are deduplicated across feeds by a hash of their
+normalized title and summary; the same incident reported by several
+sources is stored once with every source recorded. Date, source,
+sector, attack vector and DII score are indexed, and titles/summaries are
+full-text searchable (FTS5 when the SQLite build has it, LIKE otherwise).
+
+Example:
+    store = IncidentStore()
+    store.add_incidents(incidents)
+    store.query(days=7, sector="Healthcare", dii_below=2)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_stream import JSONArrayStream
+
+# Database location (gitignored)
+INTELLIGENCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DB_PATH = os.path.join(INTELLIGENCE_ROOT, 'data', 'incidents.db')
+
+# Bump when content_hash changes; stored hashes are recomputed on open
+CONTENT_HASH_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS incidents (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    title TEXT,
+    summary TEXT,
+    url TEXT,
+    date TEXT,
+    source TEXT,
+    sector TEXT COLLATE NOCASE,
+    attack_vector TEXT COLLATE NOCASE,
+    severity TEXT,
+    dii_score REAL,
+    relevance_score REAL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incidents_date ON incidents(date);
+CREATE INDEX IF NOT EXISTS idx_incidents_source ON incidents(source);
+CREATE INDEX IF NOT EXISTS idx_incidents_sector_date ON incidents(sector, date);
+CREATE INDEX IF NOT EXISTS idx_incidents_attack_vector ON incidents(attack_vector);
+CREATE INDEX IF NOT EXISTS idx_incidents_dii_score ON incidents(dii_score);
+
+CREATE TABLE IF NOT EXISTS incident_sources (
+    incident_id INTEGER NOT NULL REFERENCES incidents(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL DEFAULT '',
+    first_seen TEXT NOT NULL,
+    PRIMARY KEY (incident_id, source, url)
+);
+CREATE INDEX IF NOT EXISTS idx_incident_sources_source ON incident_sources(source);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS incidents_fts USING fts5(
+    title, summary, content='incidents', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS incidents_fts_insert AFTER INSERT ON incidents BEGIN
+    INSERT INTO incidents_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS incidents_fts_delete AFTER DELETE ON incidents BEGIN
+    INSERT INTO incidents_fts(incidents_fts, rowid, title, summary)
+    VALUES ('delete', old.id, old.title, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS incidents_fts_update AFTER UPDATE OF title, summary ON incidents BEGIN
+    INSERT INTO incidents_fts(incidents_fts, rowid, title, summary)
+    VALUES ('delete', old.id, old.title, old.summary);
+    INSERT INTO incidents_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+"""
+
+_WHITESPACE = re.compile(r'\s+')
+_PUNCTUATION = re.compile(r'[^\w\s]')
+_DATE_PREFIX = re.compile(r'^(\d{4}-\d{2}-\d{2})(?:[T ](\d{2}:\d{2}(?::\d{2})?))?')
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    return _WHITESPACE.sub(' ', _PUNCTUATION.sub(' ', text or '')).strip().casefold()
+
+
+def incident_summary(incident: Dict[str, Any]) -> str:
+    """Summary text of an incident in any of the collector formats"""
+    return incident.get('summary') or incident.get('description') or ''
+
+
+def content_hash(incident: Dict[str, Any]) -> str:
+    """
+    Dedup key: SHA-256 of the normalized title and summary (case,
+    punctuation and whitespace ignored). Feeds syndicating the same story
+    verbatim collapse into one; different incidents sharing a generic
+    headline ("Ransomware attack") stay separate.
+    """
+    title = _normalize_text(incident.get('title'))
+    summary = _normalize_text(incident_summary(incident))
+    return hashlib.sha256(f"title:{title}\nsummary:{summary}".encode('utf-8')).hexdigest()
+
+
+def normalize_date(value: Any) -> Optional[str]:
+    """'YYYY-MM-DD HH:MM:SS' for the date formats the collectors emit (None if unparseable)"""
+    if not value:
+        return None
+    match = _DATE_PREFIX.match(str(value).strip())
+    if not match:
+        return None
+    day, time = match.groups()
+    time = time or '00:00:00'
+    if len(time) == 5:
+        time += ':00'
+    return f"{day} {time}"
+
+
+def _indexed_fields(incident: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the indexed columns from raw, enriched and Perplexity incidents"""
+    impact = incident.get('immunity_impact') or {}
+    vector = incident.get('attack_vector')
+    if isinstance(vector, dict):
+        vector = vector.get('type')
+    dii = (incident.get('dii_analysis') or {}).get('dii_score', incident.get('dii_score'))
+
+    return {
+        'title': incident.get('title'),
+        'summary': incident_summary(incident),
+        'url': incident.get('url'),
+        'date': normalize_date(incident.get('date')),
+        'source': incident.get('source'),
+        'sector': impact.get('sector') or incident.get('affectedSector') or incident.get('sector'),
+        'attack_vector': vector,
+        'severity': impact.get('severity') or incident.get('severity'),
+        'dii_score': float(dii) if isinstance(dii, (int, float)) else None,
+        'relevance_score': incident.get('relevance_score')
+    }
+
+
+def _merge(existing: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Newer fields win; nested dicts are merged key by key"""
+    merged = dict(existing)
+    for key, value in new.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        elif value not in (None, '', [], {}) or key not in merged:
+            merged[key] = value
+    return merged
+
+
+class IncidentStore:
+    """
+    SQLite-backed, deduplicating incident store
+
+    Safe to share between threads; writes are serialized.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        self.db_path = db_path
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; text search falls back to LIKE
+            self.has_fts = False
+        self._rehash()
+        self.conn.commit()
+
+    def _rehash(self):
+        """Recompute content hashes stored by an older CONTENT_HASH_VERSION"""
+        if self.conn.execute('PRAGMA user_version').fetchone()[0] >= CONTENT_HASH_VERSION:
+            return
+        rows = self.conn.execute('SELECT id, data FROM incidents').fetchall()
+        self.conn.executemany(
+            'UPDATE incidents SET content_hash = ? WHERE id = ?',
+            [(content_hash(json.loads(row['data'])), row['id']) for row in rows])
+        self.conn.execute(f'PRAGMA user_version = {CONTENT_HASH_VERSION}')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- writes --------------------------------------------------------------
+
+    def _upsert(self, incident: Dict[str, Any], source: Optional[str], now: str) -> bool:
+        """Insert or merge one incident; True if it was new"""
+        if source and not incident.get('source'):
+            incident = dict(incident, source=source)
+        digest = content_hash(incident)
+        row = self.conn.execute(
+            'SELECT id, data FROM incidents WHERE content_hash = ?', (digest,)).fetchone()
+
+        if row is None:
+            data = incident
+            fields = _indexed_fields(data)
+            cursor = self.conn.execute(
+                'INSERT INTO incidents (content_hash, title, summary, url, date, source, sector, '
+                'attack_vector, severity, dii_score, relevance_score, first_seen, last_seen, data) '
+                'VALUES (:hash, :title, :summary, :url, :date, :source, :sector, :attack_vector, '
+                ':severity, :dii_score, :relevance_score, :now, :now, :data)',
+                dict(fields, hash=digest, now=now, data=json.dumps(data, ensure_ascii=False)))
+            incident_id, created = cursor.lastrowid, True
+        else:
+            incident_id, created = row['id'], False
+            data = _merge(json.loads(row['data']), incident)
+            fields = _indexed_fields(data)
+            self.conn.execute(
+                'UPDATE incidents SET title = :title, summary = :summary, url = :url, date = :date, '
+                'source = :source, sector = :sector, attack_vector = :attack_vector, '
+                'severity = :severity, dii_score = :dii_score, relevance_score = :relevance_score, '
+                'last_seen = :now, data = :data WHERE id = :id',
+                dict(fields, id=incident_id, now=now, data=json.dumps(data, ensure_ascii=False)))
+
+        # Every feed that reported it (clustered incidents carry `reports`)
+        reports = incident.get('reports') or [{'source': incident.get('source'), 'url': incident.get('url')}]
+        self.conn.executemany(
+            'INSERT OR IGNORE INTO incident_sources (incident_id, source, url, first_seen) '
+            'VALUES (?, ?, ?, ?)',
+            [(incident_id, report['source'], report.get('url') or '', now)
+             for report in reports if report.get('source')])
+        return created
+
+    def add_incidents(self, incidents: Iterable[Dict[str, Any]],
+                      source: Optional[str] = None) -> Dict[str, int]:
+        """
+        Store incidents, merging duplicates into the existing record
+
+        Args:
+            incidents: Incident dictionaries (raw, enriched or Perplexity format)
+            source: Source name for incidents that do not carry one
+
+        Returns:
+            {'added': n, 'merged': n}
+        """
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        counts = {'added': 0, 'merged': 0}
+        with self._lock, self.conn:
+            for incident in incidents:
+                if not incident.get('title') and not incident_summary(incident):
+                    continue
+                counts['added' if self._upsert(incident, source, now) else 'merged'] += 1
+        return counts
+
+    def import_file(self, path: str, source: Optional[str] = None) -> Dict[str, int]:
+        """Import the incidents array of a collector/enrichment/Perplexity JSON file"""
+        return self.add_incidents(JSONArrayStream(path, keys=('incidents',)), source=source)
+
+    # -- reads ---------------------------------------------------------------
+
+    def query(self, days: Optional[int] = None, since: Optional[str] = None,
+              until: Optional[str] = None, source: Optional[str] = None,
+              sector: Optional[str] = None, attack_vector: Optional[str] = None,
+              min_dii: Optional[float] = None, dii_below: Optional[float] = None,
+              text: Optional[str] = None, order_by: str = 'date',
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Find incidents by indexed fields
+
+        Args:
+            days: Only incidents dated within the last `days` days
+            since, until: Date bounds ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS', inclusive)
+            source: Incidents reported by this source (any of their sources)
+            sector: Sector name (case-insensitive)
+            attack_vector: Attack vector type (case-insensitive)
+            min_dii, dii_below: DII score bounds (min inclusive, upper exclusive)
+            text: Full-text search over title and summary
+            order_by: 'date' (newest first) or 'dii_score' (lowest first)
+            limit: Maximum number of incidents
+
+        Returns:
+            Stored incident dictionaries, each with `sources` (all feeds that
+            reported it) and `content_hash` added
+        """
+        clauses, params = [], []
+        if days is not None:
+            since = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d %H:%M:%S')
+        if since:
+            clauses.append('i.date >= ?')
+            params.append(normalize_date(since) or since)
+        if until:
+            clauses.append('i.date <= ?')
+            params.append(until if len(until) > 10 else f"{until} 23:59:59")
+        if source:
+            clauses.append('i.id IN (SELECT incident_id FROM incident_sources WHERE source = ?)')
+            params.append(source)
+        if sector:
+            clauses.append('i.sector = ?')
+            params.append(sector)
+        if attack_vector:
+            clauses.append('i.attack_vector = ?')
+            params.append(attack_vector)
+        if min_dii is not None:
+            clauses.append('i.dii_score >= ?')
+            params.append(min_dii)
+        if dii_below is not None:
+            clauses.append('i.dii_score < ?')
+            params.append(dii_below)
+        if text:
+            if self.has_fts:
+                clauses.append('i.id IN (SELECT rowid FROM incidents_fts WHERE incidents_fts MATCH ?)')
+                # Quote each word so user input is never parsed as FTS syntax
+                params.append(' '.join('"{}"'.format(word.replace('"', '""')) for word in text.split()))
+            else:
+                clauses.append("(i.title LIKE ? OR i.summary LIKE ?)")
+                params.extend([f"%{text}%"] * 2)
+
+        order = 'i.dii_score IS NULL, i.dii_score ASC' if order_by == 'dii_score' else 'i.date DESC'
+        sql = 'SELECT i.id, i.content_hash, i.data FROM incidents i'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f' ORDER BY {order}, i.id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+            sources: Dict[int, List[str]] = {}
+            if rows:
+                ids = [row['id'] for row in rows]
+                placeholders = ','.join('?' * len(ids))
+                for row in self.conn.execute(
+                        f'SELECT incident_id, source FROM incident_sources '
+                        f'WHERE incident_id IN ({placeholders}) ORDER BY first_seen, source', ids):
+                    sources.setdefault(row['incident_id'], []).append(row['source'])
+
+        results = []
+        for row in rows:
+            incident = json.loads(row['data'])
+            incident['sources'] = sources.get(row['id'], [])
+            incident['content_hash'] = row['content_hash']
+            results.append(incident)
+        return results
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute('SELECT COUNT(*) FROM incidents').fetchone()[0]
+
+
+def open_existing_store(db_path: str = DEFAULT_DB_PATH) -> Optional[IncidentStore]:
+    """The store at db_path, or None if nothing has been stored there yet"""
+    if not os.path.exists(db_path):
+        return None
+    return IncidentStore(db_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local incident store')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Database path')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='Import incident JSON files')
+    import_parser.add_argument('files', nargs='+')
+    import_parser.add_argument('--source', help='Source name for incidents without one')
+
+    query_parser = subparsers.add_parser('query', help='Query stored incidents')
+    query_parser.add_argument('--days', type=int)
+    query_parser.add_argument('--since')
+    query_parser.add_argument('--until')
+    query_parser.add_argument('--source')
+    query_parser.add_argument('--sector')
+    query_parser.add_argument('--attack-vector')
+    query_parser.add_argument('--min-dii', type=float)
+    query_parser.add_argument('--dii-below', type=float)
+    query_parser.add_argument('--text')
+    query_parser.add_argument('--limit', type=int, default=20)
+    query_parser.add_argument('--json', action='store_true', help='Print full incidents as JSON')
+
+    args = parser.parse_args()
+    with IncidentStore(args.db) as store:
+        if args.command == 'import':
+            for path in args.files:
+                counts = store.import_file(path, source=args.source)
+                print(f"{path}: {counts['added']} added, {counts['merged']} merged")
+            print(f"Store now holds {store.count()} incidents")
+            return
+
+        incidents = store.query(days=args.days, since=args.since, until=args.until,
+                                source=args.source, sector=args.sector,
+                                attack_vector=args.attack_vector, min_dii=args.min_dii,
+                                dii_below=args.dii_below, text=args.text, limit=args.limit)
+        if args.json:
+            print(json.dumps(incidents, ensure_ascii=False, indent=2))
+            return
+        for incident in incidents:
+            dii = (incident.get('dii_analysis') or {}).get('dii_score', '-')
+            print(f"{incident.get('date', '')[:10]}  DII {dii}  {incident.get('title')}")
+            print(f"    Sources: {', '.join(incident['sources'])}")
+        print(f"{len(incidents)} incident(s)")
+
+
+if __name__ == "__main__":
+    main()
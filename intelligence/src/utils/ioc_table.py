@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Columnar IOC Container
+Holds the indicators of compromise of one threat as columns instead of a
+dict per indicator: a compact array of small type codes, a list of interned
+indicator values and per-type counts computed once at construction.
+
+Both IOC shapes used by the mappers are accepted:
+    records: [{"type": "domain", "indicator": "bad.example"}, ...]  (OTX pulses)
+    mapping: {"email": ["a@bad.example"], "hash": ["d4f5..."]}
+
+Build a table once per threat and pass it to every consumer; scoring then
+reads the precomputed counts instead of looping over the indicators.
+
+Example:
+    iocs = IOCTable.of(pulse["indicators"])
+    iocs.counts          # {"domain": 120, "IPv4": 48, ...}
+    iocs.has("email")
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+
+class IOCTable:
+    """Indicators of one threat, stored column-wise"""
+
+    __slots__ = ('types', 'type_codes', 'values', 'counts')
+
+    def __init__(self, types: Tuple[str, ...], type_codes: array, values: List[str]):
+        """
+        Args:
+            types: Distinct IOC types; type_codes index into it
+            type_codes: One type code per indicator (array of unsigned shorts)
+            values: One indicator value per indicator (interned strings)
+        """
+        self.types = types
+        self.type_codes = type_codes
+        self.values = values
+        self.counts: Dict[str, int] = {
+            ioc_type: type_codes.count(code) for code, ioc_type in enumerate(types)
+        }
+
+    @classmethod
+    def from_records(cls, records: List[Mapping[str, Any]]) -> 'IOCTable':
+        """Table from a list of {"type", "indicator"} records"""
+        codes: Dict[str, int] = {}
+        type_codes = array('H')
+        values = []
+        for record in records:
+            ioc_type = record.get("type", "")
+            code = codes.get(ioc_type)
+            if code is None:
+                code = codes[ioc_type] = len(codes)
+            type_codes.append(code)
+            values.append(sys.intern(str(record.get("indicator", ""))))
+        return cls(tuple(codes), type_codes, values)
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, Any]) -> 'IOCTable':
+        """Table from a {type: [values]} mapping (a non-list value is one indicator)"""
+        type_codes = array('H')
+        values = []
+        for code, items in enumerate(mapping.values()):
+            items = items if isinstance(items, list) else [items]
+            type_codes.extend([code] * len(items))
+            values.extend(sys.intern(str(item)) for item in items)
+        return cls(tuple(mapping), type_codes, values)
+
+    @classmethod
+    def of(cls, iocs: Any) -> 'IOCTable':
+        """Table for IOCs in any supported shape (an existing table is returned as-is)"""
+        if isinstance(iocs, IOCTable):
+            return iocs
+        if isinstance(iocs, Mapping):
+            return cls.from_mapping(iocs)
+        return cls.from_records(iocs or [])
+
+    def __len__(self) -> int:
+        return len(self.type_codes)
+
+    def count(self, ioc_type: str) -> int:
+        return self.counts.get(ioc_type, 0)
+
+    def has(self, ioc_type: str) -> bool:
+        """True if there is at least one indicator of this type"""
+        return self.counts.get(ioc_type, 0) > 0
+
+    def values_of(self, ioc_type: str) -> Iterator[str]:
+        """Indicator values of one type, in input order"""
+        try:
+            code = self.types.index(ioc_type)
+        except ValueError:
+            return iter(())
+        return (value for type_code, value in zip(self.type_codes, self.values) if type_code == code)
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        """(type, value) pairs in input order"""
+        types = self.types
+        return ((types[code], value) for code, value in zip(self.type_codes, self.values))
+
+    def __repr__(self) -> str:
+        return f"IOCTable({len(self)} indicators, counts={self.counts})"
+
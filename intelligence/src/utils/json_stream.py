@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Helpers
+Incrementally parses the records of a large JSON array (either a top-level
+list or an array under a top-level key such as "incidents" or "results")
+without loading the whole document, and writes JSON Lines output.
+Memory use is bounded by the largest single record, not the file size.
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+VALUE_TERMINATORS = WHITESPACE + ',]}:'
+
+
+class JSONArrayStream:
+    """
+    Iterate the records of a JSON array one at a time
+
+    After iteration, `array_key` names the key the array was found under
+    (None for a top-level list) and `other_fields` holds every other
+    top-level field of the document (e.g. "metadata").
+
+    Example:
+        stream = JSONArrayStream('data/raw/otx_result.json', keys=('results',))
+        for pulse in stream:
+            ...
+    """
+
+    def __init__(self, path: str, keys: Iterable[str] = ('incidents', 'results'),
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.keys = tuple(keys)
+        self.chunk_size = chunk_size
+        self.array_key: Optional[str] = None
+        self.other_fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+
+    # -- buffer management -------------------------------------------------
+
+    def _fill(self, want: int) -> bool:
+        """Read at least `want` more characters; False at end of file"""
+        data = self._file.read(max(want, self.chunk_size))
+        if not data:
+            self._eof = True
+            return False
+        if self._pos > self.chunk_size:
+            # Drop consumed text so the buffer stays small
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += data
+        return True
+
+    def _skip_ws(self):
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf) or not self._fill(self.chunk_size):
+                return
+
+    def _peek(self) -> str:
+        self._skip_ws()
+        if self._pos >= len(self._buf):
+            raise ValueError(f"Unexpected end of JSON in {self.path}")
+        return self._buf[self._pos]
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self._pos} in {self.path}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed"""
+        self._skip_ws()
+        want = self.chunk_size
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+                # A value not followed by a delimiter may be truncated (e.g.
+                # a number cut at "1." by the chunk edge), so confirm against
+                # more input unless at EOF
+                if self._eof or (end < len(self._buf) and self._buf[end] in VALUE_TERMINATORS):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            if not self._fill(want):
+                continue
+            want *= 2
+
+    # -- iteration -----------------------------------------------------------
+
+    def _iter_array(self) -> Iterator[Any]:
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Malformed array at offset {self._pos} in {self.path}")
+
+    def __iter__(self) -> Iterator[Any]:
+        self.array_key = None
+        self.other_fields = {}
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+
+        with open(self.path, 'r', encoding='utf-8') as self._file:
+            first = self._peek()
+            if first == '[':
+                yield from self._iter_array()
+                return
+            if first != '{':
+                raise ValueError(f"{self.path} does not contain a JSON object or array")
+
+            self._pos += 1
+            if self._peek() == '}':
+                return
+            while True:
+                key = self._value()
+                self._expect(':')
+                if self.array_key is None and key in self.keys and self._peek() == '[':
+                    self.array_key = key
+                    yield from self._iter_array()
+                else:
+                    self.other_fields[key] = self._value()
+                separator = self._peek()
+                self._pos += 1
+                if separator == '}':
+                    return
+                if separator != ',':
+                    raise ValueError(f"Malformed object at offset {self._pos} in {self.path}")
+
+
+def write_jsonl(records: Iterable[Any], stream: TextIO) -> int:
+    """Write records as JSON Lines; returns the number written"""
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False))
+        stream.write('\n')
+        count += 1
+    return count
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Compiled Multi-Keyword Matcher
+Finds every keyword from several keyword classes in a single scan of the text.
+
+Keywords are compiled once into a trie-shaped regular expression, so the work
+done at each text position is bounded by the longest keyword rather than the
+number of keywords. Matching is done inside a lookahead, which reports the
+longest keyword starting at every position; shorter keywords that are prefixes
+of it are added from a precomputed table. The result is the same as testing
+`keyword in text` for every keyword, in time linear in the text length.
+"""
+
+import re
+from typing import Dict, Hashable, Iterable, List, Set
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    """Render a character trie as a regex that prefers the longest match"""
+    is_end = '' in node
+    branches = [re.escape(char) + _trie_pattern(child)
+                for char, child in sorted(node.items()) if char != '']
+    if not branches:
+        return ''
+    body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+    if is_end:
+        return '(?:' + body + ')?'
+    return body
+
+
+class KeywordMatcher:
+    """
+    Single-pass matcher over named keyword classes
+
+    Example:
+        matcher = KeywordMatcher({'latam': ['mexico', 'brasil'], 'cyber': ['ransomware']})
+        matcher.scan('ransomware hits mexico')
+        # {'latam': {'mexico'}, 'cyber': {'ransomware'}}
+    """
+
+    def __init__(self, keyword_classes: Dict[Hashable, Iterable[str]],
+                 word_boundary: bool = False, ignore_case: bool = True):
+        """
+        Args:
+            keyword_classes: Mapping of class name to its keywords
+            word_boundary: Only match whole words/phrases instead of substrings
+            ignore_case: Lowercase keywords and text before matching
+        """
+        self.word_boundary = word_boundary
+        self.ignore_case = ignore_case
+        self.classes = list(keyword_classes)
+
+        # keyword -> classes it belongs to
+        self._keyword_classes: Dict[str, List[Hashable]] = {}
+        for class_name, keywords in keyword_classes.items():
+            for keyword in keywords:
+                keyword = keyword.lower() if ignore_case else keyword
+                if not keyword:
+                    continue
+                owners = self._keyword_classes.setdefault(keyword, [])
+                if class_name not in owners:
+                    owners.append(class_name)
+
+        # keyword -> shorter keywords that are its prefixes (longest first)
+        keywords = sorted(self._keyword_classes, key=len)
+        self._prefixes: Dict[str, List[str]] = {
+            keyword: [k for k in reversed(keywords) if len(k) < len(keyword) and keyword.startswith(k)]
+            for keyword in keywords
+        }
+
+        self._pattern = self._compile(keywords)
+
+    def _compile(self, keywords: List[str]):
+        if not keywords:
+            return None
+        trie: Dict[str, dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = {}
+        body = _trie_pattern(trie)
+        if self.word_boundary:
+            return re.compile(r'(?=(?<!\w)(' + body + r')(?!\w))')
+        return re.compile('(?=(' + body + '))')
+
+    def _is_word_end(self, text: str, end: int) -> bool:
+        return end >= len(text) or not (text[end].isalnum() or text[end] == '_')
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """Return every keyword present in text"""
+        found: Set[str] = set()
+        if not text or self._pattern is None:
+            return found
+        if self.ignore_case:
+            text = text.lower()
+
+        for match in self._pattern.finditer(text):
+            keyword = match.group(1)
+            found.add(keyword)
+            start = match.start()
+            for prefix in self._prefixes[keyword]:
+                if prefix in found:
+                    continue
+                if not self.word_boundary or self._is_word_end(text, start + len(prefix)):
+                    found.add(prefix)
+        return found
+
+    def scan(self, text: str) -> Dict[Hashable, Set[str]]:
+        """Return the keywords found in text grouped by class"""
+        hits: Dict[Hashable, Set[str]] = {class_name: set() for class_name in self.classes}
+        for keyword in self.find_keywords(text):
+            for class_name in self._keyword_classes[keyword]:
+                hits[class_name].add(keyword)
+        return hits
+
+    def has_any(self, text: str, class_name: Hashable) -> bool:
+        """Check whether any keyword of a class occurs in text"""
+        return bool(self.scan(text)[class_name])
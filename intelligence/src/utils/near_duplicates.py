@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Incident Clustering
+Groups incidents that report the same story (e.g. one breach covered by
+several feeds) using MinHash signatures over word shingles of the title and
+summary, and locality-sensitive hashing (LSH) to find candidate pairs.
+
+Each incident is hashed into a handful of LSH buckets, so only incidents that
+share a bucket are ever compared: clustering is close to linear in the number
+of incidents instead of comparing every pair. Candidates are confirmed with
+the estimated Jaccard similarity of their signatures.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16  # 16 bands × 4 rows: pairs above ~0.5 similarity become candidates
+SIMILARITY_THRESHOLD = 0.5
+SHINGLE_SIZE = 3  # Words per shingle
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r'\w+')
+
+
+def _tokens(text: str) -> List[str]:
+    """Lowercase words with accents stripped ('México' and 'mexico' agree)"""
+    text = unicodedata.normalize('NFKD', text.casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _WORD.findall(text)
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Set of `size`-word shingles (the words themselves for very short texts)"""
+    words = _tokens(text)
+    if len(words) < size:
+        return set(words)
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def incident_text(incident: Dict[str, Any]) -> str:
+    """Title and summary of an incident in any of the collector formats"""
+    summary = incident.get('summary') or incident.get('description') or ''
+    return f"{incident.get('title') or ''} {summary}"
+
+
+class MinHasher:
+    """MinHash signatures with a fixed, seeded family of hash permutations"""
+
+    def __init__(self, num_permutations: int = NUM_PERMUTATIONS, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        # a, b < 2**32 and 32-bit feature hashes keep a*h + b within uint64
+        self.a = rng.randint(1, 1 << 32, size=num_permutations, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_permutations, dtype=np.uint64)
+
+    def signature(self, features: Iterable[str]) -> np.ndarray:
+        """uint64 array of minimum permuted hashes (all _MAX_HASH for no features)"""
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=4).digest(), 'little')
+             for feature in features), dtype=np.uint64)
+        if not hashes.size:
+            return np.full(self.a.shape, _MAX_HASH, dtype=np.uint64)
+        permuted = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+def estimated_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity: fraction of matching signature slots"""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+
+def cluster_near_duplicates(texts: Sequence[str], threshold: float = SIMILARITY_THRESHOLD,
+                            num_permutations: int = NUM_PERMUTATIONS,
+                            bands: int = LSH_BANDS) -> List[List[int]]:
+    """
+    Cluster texts whose shingle sets are at least `threshold` similar
+
+    Returns:
+        Lists of indexes into `texts`, one per cluster (singletons included),
+        each sorted and the clusters ordered by their first index
+    """
+    hasher = MinHasher(num_permutations)
+    signatures = [hasher.signature(shingles(text)) for text in texts]
+    empty = [bool((signature == _MAX_HASH).all()) for signature in signatures]
+    rows = num_permutations // bands
+
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Incidents sharing any band bucket are candidates
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        start = band * rows
+        for index, signature in enumerate(signatures):
+            if empty[index]:
+                continue  # Empty text never matches
+            buckets.setdefault(signature[start:start + rows].tobytes(), []).append(index)
+        # Every pair in a bucket is checked unless already in one cluster
+        for members in buckets.values():
+            for position, other in enumerate(members[1:], 1):
+                for earlier in members[:position]:
+                    root_a, root_b = find(earlier), find(other)
+                    if root_a != root_b and \
+                            estimated_similarity(signatures[earlier], signatures[other]) >= threshold:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(len(texts)):
+        clusters.setdefault(find(index), []).append(index)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def _canonical_rank(incident: Dict[str, Any]):
+    """Prefer the most relevant, most detailed, earliest report"""
+    return (-(incident.get('relevance_score') or 0),
+            -len(incident.get('summary') or incident.get('description') or ''),
+            incident.get('date') or '')
+
+
+def merge_cluster(incidents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    One canonical record for a cluster of reports of the same incident
+
+    The canonical report keeps its own fields; `sources` lists every source
+    name and `reports` every (source, url) pair. Business impacts are
+    combined, and relevance gains one point per additional source covering
+    the story.
+    """
+    ranked = sorted(incidents, key=_canonical_rank)
+    canonical = dict(ranked[0])
+    if len(ranked) == 1:
+        return canonical
+
+    sources, reports = [], []
+    for incident in ranked:
+        if incident.get('source') and incident['source'] not in sources:
+            sources.append(incident['source'])
+        report = {'source': incident.get('source', ''), 'url': incident.get('url', '')}
+        if report not in reports:
+            reports.append(report)
+
+    impacts = []
+    for incident in ranked:
+        for impact in incident.get('business_impacts', []):
+            if impact not in impacts:
+                impacts.append(impact)
+
+    canonical['sources'] = sources
+    canonical['reports'] = reports
+    canonical['duplicate_count'] = len(ranked) - 1
+    if 'business_impacts' in canonical:
+        canonical['business_impacts'] = impacts
+    if 'relevance_score' in canonical:
+        base = max(incident.get('relevance_score') or 0 for incident in ranked)
+        canonical['relevance_score'] = base + len(sources) - 1
+    dates = [incident['date'] for incident in ranked if incident.get('date')]
+    if dates:
+        canonical['first_reported'] = min(dates)
+    return canonical
+
+
+def dedupe_incidents(incidents: List[Dict[str, Any]],
+                     threshold: float = SIMILARITY_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Collapse near-duplicate incidents into canonical records
+
+    Order follows the first report of each cluster.
+    """
+    clusters = cluster_near_duplicates([incident_text(incident) for incident in incidents], threshold)
+    return [merge_cluster([incidents[index] for index in members]) for members in clusters]
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Parallel, Cached PDF Text Extraction
+Extracts the text of research PDFs page by page. Large documents are split
+into page ranges and every range of every PDF is extracted across one
+process pool, so a weekly pack of long reports uses all cores.
+
+Extracted pages are cached on disk keyed by the PDF's content hash and the
+extractor version: re-runs over unchanged PDFs only read the cache.
+
+Extractors are tried in order: pdftotext (poppler), PyPDF2, then `strings`
+as a last resort. If any page range of a document cannot be extracted, the
+whole file is extracted again instead (down to `strings`), so a document's
+text is never silently missing pages. Each page keeps its trailing form feed as emitted by
+pdftotext, so joining the pages gives the whole-document text.
+
+Example:
+    extractor = PDFExtractor()
+    texts = extractor.extract_many(["report1.pdf", "report2.pdf"])
+    for page in extractor.iter_pages("report1.pdf"):
+        scan(page)
+"""
+
+import hashlib
+import json
+import os
+import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Cache location (data/raw/cache/ is gitignored)
+INTELLIGENCE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_CACHE_DIR = os.path.join(INTELLIGENCE_ROOT, 'data', 'raw', 'cache', 'pdf_text')
+
+# Bump when extraction output changes so cached text is re-extracted
+EXTRACTOR_VERSION = "1.0"
+
+# Pages per pool task
+DEFAULT_PAGES_PER_TASK = 16
+
+# Page text including its trailing form feed (the last page may lack one)
+_PAGE = re.compile(r'[^\f]*\f|[^\f]+$')
+
+# (pdf_path, first_page, last_page); pages are 1-based and inclusive, None for the whole file
+PageRange = Tuple[str, Optional[int], Optional[int]]
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def page_count(pdf_path: str) -> Optional[int]:
+    """Number of pages (None if neither pdfinfo nor PyPDF2 can read the file)"""
+    try:
+        result = subprocess.run(['pdfinfo', pdf_path], capture_output=True, text=True)
+        if result.returncode == 0:
+            match = re.search(r'^Pages:\s+(\d+)', result.stdout, re.MULTILINE)
+            if match:
+                return int(match.group(1))
+    except OSError:
+        pass
+
+    try:
+        import PyPDF2
+        with open(pdf_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    except Exception:
+        return None
+
+
+def _pdftotext_pages(pdf_path: str, first: Optional[int], last: Optional[int]) -> Optional[List[str]]:
+    command = ['pdftotext', '-layout']
+    if first is not None:
+        command += ['-f', str(first), '-l', str(last)]
+    try:
+        result = subprocess.run(command + [pdf_path, '-'], capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return _PAGE.findall(result.stdout)
+
+
+def _pypdf2_pages(pdf_path: str, first: Optional[int], last: Optional[int]) -> Optional[List[str]]:
+    try:
+        import PyPDF2
+        with open(pdf_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            pages = reader.pages[(first or 1) - 1:last]
+            return [page.extract_text() for page in pages]
+    except Exception:
+        return None
+
+
+def _strings_pages(pdf_path: str) -> Optional[List[str]]:
+    try:
+        result = subprocess.run(['strings', pdf_path], capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return [result.stdout]
+
+
+def extract_page_range(task: PageRange) -> Tuple[str, List[str]]:
+    """
+    Extract one page range with the first extractor that works
+
+    Returns:
+        (extractor name, page texts); ('', []) if every extractor failed
+    """
+    pdf_path, first, last = task
+    pages = _pdftotext_pages(pdf_path, first, last)
+    if pages is not None:
+        return 'pdftotext', pages
+    pages = _pypdf2_pages(pdf_path, first, last)
+    if pages is not None:
+        return 'PyPDF2', pages
+    if first is None:
+        pages = _strings_pages(pdf_path)
+        if pages is not None:
+            return 'strings', pages
+    return '', []
+
+
+class PDFExtractor:
+    """Page-level PDF text extraction with a process pool and a disk cache"""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, workers: Optional[int] = None,
+                 pages_per_task: int = DEFAULT_PAGES_PER_TASK):
+        """
+        Args:
+            cache_dir: Directory for extracted text (None disables caching)
+            workers: Number of worker processes (defaults to CPU count)
+            pages_per_task: Pages per pool task for large documents
+        """
+        self.cache_dir = cache_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task
+
+    def _cache_path(self, pdf_path: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{file_hash(pdf_path)}-{EXTRACTOR_VERSION}.json")
+
+    def _load_cached(self, cache_path: Optional[str]) -> Optional[List[str]]:
+        if not cache_path:
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['pages']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_cached(self, cache_path: Optional[str], pdf_path: str, extractor: str, pages: List[str]):
+        # `strings` output is a last resort; don't let it shadow a real extractor installed later
+        if not cache_path or extractor not in ('pdftotext', 'PyPDF2'):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': os.path.basename(pdf_path), 'extractor': extractor,
+                       'pages': pages}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+
+    def _tasks(self, pdf_path: str) -> List[PageRange]:
+        """Page ranges for one PDF (the whole file when the page count is unknown)"""
+        count = page_count(pdf_path)
+        if not count:
+            return [(pdf_path, None, None)]
+        return [(pdf_path, first, min(first + self.pages_per_task - 1, count))
+                for first in range(1, count + 1, self.pages_per_task)]
+
+    def _run(self, tasks: List[PageRange]) -> Iterator[Tuple[str, List[str]]]:
+        """Extract page ranges in order, across the pool when worthwhile"""
+        if self.workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield extract_page_range(task)
+            return
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+            yield from executor.map(extract_page_range, tasks)
+
+    @staticmethod
+    def _combine(pdf_path: str, results: List[Tuple[str, List[str]]]) -> Tuple[str, List[str]]:
+        """Pages of all ranges, or a whole-file extraction if any range failed"""
+        if any(not extractor for extractor, _ in results):
+            print(f"⚠️  Could not extract every page range of {os.path.basename(pdf_path)}; "
+                  f"extracting the whole file instead")
+            return extract_page_range((pdf_path, None, None))
+        extractors = {extractor for extractor, _ in results}
+        extractor = extractors.pop() if len(extractors) == 1 else ''
+        return extractor, [page for _, pages in results for page in pages]
+
+    def extract_many(self, pdf_paths: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Pages of many PDFs, extracting every uncached page range in one pool
+
+        Returns:
+            {pdf_path: page texts}; an empty list for unreadable files
+        """
+        pages: Dict[str, List[str]] = {}
+        pending: Dict[str, Optional[str]] = {}
+        for pdf_path in pdf_paths:
+            if pdf_path in pages or pdf_path in pending:
+                continue
+            if not os.path.isfile(pdf_path):
+                pages[pdf_path] = []
+                continue
+            cache_path = self._cache_path(pdf_path)
+            cached = self._load_cached(cache_path)
+            if cached is not None:
+                pages[pdf_path] = cached
+            else:
+                pending[pdf_path] = cache_path
+
+        tasks = [task for pdf_path in pending for task in self._tasks(pdf_path)]
+        results: Dict[str, List[Tuple[str, List[str]]]] = {pdf_path: [] for pdf_path in pending}
+        for task, result in zip(tasks, self._run(tasks)):
+            results[task[0]].append(result)
+
+        for pdf_path, cache_path in pending.items():
+            extractor, pdf_pages = self._combine(pdf_path, results[pdf_path])
+            self._save_cached(cache_path, pdf_path, extractor, pdf_pages)
+            pages[pdf_path] = pdf_pages
+        return pages
+
+    def iter_pages(self, pdf_path: str) -> Iterator[str]:
+        """
+        Stream a PDF's pages in order as their ranges are extracted
+
+        Once a range fails, streaming stops; the rest of the text comes from
+        a whole-file extraction (all of it if only `strings` could read it).
+        """
+        if not os.path.isfile(pdf_path):
+            return
+        cache_path = self._cache_path(pdf_path)
+        cached = self._load_cached(cache_path)
+        if cached is not None:
+            yield from cached
+            return
+
+        results = []
+        streamed = 0
+        for result in self._run(self._tasks(pdf_path)):
+            results.append(result)
+            if all(extractor for extractor, _ in results):
+                yield from result[1]
+                streamed += len(result[1])
+        extractor, pages = self._combine(pdf_path, results)
+        if extractor == 'strings':
+            yield from pages  # One blob, not aligned with the pages already streamed
+        else:
+            yield from pages[streamed:]
+        self._save_cached(cache_path, pdf_path, extractor, pages)
+
+    def extract_text(self, pdf_path: str) -> str:
+        """Whole-document text of one PDF ("" if it could not be extracted)"""
+        return ''.join(self.extract_many([pdf_path])[pdf_path])
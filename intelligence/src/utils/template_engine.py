@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compiled Dashboard Templates
+Parses the `{{KEY}}` placeholders of an HTML template once and renders it
+in a single join, instead of copying the whole template once per
+placeholder with str.replace. Compiled templates are cached per file and
+recompiled only when the file's modification time or size changes.
+
+Placeholders without a value are left in the output unchanged, as the
+str.replace loops they replace did.
+
+Example:
+    template = load_template("templates/immunity_dashboard_template_v4.html")
+    html = template.render({"WEEK_DATE": "2025-07-18", "IMMUNITY_AVG": "3.6"})
+"""
+
+import os
+import re
+import threading
+from typing import Any, Dict, List, Mapping, Tuple
+
+PLACEHOLDER = re.compile(r'\{\{([A-Za-z0-9_]+)\}\}')
+
+
+def placeholder_key(key: str) -> str:
+    """'{{KEY}}' -> 'KEY' (bare keys are returned as-is)"""
+    if key.startswith('{{') and key.endswith('}}'):
+        return key[2:-2]
+    return key
+
+
+class CompiledTemplate:
+    """A template split into literal text and placeholder slots"""
+
+    def __init__(self, text: str):
+        parts = PLACEHOLDER.split(text)
+        # Even positions are literal text, odd positions placeholder keys
+        self._parts: List[str] = parts
+        self.keys: List[str] = parts[1::2]
+
+    @property
+    def placeholders(self) -> set:
+        """Distinct placeholder keys used by the template"""
+        return set(self.keys)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """
+        Fill placeholders in one pass
+
+        Args:
+            values: Mapping of placeholder key to value; keys may be bare
+                ('WEEK_DATE') or braced ('{{WEEK_DATE}}'). Values are
+                converted with str().
+        """
+        strings = {placeholder_key(key): str(value) for key, value in values.items()}
+        parts = self._parts[:]
+        for index in range(1, len(parts), 2):
+            key = parts[index]
+            parts[index] = strings[key] if key in strings else '{{' + key + '}}'
+        return ''.join(parts)
+
+
+_cache: Dict[str, Tuple[Tuple[int, int], CompiledTemplate]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_template(path: str) -> CompiledTemplate:
+    """Compiled template for a file, cached until the file changes"""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    fingerprint = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        template = CompiledTemplate(f.read())
+    with _cache_lock:
+        _cache[path] = (fingerprint, template)
+    return template
+
+
+def render_template(path: str, values: Mapping[str, Any]) -> str:
+    """Render a template file with the given placeholder values"""
+    return load_template(path).render(values)
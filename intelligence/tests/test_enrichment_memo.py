@@ -0,0 +1,56 @@
+"""Incremental enrichment memo: eviction and run timestamps"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from processors.enrich_incidents import enrich_incidents_incremental
+from utils.enrichment_memo import EnrichmentMemo
+
+
+def fake_enrichment(record):
+    return {"id": record["id"], "enrichment": {"enriched_at": "2020-01-01 00:00:00"}}
+
+
+def test_purge_keeps_most_recently_used_entries(tmp_path):
+    memo = EnrichmentMemo('test', '1', 'rules', memo_dir=str(tmp_path), max_entries=3)
+    records = [{"id": i} for i in range(5)]
+    for record in records[:3]:
+        memo.store([(record, fake_enrichment(record))])
+        time.sleep(0.01)
+    memo.lookup(records[:1])  # Record 0 is used again, record 1 is now the oldest
+    time.sleep(0.01)
+    memo.store((record, fake_enrichment(record)) for record in records[3:])
+
+    results, missing = memo.lookup(records)
+    assert missing == [1, 2]
+    assert [results[i]["id"] for i in (0, 3, 4)] == [0, 3, 4]
+    memo.close()
+
+
+def test_purge_keeps_count_when_one_batch_exceeds_max_entries(tmp_path):
+    memo = EnrichmentMemo('test', '1', 'rules', memo_dir=str(tmp_path), max_entries=3)
+    records = [{"id": i} for i in range(5)]
+    memo.store((record, fake_enrichment(record)) for record in records)
+    assert len(memo.lookup(records)[1]) == 2
+    memo.close()
+
+
+def test_purge_drops_entries_older_than_max_age(tmp_path):
+    memo = EnrichmentMemo('test', '1', 'rules', memo_dir=str(tmp_path), max_age_days=0)
+    memo.store([({"id": 1}, fake_enrichment({"id": 1}))])
+    assert memo.lookup([{"id": 1}])[1] == [0]
+    memo.close()
+
+
+def test_memo_hits_carry_this_runs_enrichment_time(tmp_path):
+    memo = EnrichmentMemo('test', '1', 'rules', memo_dir=str(tmp_path))
+    records = [{"id": i} for i in range(3)]
+    memo.store((record, fake_enrichment(record)) for record in records)
+
+    enriched = enrich_incidents_incremental(records, {}, memo)
+    stamps = {incident["enrichment"]["enriched_at"] for incident in enriched}
+    assert len(stamps) == 1 and stamps != {"2020-01-01 00:00:00"}
+    memo.close()
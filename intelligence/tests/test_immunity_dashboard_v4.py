@@ -0,0 +1,73 @@
+"""Client dashboards of the DII 4.0 executive dashboard generator"""
+
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from immunity_dashboard_generator_v4 import DIIv4ExecutiveDashboardGenerator
+
+
+def make_client(aer=4.6, trd=2.94):
+    return {
+        "id": 1,
+        "company_name": "Banco Ejemplo",
+        "business_model_v4": "Servicios Financieros",
+        "dii_score": 5.2,
+        "dimensions": {"AER": aer, "HFP": 0.583, "BRI": 0.47, "TRD": trd, "RRG": 1.0}
+    }
+
+
+def test_client_dimensions_keep_precision_and_client_aer_scale():
+    generator = DIIv4ExecutiveDashboardGenerator()
+    data = generator.client_dashboard_data({}, make_client())
+    dimensions = data['dii_dimensions']
+
+    assert dimensions['AER']['value'] == "4.6"
+    assert dimensions['TRD']['value'] == "2.94"
+    assert dimensions['HFP']['value'] == "58.3"
+
+    meaning = generator.get_dimension_meaning('AER', dimensions['AER']['value'], data['dimension_scale'])
+    assert meaning != generator.client_aer_meanings['low']
+    assert meaning == generator.client_aer_meanings['high']
+
+    low = generator.client_dashboard_data({}, make_client(aer=2.3))['dii_dimensions']['AER']['value']
+    assert generator.get_dimension_meaning('AER', low, 'client') == generator.client_aer_meanings['low']
+
+
+WEEKLY_DATA = {
+    "week_date": "2025-07-18",
+    "week_summary": {
+        "immunity_avg": "3.6",
+        "attacks_week": "2,847",
+        "top_threat_pct": "48%",
+        "top_threat_type": "Ransomware",
+        "victims_low_immunity_pct": "75%",
+        "key_insight": "Insight"
+    },
+    "dii_dimensions": {},
+    "business_model_insights": {},
+    "recommendations": []
+}
+
+
+def test_client_model_incidents_are_shown_before_other_spain_incidents():
+    generator = DIIv4ExecutiveDashboardGenerator()
+    incidents = ([{"country": "España", "business_model": "COMERCIO_HIBRIDO", "summary": f"Incidente ES {i}"}
+                  for i in range(8)] +
+                 [{"country": "México", "business_model": "SERVICIOS_FINANCIEROS", "summary": "Incidente banco MX"}])
+    weekly = dict(WEEKLY_DATA, incidents=incidents)
+    html = generator.populate_template(generator.client_dashboard_data(weekly, make_client()))
+
+    # Only 8 incident cards are shown: the client's own-model incident must be one of them
+    assert "Incidente banco MX" in html
+    assert html.index("Incidente banco MX") < html.index("Incidente ES 0")
+
+
+def test_weekly_dashboard_keeps_spain_first():
+    generator = DIIv4ExecutiveDashboardGenerator()
+    incidents = [{"country": "México", "business_model": "SERVICIOS_FINANCIEROS", "summary": "Incidente MX"},
+                 {"country": "España", "business_model": "COMERCIO_HIBRIDO", "summary": "Incidente ES"}]
+    html = generator.populate_template(dict(WEEKLY_DATA, incidents=incidents))
+
+    assert html.index("Incidente ES") < html.index("Incidente MX")
@@ -3,9 +3,14 @@
 Analyze MasterDatabaseV3.1.xlsx for data migration planning
 """
 
-import pandas as pd
 import numpy as np
 from pathlib import Path
+import sys
+
+# Add repository root to path for the shared workbook cache
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from scripts import workbook_cache
 
 def analyze_excel_file(file_path):
     """Comprehensive analysis of the Excel file"""
@@ -14,20 +19,20 @@ def analyze_excel_file(file_path):
     print("=" * 80)
     
     # Read all sheets
-    excel_file = pd.ExcelFile(file_path)
+    sheet_names = workbook_cache.sheet_names(file_path)
     
     # 1. List all sheet names
     print("\n1. SHEET NAMES IN WORKBOOK:")
     print("-" * 40)
-    for i, sheet in enumerate(excel_file.sheet_names, 1):
+    for i, sheet in enumerate(sheet_names, 1):
         print(f"{i}. {sheet}")
     
     # 2. Analyze Dim_Clients sheet
-    if 'Dim_Clients' in excel_file.sheet_names:
+    if 'Dim_Clients' in sheet_names:
         print("\n\n2. ANALYSIS OF 'Dim_Clients' SHEET:")
         print("=" * 80)
         
-        df = pd.read_excel(file_path, sheet_name='Dim_Clients')
+        df = workbook_cache.read_sheet(file_path, 'Dim_Clients')
         
         # Column headers and data types
         print("\nCOLUMN HEADERS AND DATA TYPES:")
@@ -136,7 +141,7 @@ def analyze_excel_file(file_path):
         
     else:
         print("\n'Dim_Clients' sheet not found in the workbook!")
-        print("Available sheets:", excel_file.sheet_names)
+        print("Available sheets:", sheet_names)
 
 # Main execution
 if __name__ == "__main__":
@@ -7,7 +7,14 @@ import pandas as pd
 import numpy as np
 from collections import Counter
 import json
+import sys
 from datetime import datetime
+from pathlib import Path
+
+# Add repository root to path for the shared workbook cache
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from scripts import workbook_cache
 
 # DII 4.0 Model Definitions
 DII_4_MODELS = {
@@ -64,11 +71,11 @@ MAPPING_RULES = {
 def load_excel_data(file_path):
     """Load all sheets from the Excel file."""
     try:
-        xl_file = pd.ExcelFile(file_path)
+        cache = workbook_cache.get_workbook_cache(file_path)
         data = {}
-        for sheet_name in xl_file.sheet_names:
+        for sheet_name in cache.sheet_names:
             print(f"Loading sheet: {sheet_name}")
-            data[sheet_name] = pd.read_excel(xl_file, sheet_name=sheet_name)
+            data[sheet_name] = cache.read_sheet(sheet_name)
         return data
     except Exception as e:
         print(f"Error loading Excel file: {e}")
@@ -6,10 +6,20 @@ This version uses openpyxl which should be available, or falls back to CSV if ne
 
 import csv
 import json
+import sys
 from collections import Counter, defaultdict
 from datetime import datetime
+from pathlib import Path
 import statistics
 
+# Add repository root to path for the shared workbook cache
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+try:
+    from scripts import workbook_cache
+except ImportError:  # pandas not installed; always parse the workbook
+    workbook_cache = None
+
 # DII 4.0 Model Definitions
 DII_4_MODELS = {
     "A-RC": "Recovery Optimized for All Threats",
@@ -101,6 +111,18 @@ def read_excel_with_openpyxl(file_path):
         print(f"Error reading Excel file with openpyxl: {e}")
         return None
 
+def read_excel_cached(file_path):
+    """read_excel_with_openpyxl, served from the workbook cache when available"""
+    if workbook_cache is None:
+        return read_excel_with_openpyxl(file_path)
+    
+    try:
+        cache = workbook_cache.get_workbook_cache(file_path)
+        return cache.artifact('openpyxl_rows', lambda: read_excel_with_openpyxl(file_path))
+    except Exception as e:
+        print(f"Workbook cache unavailable ({e}), reading Excel file directly")
+        return read_excel_with_openpyxl(file_path)
+
 def find_dim_clients_sheet(data):
     """Find the Dim_Clients sheet or similar."""
     for sheet_name in data.keys():
@@ -386,7 +408,7 @@ def main():
     print(f"Loading data from {file_path}...")
     
     # Try to read Excel file
-    data = read_excel_with_openpyxl(file_path)
+    data = read_excel_cached(file_path)
     
     if data is None:
         print("Failed to load Excel file. Please ensure openpyxl is installed or convert to CSV.")
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Vectorized DII 4.0 Scoring Kernel
+Columnar (NumPy) implementation of DII = (TRD × AER) / (HFP × BRI × RRG)
+plus the dimension formulas, maturity/cloud adjustments, normalization,
+stages and interpretations used across the migration, data generation and
+incident enrichment scripts. Every function accepts scalars, lists, NumPy
+arrays or pandas Series and scores millions of rows in one call.
+
+Missing values are represented as NaN.
+"""
+
+import numpy as np
+
+# Normalization base: median dimension values (24 × 3.0) / (0.5 × 0.5 × 1.5) ≈ 192
+DII_BASE = (24 * 3.0) / (0.5 * 0.5 * 1.5)
+
+# DII score limits after normalization
+DII_MIN_SCORE = 1.0
+DII_MAX_SCORE = 10.0
+
+# DII stages on the normalized 1-10 scale
+DII_STAGE_THRESHOLDS = [2.5, 5.0, 7.5]
+DII_STAGE_LABELS = ["Frágil", "Robusto", "Resiliente", "Adaptativo"]
+
+# Interpretations on the raw (unnormalized) DII scale
+DII_INTERPRETATION_THRESHOLDS = [1, 2, 5, 10]
+DII_INTERPRETATION_LABELS = [
+    "Critical vulnerability - Operations will cease under attack",
+    "Poor immunity - Significant disruption likely",
+    "Fair immunity - Moderate operational impact expected",
+    "Good immunity - Limited degradation during attacks",
+    "Excellent immunity - Organization can operate effectively under attack"
+]
+
+# TRD adjustment by recovery (ZT) maturity level
+MATURITY_TRD_ADJUSTMENTS = {
+    5: 0.7,   # 30% better
+    4: 0.85,  # 15% better
+    3: 1.0,   # baseline
+    2: 1.3,   # 30% worse
+    1: 1.6    # 60% worse
+}
+
+# TRD factor by cloud adoption level
+CLOUD_TRD_FACTORS = {
+    'Minimal': 1.3,      # Slower degradation
+    'Hybrid': 1.0,       # Baseline
+    'Cloud First': 0.7   # Faster degradation
+}
+
+# RRG limits and default when no response data is available
+RRG_MIN = 1.0
+RRG_MAX = 5.0
+RRG_DEFAULT = 1.5
+
+
+def _as_float(values):
+    return np.asarray(values, dtype=float)
+
+
+def _clip_like_python(values, low, high):
+    """
+    Clip to [low, high] with the semantics of max(low, min(high, x))
+
+    Matches the scalar scripts exactly, including NaN mapping to `high`.
+    """
+    values = _as_float(values)
+    return np.where(np.isnan(values), high, np.clip(values, low, high))
+
+
+def hfp_from_protection_readiness(protection_readiness):
+    """HFP = 0.2 + 0.8 × (1 - Protection_Readiness / 5)"""
+    return 0.2 + (0.8 * (1 - _as_float(protection_readiness) / 5))
+
+
+def bri_from_protection_performance(protection_performance):
+    """BRI = 0.2 + 0.8 × (1 - Protection_Performance / 100)"""
+    return 0.2 + (0.8 * (1 - _as_float(protection_performance) / 100))
+
+
+def maturity_trd_adjustment(zt_maturity):
+    """TRD multiplier for ZT maturity levels 1-5 (truncated); NaN/other → 1.0"""
+    maturity = _as_float(zt_maturity)
+    lookup = np.ones(7)
+    for level, adjustment in MATURITY_TRD_ADJUSTMENTS.items():
+        lookup[level] = adjustment
+    levels = np.trunc(np.nan_to_num(maturity, nan=0.0))
+    in_range = (levels >= 1) & (levels <= 5)
+    return np.where(in_range, lookup[np.clip(levels, 0, 6).astype(int)], 1.0)
+
+
+def cloud_trd_factor(cloud_adoption_level):
+    """TRD multiplier for cloud adoption levels; unknown → 1.0"""
+    levels = np.asarray(cloud_adoption_level, dtype=object)
+    factors = np.ones(levels.shape)
+    for level, factor in CLOUD_TRD_FACTORS.items():
+        factors[levels == level] = factor
+    return factors
+
+
+def adjusted_trd(base_trd, zt_maturity=np.nan, cloud_adoption_level='Hybrid'):
+    """TRD = base TRD × maturity adjustment × cloud factor"""
+    return _as_float(base_trd) * maturity_trd_adjustment(zt_maturity) * cloud_trd_factor(cloud_adoption_level)
+
+
+def rrg_from_response(response_agility, zt_maturity=np.nan):
+    """
+    RRG (Recovery Reality Gap), capped to [1.0, 5.0]
+
+    3 / (Response_Agility × ZT_maturity / 3) when both are known,
+    3 / Response_Agility when only agility is known, 1.5 otherwise
+    (agility of 0 counts as unknown).
+    """
+    agility = _as_float(response_agility)
+    maturity = _as_float(zt_maturity)
+    has_agility = agility != 0
+    safe_agility = np.where(has_agility, agility, 1.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rrg = np.where(
+            has_agility & ~np.isnan(maturity),
+            3.0 / (safe_agility * (maturity / 3)),
+            np.where(has_agility, 3.0 / safe_agility, RRG_DEFAULT)
+        )
+    return _clip_like_python(rrg, RRG_MIN, RRG_MAX)
+
+
+def dii_raw(trd, aer, hfp, bri, rrg):
+    """Raw DII = (TRD × AER) / (HFP × BRI × RRG)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (_as_float(trd) * _as_float(aer)) / (_as_float(hfp) * _as_float(bri) * _as_float(rrg))
+
+
+def dii_score(trd, aer, hfp, bri, rrg, base=DII_BASE, decimals=2):
+    """
+    Normalized DII score: (raw / base) × 10, limited to [1.0, 10.0]
+
+    Args:
+        trd, aer, hfp, bri, rrg: Dimension columns
+        base: Normalization base (DII_BASE for migration scoring)
+        decimals: Rounding applied to the final score (None to skip)
+    """
+    score = _clip_like_python((dii_raw(trd, aer, hfp, bri, rrg) / base) * 10, DII_MIN_SCORE, DII_MAX_SCORE)
+    return np.round(score, decimals) if decimals is not None else score
+
+
+def _bucket(values, thresholds, labels):
+    index = np.searchsorted(np.asarray(thresholds, dtype=float), _as_float(values), side='right')
+    return np.asarray(labels, dtype=object)[index]
+
+
+def dii_stage(scores):
+    """Stage labels (Frágil/Robusto/Resiliente/Adaptativo) for normalized scores"""
+    return _bucket(scores, DII_STAGE_THRESHOLDS, DII_STAGE_LABELS)
+
+
+def dii_interpretation(raw_scores):
+    """Interpretation text for raw DII values"""
+    return _bucket(raw_scores, DII_INTERPRETATION_THRESHOLDS, DII_INTERPRETATION_LABELS)
+
+
+def score_dimensions(trd, aer, hfp, bri, rrg, base=DII_BASE, decimals=2):
+    """
+    Score many rows at once
+
+    Returns:
+        Dictionary of arrays: dii_raw, dii_score, dii_stage, interpretation
+    """
+    raw = dii_raw(trd, aer, hfp, bri, rrg)
+    score = dii_score(trd, aer, hfp, bri, rrg, base=base, decimals=decimals)
+    return {
+        'dii_raw': raw,
+        'dii_score': score,
+        'dii_stage': dii_stage(score),
+        'interpretation': dii_interpretation(raw)
+    }
@@ -8,9 +8,15 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
+import sys
 import warnings
 warnings.filterwarnings('ignore')
 
+# Add repository root to path for the shared DII scoring kernel and workbook cache
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from scripts import dii_scoring, workbook_cache
+
 # DII 4.0 Business Models
 DII_V4_MODELS = {
     1: "Comercio Híbrido",
@@ -71,16 +77,25 @@ SECTOR_AER = {
     'Pharma': 3.5
 }
 
+# Defaults by v3 business model when (sector, model) is not in V3_TO_V4_MAPPING
+MODEL_DEFAULTS = {
+    'Platform': 4,
+    'SaaS': 2,
+    'XaaS': 2,
+    'Marketplace': 4,
+    'Traditional Retail': 1,
+    'Financial Services': 5,
+    'Hybrid': 1,
+    'Healthcare': 8,
+    'Manufacturing': 7
+}
+
+# Lookup table for vectorized mapping, indexed by (SECTOR, BUSINESS_MODEL)
+V3_TO_V4_TABLE = pd.Series(V3_TO_V4_MAPPING, dtype=float)
+
 # DII stages
 def get_dii_stage(score):
-    if score < 2.5:
-        return "Frágil"
-    elif score < 5.0:
-        return "Robusto"
-    elif score < 7.5:
-        return "Resiliente"
-    else:
-        return "Adaptativo"
+    return str(dii_scoring.dii_stage(score))
 
 def map_business_model(row):
     """Map v3 business model to v4"""
@@ -101,19 +116,31 @@ def map_business_model(row):
         return V3_TO_V4_MAPPING[key]
     
     # Defaults by business model
-    model_defaults = {
-        'Platform': 4,
-        'SaaS': 2,
-        'XaaS': 2,
-        'Marketplace': 4,
-        'Traditional Retail': 1,
-        'Financial Services': 5,
-        'Hybrid': 1,
-        'Healthcare': 8,
-        'Manufacturing': 7
-    }
+    return MODEL_DEFAULTS.get(row['BUSINESS_MODEL'], 4)
+
+def _column(df, name, default):
+    """Column of df, or a constant column when it is missing"""
+    if name in df.columns:
+        return df[name]
+    return pd.Series(default, index=df.index)
+
+def map_business_models(df):
+    """Vectorized map_business_model over a clients DataFrame"""
+    sector = df['SECTOR']
+    model = df['BUSINESS_MODEL']
+    cloud = _column(df, 'CLOUD_ADOPTION_LEVEL', 'Hybrid')
+    
+    # Mapping table lookup, then defaults by business model, then 4
+    lookup = V3_TO_V4_TABLE.reindex(pd.MultiIndex.from_arrays([sector, model])).to_numpy()
+    v4_model_id = pd.Series(lookup, index=df.index)
+    v4_model_id = v4_model_id.fillna(model.map(MODEL_DEFAULTS)).fillna(4)
     
-    return model_defaults.get(row['BUSINESS_MODEL'], 4)
+    # Special cases take precedence over the table
+    is_manufacturing = model == 'Manufacturing'
+    v4_model_id[is_manufacturing] = np.where(cloud[is_manufacturing] == 'Minimal', 6, 7)
+    v4_model_id[sector == 'Healthcare'] = 8
+    
+    return v4_model_id.astype(int)
 
 def calculate_dii_dimensions(row, zt_maturity=None):
     """Calculate all 5 DII dimensions for a client"""
@@ -187,21 +214,93 @@ def calculate_dii_dimensions(row, zt_maturity=None):
         'has_zt_maturity': zt_maturity is not None
     }
 
-def calculate_dii_score(dimensions):
-    """Calculate final DII score from dimensions"""
-    # DII Raw = (TRD × AER) / (HFP × BRI × RRG)
-    dii_raw = (dimensions['TRD'] * dimensions['AER']) / (dimensions['HFP'] * dimensions['BRI'] * dimensions['RRG'])
+def calculate_dii_dimensions_frame(df, zt_maturity=None):
+    """
+    Calculate all 5 DII dimensions for every client at once
+    
+    Args:
+        df: Clients DataFrame (Dim_Clients columns)
+        zt_maturity: Optional ZT maturity per client, aligned with df (NaN = missing)
+        
+    Returns:
+        DataFrame with the same fields as calculate_dii_dimensions, one row per client
+    """
+    if zt_maturity is None:
+        zt_maturity = pd.Series(np.nan, index=df.index)
+    
+    v4_model_id = map_business_models(df)
+    cloud = _column(df, 'CLOUD_ADOPTION_LEVEL', 'Hybrid')
     
-    # Base value for normalization (using median values)
-    dii_base = (24 * 3.0) / (0.5 * 0.5 * 1.5)  # ~192
+    aer = df['SECTOR'].map(SECTOR_AER).fillna(3.0)
+    hfp = dii_scoring.hfp_from_protection_readiness(_column(df, 'Protection_Readiness', 2.5))
+    bri = dii_scoring.bri_from_protection_performance(_column(df, 'Protection_Performance', 50))
+    trd = dii_scoring.adjusted_trd(v4_model_id.map(BASE_TRD_VALUES), zt_maturity, cloud)
+    rrg = dii_scoring.rrg_from_response(_column(df, 'Response_Agility', 3.0), zt_maturity)
     
-    # DII Score = (DII Raw / DII Base) × 10
-    dii_score = (dii_raw / dii_base) * 10
+    return pd.DataFrame({
+        'v4_model_id': v4_model_id,
+        'v4_model_name': v4_model_id.map(DII_V4_MODELS),
+        'TRD': np.round(trd, 2),
+        'AER': np.round(aer.to_numpy(dtype=float), 2),
+        'HFP': np.round(hfp, 3),
+        'BRI': np.round(bri, 3),
+        'RRG': np.round(rrg, 2),
+        'has_zt_maturity': zt_maturity.notna()
+    }, index=df.index)
+
+def migrate_clients(df_clients, zt_maturity_by_client=None):
+    """
+    Migrate a clients DataFrame to DII 4.0 without per-row Python work
+    
+    Args:
+        df_clients: Dim_Clients DataFrame
+        zt_maturity_by_client: Optional Series of ZT maturity indexed by ID_CLIENT
+        
+    Returns:
+        Results DataFrame (one row per client)
+    """
+    if zt_maturity_by_client is None:
+        zt_maturity_by_client = pd.Series(dtype=float)
     
-    # Apply limits: 1.0 ≤ DII Score ≤ 10.0
-    dii_score = max(1.0, min(10.0, dii_score))
+    # Join ZT maturity onto the clients by ID_CLIENT
+    zt_maturity = df_clients['ID_CLIENT'].map(zt_maturity_by_client).astype(float)
+    dimensions = calculate_dii_dimensions_frame(df_clients, zt_maturity)
+    
+    results_df = pd.DataFrame({
+        'ID_CLIENT': df_clients['ID_CLIENT'],
+        'CompanyName': df_clients['CompanyName'],
+        'SECTOR': df_clients['SECTOR'],
+        'v3_MODEL': df_clients['BUSINESS_MODEL'],
+        'v4_MODEL_ID': dimensions['v4_model_id'],
+        'v4_MODEL': dimensions['v4_model_name'],
+        'TRD': dimensions['TRD'],
+        'AER': dimensions['AER'],
+        'HFP': dimensions['HFP'],
+        'BRI': dimensions['BRI'],
+        'RRG': dimensions['RRG'],
+        'OLD_IMMUNITY': df_clients['IMMUNITY_INDEX'],
+        'NEW_DII': calculate_dii_score(dimensions),
+        'HAS_ZT_DATA': dimensions['has_zt_maturity'],
+        'CLOUD_LEVEL': _column(df_clients, 'CLOUD_ADOPTION_LEVEL', 'Hybrid')
+    })
+    results_df.insert(results_df.columns.get_loc('NEW_DII') + 1, 'DII_STAGE',
+                      dii_scoring.dii_stage(results_df['NEW_DII']))
+    
+    return results_df.reset_index(drop=True)
+
+def calculate_dii_score(dimensions):
+    """
+    Calculate final DII score from dimensions
     
-    return round(dii_score, 2)
+    Accepts a single dimensions dict or a DataFrame with TRD/AER/HFP/BRI/RRG
+    columns; DataFrames are scored in one vectorized pass.
+    """
+    # DII Score = ((TRD × AER) / (HFP × BRI × RRG)) / DII Base × 10, limited to [1.0, 10.0]
+    scores = dii_scoring.dii_score(dimensions['TRD'], dimensions['AER'], dimensions['HFP'],
+                                   dimensions['BRI'], dimensions['RRG'])
+    if isinstance(dimensions, pd.DataFrame):
+        return pd.Series(scores, index=dimensions.index)
+    return float(scores)
 
 def main():
     """Main analysis function"""
@@ -212,21 +311,21 @@ def main():
     print("=" * 80)
     
     try:
-        # Read all necessary sheets
-        excel_file = pd.ExcelFile(file_path)
+        # Read all necessary sheets (parsed once, then served from the columnar cache)
+        sheet_names = workbook_cache.sheet_names(file_path)
         
         # Main clients data
-        df_clients = pd.read_excel(file_path, sheet_name='Dim_Clients')
+        df_clients = workbook_cache.read_sheet(file_path, 'Dim_Clients')
         print(f"\n✓ Loaded {len(df_clients)} clients from Dim_Clients")
         
         # Try to get Recovery Agility data
-        zt_maturity_data = {}
+        zt_maturity_data = pd.Series(dtype=float)
         
-        if 'Fact_ResponseReadiness' in excel_file.sheet_names:
+        if 'Fact_ResponseReadiness' in sheet_names:
             print("\n1. EXTRACTING RECOVERY AGILITY SCORES")
             print("-" * 40)
             
-            fact_response = pd.read_excel(file_path, sheet_name='Fact_ResponseReadiness')
+            fact_response = workbook_cache.read_sheet(file_path, 'Fact_ResponseReadiness')
             
             # Check if we have the right columns
             if 'ID_SUBCTRL' in fact_response.columns and 'ID_CLIENT' in fact_response.columns:
@@ -243,13 +342,12 @@ def main():
                     
                     if score_col:
                         # Group by client and average
-                        zt_maturity_by_client = zt_data.groupby('ID_CLIENT')[score_col].mean()
-                        zt_maturity_data = zt_maturity_by_client.to_dict()
+                        zt_maturity_data = zt_data.groupby('ID_CLIENT')[score_col].mean()
                         
                         print(f"Found ZT_MATURITY scores for {len(zt_maturity_data)} clients")
                         
                         # Show distribution
-                        maturity_dist = pd.Series(list(zt_maturity_data.values())).value_counts().sort_index()
+                        maturity_dist = zt_maturity_data.value_counts().sort_index()
                         print("\nZT Maturity Distribution:")
                         for level, count in maturity_dist.items():
                             print(f"  Level {int(level)}: {count} clients")
@@ -266,46 +364,8 @@ def main():
         print("\n2. CALCULATING DII DIMENSIONS AND SCORES")
         print("-" * 40)
         
-        results = []
-        missing_zt_count = 0
-        
-        for idx, row in df_clients.iterrows():
-            client_id = row['ID_CLIENT']
-            zt_maturity = zt_maturity_data.get(client_id)
-            
-            if zt_maturity is None:
-                missing_zt_count += 1
-            
-            # Calculate dimensions
-            dimensions = calculate_dii_dimensions(row, zt_maturity)
-            
-            # Calculate DII score
-            dii_score = calculate_dii_score(dimensions)
-            
-            # Create result record
-            result = {
-                'ID_CLIENT': client_id,
-                'CompanyName': row['CompanyName'],
-                'SECTOR': row['SECTOR'],
-                'v3_MODEL': row['BUSINESS_MODEL'],
-                'v4_MODEL_ID': dimensions['v4_model_id'],
-                'v4_MODEL': dimensions['v4_model_name'],
-                'TRD': dimensions['TRD'],
-                'AER': dimensions['AER'],
-                'HFP': dimensions['HFP'],
-                'BRI': dimensions['BRI'],
-                'RRG': dimensions['RRG'],
-                'OLD_IMMUNITY': row['IMMUNITY_INDEX'],
-                'NEW_DII': dii_score,
-                'DII_STAGE': get_dii_stage(dii_score),
-                'HAS_ZT_DATA': dimensions['has_zt_maturity'],
-                'CLOUD_LEVEL': row.get('CLOUD_ADOPTION_LEVEL', 'Hybrid')
-            }
-            
-            results.append(result)
-        
-        # Create results DataFrame
-        results_df = pd.DataFrame(results)
+        results_df = migrate_clients(df_clients, zt_maturity_data)
+        missing_zt_count = int((~results_df['HAS_ZT_DATA']).sum())
         
         # Show first 20 records
         print("\n3. SAMPLE RESULTS (First 20 records)")
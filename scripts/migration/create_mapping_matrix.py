@@ -7,6 +7,12 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
+import sys
+
+# Add repository root to path for the shared workbook cache
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from scripts import workbook_cache
 
 # DII 4.0 Business Models
 DII_V4_MODELS = {
@@ -156,7 +162,7 @@ def analyze_database():
     print("=" * 80)
     
     # Read the main clients sheet
-    df = pd.read_excel(file_path, sheet_name='Dim_Clients')
+    df = workbook_cache.read_sheet(file_path, 'Dim_Clients')
     
     # Create combination column
     df['Combination'] = (df['SECTOR'] + '|' + 
@@ -215,9 +221,8 @@ def analyze_database():
     # Try to get Recovery Agility data
     try:
         # Check if Fact_ResponseReadiness exists
-        excel = pd.ExcelFile(file_path)
-        if 'Fact_ResponseReadiness' in excel.sheet_names:
-            fact_df = pd.read_excel(file_path, sheet_name='Fact_ResponseReadiness')
+        if 'Fact_ResponseReadiness' in workbook_cache.sheet_names(file_path):
+            fact_df = workbook_cache.read_sheet(file_path, 'Fact_ResponseReadiness')
             print("\nRecovery Agility Data Found:")
             print("-" * 40)
             
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Columnar Workbook Cache
+Parses an Excel workbook (e.g. data/MasterDatabaseV3.1.xlsx) once and stores
+every sheet in a columnar on-disk format (Parquet when pyarrow is installed,
+pickled DataFrames otherwise). Later loads are served from the cache until
+the workbook changes.
+
+Cache entries are keyed by the workbook's size and modification time; when
+those change but the content hash does not (e.g. the file was copied or
+touched), the entry is reused as-is.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_WORKBOOK = REPO_ROOT / "data" / "MasterDatabaseV3.1.xlsx"
+DEFAULT_CACHE_DIR = REPO_ROOT / "data" / "cache" / "workbooks"  # gitignored
+
+MANIFEST_NAME = "manifest.json"
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _safe_name(name):
+    """Filesystem-safe file stem for a sheet or artifact name"""
+    stem = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    return f"{stem}-{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+
+class WorkbookCache:
+    """
+    On-disk columnar cache of one workbook's sheets
+
+    Example:
+        cache = WorkbookCache("data/MasterDatabaseV3.1.xlsx")
+        df_clients = cache.read_sheet("Dim_Clients")
+        cache.sheet_names
+    """
+
+    def __init__(self, workbook_path=DEFAULT_WORKBOOK, cache_dir=DEFAULT_CACHE_DIR):
+        self.workbook_path = Path(workbook_path)
+        resolved = self.workbook_path.resolve().as_posix()
+        self.cache_dir = Path(cache_dir) / f"{self.workbook_path.stem}-{hashlib.sha1(resolved.encode('utf-8')).hexdigest()[:8]}"
+        self._manifest = None
+
+    # -- freshness -----------------------------------------------------------
+
+    def _fingerprint(self):
+        stat = self.workbook_path.stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _load_manifest(self):
+        try:
+            with open(self.cache_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.cache_dir / f"{MANIFEST_NAME}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.cache_dir / MANIFEST_NAME)
+
+    def _current_manifest(self):
+        """Return a manifest matching the workbook, rebuilding the cache if stale"""
+        if self._manifest is not None:
+            return self._manifest
+
+        fingerprint = self._fingerprint()
+        manifest = self._load_manifest()
+
+        if manifest and manifest.get('fingerprint') != fingerprint:
+            # Size/mtime changed; reuse the entry if the content did not
+            if manifest.get('sha256') == _file_sha256(self.workbook_path):
+                manifest['fingerprint'] = fingerprint
+                self._write_manifest(manifest)
+            else:
+                manifest = None
+
+        if not manifest:
+            manifest = self._build(fingerprint)
+
+        self._manifest = manifest
+        return manifest
+
+    def _build(self, fingerprint):
+        """Parse the whole workbook once and store every sheet"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        sheets = pd.read_excel(self.workbook_path, sheet_name=None)
+        entries = {}
+        for sheet_name, df in sheets.items():
+            entries[sheet_name] = self._store_frame(sheet_name, df)
+
+        manifest = {
+            'workbook': str(self.workbook_path),
+            'fingerprint': fingerprint,
+            'sha256': _file_sha256(self.workbook_path),
+            'sheets': entries,
+            'artifacts': {}
+        }
+        self._write_manifest(manifest)
+        return manifest
+
+    # -- storage -------------------------------------------------------------
+
+    def _store_frame(self, sheet_name, df):
+        stem = _safe_name(sheet_name)
+        if PARQUET_AVAILABLE:
+            path = self.cache_dir / f"{stem}.parquet"
+            try:
+                df.to_parquet(path, index=False)
+                return path.name
+            except (ValueError, TypeError, ImportError):
+                # Mixed-type object columns cannot always be written as Parquet
+                path.unlink(missing_ok=True)
+        path = self.cache_dir / f"{stem}.pkl"
+        df.to_pickle(path)
+        return path.name
+
+    def _load_frame(self, filename):
+        path = self.cache_dir / filename
+        if filename.endswith('.parquet'):
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    # -- public API ------------------------------------------------------------
+
+    @property
+    def sheet_names(self):
+        """Sheet names in workbook order"""
+        return list(self._current_manifest()['sheets'])
+
+    def read_sheet(self, sheet_name):
+        """Load one sheet as a DataFrame (raises KeyError if it does not exist)"""
+        sheets = self._current_manifest()['sheets']
+        if sheet_name not in sheets:
+            raise KeyError(f"Worksheet named '{sheet_name}' not found in {self.workbook_path}")
+        try:
+            return self._load_frame(sheets[sheet_name])
+        except (OSError, ValueError):
+            # Damaged cache file; rebuild from the workbook
+            self._manifest = self._build(self._fingerprint())
+            return self._load_frame(self._manifest['sheets'][sheet_name])
+
+    def read_all(self):
+        """Load every sheet as {sheet_name: DataFrame}"""
+        return {name: self.read_sheet(name) for name in self.sheet_names}
+
+    def artifact(self, name, build):
+        """
+        Cache any picklable value derived from the workbook
+
+        `build()` is called only when the workbook has changed since the value
+        was last stored (used for non-DataFrame views such as openpyxl rows).
+        A None result is returned but not cached.
+        """
+        manifest = self._current_manifest()
+        filename = manifest['artifacts'].get(name)
+        if filename:
+            try:
+                with open(self.cache_dir / filename, 'rb') as f:
+                    return pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+
+        value = build()
+        if value is None:
+            # Failed builds are retried on the next call
+            return None
+        filename = f"{_safe_name(name)}.artifact.pkl"
+        with open(self.cache_dir / filename, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        manifest['artifacts'][name] = filename
+        self._write_manifest(manifest)
+        return value
+
+
+_caches = {}
+
+
+def get_workbook_cache(workbook_path=DEFAULT_WORKBOOK):
+    """Shared WorkbookCache per workbook path"""
+    key = Path(workbook_path).resolve()
+    if key not in _caches:
+        _caches[key] = WorkbookCache(workbook_path)
+    return _caches[key]
+
+
+def read_sheet(workbook_path, sheet_name):
+    """Cached equivalent of pd.read_excel(workbook_path, sheet_name=sheet_name)"""
+    return get_workbook_cache(workbook_path).read_sheet(sheet_name)
+
+
+def sheet_names(workbook_path):
+    """Cached equivalent of pd.ExcelFile(workbook_path).sheet_names"""
+    return get_workbook_cache(workbook_path).sheet_names
+
+
+def read_workbook(workbook_path):
+    """Cached equivalent of pd.read_excel(workbook_path, sheet_name=None)"""
+    return get_workbook_cache(workbook_path).read_all()